@@ -0,0 +1,44 @@
+"""
+Atomic file writes for the artifacts under outputs/
+Writers produce a temporary file next to the target and os.replace it into
+place, so readers (other sessions, app workers, the registry's file watcher)
+only ever see the previous or the complete new file.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Yield a temporary path to write to; on success it replaces `path`, on an
+    exception it is removed. The temporary name keeps the target's extension
+    (np.save/np.savez would otherwise append one) and is unique per process
+    and thread: app workers are processes, but Streamlit sessions are threads
+    of one process, and any of them may rebuild the same artifact at once.
+    """
+    extension = os.path.splitext(path)[1]
+    tmp_path = f"{path}.tmp{os.getpid()}-{threading.get_ident()}{extension}"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_text_atomic(path, text) -> None:
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, "w") as f:
+            f.write(text)
+
+
+def write_json_atomic(path, payload, **dump_kwargs) -> None:
+    """json.dump to `path` atomically; keyword arguments go to json.dump"""
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, **dump_kwargs)
@@ -0,0 +1,257 @@
+"""
+Append-only audit log of the predictions the app makes
+log() only appends to an in-memory buffer, so the page never waits on disk.
+A background writer thread flushes the buffer as one frame when it holds
+FLUSH_RECORDS records or FLUSH_SECONDS have passed. A frame is a binary
+header followed by the batch stored column by column. Every process writes
+its own segment file under outputs/audit/. A segment is rotated and gzipped
+once it reaches ROTATE_BYTES or ROTATE_SECONDS, and on exit. The reader
+replays plain and gzipped segments, e.g. as a frame in the pipeline's
+feature order for the training module.
+
+Usage (from the repository root):
+    python app_pages/audit_log.py --since 2024-01-01 --output audit.csv
+"""
+
+import argparse
+import atexit
+import gzip
+import json
+import os
+import shutil
+import struct
+import threading
+import time
+
+from atomic_io import atomic_path
+
+AUDIT_DIR = "outputs/audit"
+FLUSH_RECORDS = 256
+FLUSH_SECONDS = 2.0
+ROTATE_BYTES = 16 * 1024 * 1024
+ROTATE_SECONDS = 24 * 3600
+# Past this many unwritten records the oldest are dropped (and counted), never blocking
+MAX_PENDING = 100_000
+
+# Frame: magic, record count, payload bytes; payload is the batch as JSON columns
+MAGIC = b"AUD1"
+HEADER = struct.Struct("<4sII")
+COLUMNS = ("timestamp", "source", "model_version", "prediction", "latency_ms", "inputs")
+
+
+def _plain(value):
+    """JSON fallback for NumPy scalars and other values with .item()"""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def encode_frame(records):
+    columns = {name: [record[name] for record in records] for name in COLUMNS}
+    payload = json.dumps(columns, separators=(",", ":"), default=_plain).encode()
+    return HEADER.pack(MAGIC, len(records), len(payload)) + payload
+
+
+# ----------------------------
+# WRITER
+# ----------------------------
+class AuditLog:
+
+    def __init__(self, directory=AUDIT_DIR) -> None:
+        self.directory = directory
+        self._buffer = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._file = None
+        self._opened_at = 0.0
+        self._segments = 0
+        self._counters = {"records": 0, "frames": 0, "dropped": 0, "rotations": 0, "errors": 0}
+
+    def log(self, source, model_version, inputs, prediction, latency_ms=None) -> None:
+        """Queue one prediction record (constant time, no I/O)"""
+        self.log_many(source, model_version, [inputs], [prediction], latency_ms)
+
+    def log_many(self, source, model_version, inputs, predictions, latency_ms=None) -> None:
+        """Queue one record per house of a batch prediction"""
+        now = time.time()
+        records = [{"timestamp": now, "source": source, "model_version": model_version,
+                    "prediction": float(prediction), "latency_ms": latency_ms, "inputs": dict(values)}
+                   for values, prediction in zip(inputs, predictions)]
+        with self._cond:
+            if self._thread is None:
+                self._start()
+            self._buffer.extend(records)
+            overflow = len(self._buffer) - MAX_PENDING
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self._counters["dropped"] += overflow
+            if len(self._buffer) >= FLUSH_RECORDS:
+                self._cond.notify()
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._buffer) < FLUSH_RECORDS:
+                    self._cond.wait(FLUSH_SECONDS)
+                batch, self._buffer = self._buffer, []
+                stopping = self._stopping
+            # Auditing must never take the app down, nor stop this thread: a
+            # failed batch is counted as lost and the loop carries on
+            try:
+                if batch:
+                    self._write(batch)
+            except Exception:
+                self._counters["errors"] += 1
+                self._counters["dropped"] += len(batch)
+            try:
+                if stopping or (self._file is not None and self._should_rotate()):
+                    self._rotate()
+            except Exception:
+                self._counters["errors"] += 1
+            if stopping:
+                return
+
+    def _write(self, batch) -> None:
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._segments += 1
+            name = f"audit-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._segments:04d}.log"
+            self._file = open(os.path.join(self.directory, name), "ab")
+            self._opened_at = time.time()
+        self._file.write(encode_frame(batch))
+        self._file.flush()
+        self._counters["records"] += len(batch)
+        self._counters["frames"] += 1
+
+    def _should_rotate(self) -> bool:
+        return (self._file.tell() >= ROTATE_BYTES
+                or time.time() - self._opened_at >= ROTATE_SECONDS)
+
+    def _rotate(self) -> None:
+        """
+        Close the current segment and replace it with a gzipped copy. The plain
+        file is removed only after the .gz is in place; the reader ignores a
+        leftover plain file, so a crash in between loses or repeats nothing.
+        """
+        if self._file is None:
+            return
+        path = self._file.name
+        self._file.close()
+        self._file = None
+        with atomic_path(f"{path}.gz") as tmp_path:
+            with open(path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        os.remove(path)
+        self._counters["rotations"] += 1
+
+    def close(self, timeout=10.0) -> None:
+        """Flush everything, rotate the open segment and stop the writer"""
+        with self._cond:
+            if self._thread is None:
+                return
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        with self._cond:
+            self._thread, self._stopping = None, False
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {**self._counters, "pending": len(self._buffer)}
+
+
+audit_log = AuditLog()
+atexit.register(audit_log.close)
+
+
+# ----------------------------
+# READER
+# ----------------------------
+def segment_paths(directory=AUDIT_DIR):
+    """Segments oldest first (names start with their creation time)"""
+    if not os.path.isdir(directory):
+        return []
+    names = set(os.listdir(directory))
+    # A plain segment next to its .gz was rotated but not yet removed: the .gz
+    # is complete (written atomically), so replaying both would duplicate it
+    names = sorted(n for n in names
+                   if n.endswith(".log.gz") or (n.endswith(".log") and f"{n}.gz" not in names))
+    return [os.path.join(directory, n) for n in names]
+
+
+def iter_frames(path):
+    """Decoded frames of one segment as {column: list}; a torn last frame is skipped"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        while True:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return
+            magic, _, size = HEADER.unpack(header)
+            payload = f.read(size)
+            if magic != MAGIC or len(payload) < size:
+                return
+            yield json.loads(payload)
+
+
+def iter_records(directory=AUDIT_DIR, since=None, until=None):
+    """Every record as a dict, optionally within [since, until) epoch seconds"""
+    for path in segment_paths(directory):
+        for columns in iter_frames(path):
+            for values in zip(*(columns[name] for name in COLUMNS)):
+                record = dict(zip(COLUMNS, values))
+                if since is not None and record["timestamp"] < since:
+                    continue
+                if until is not None and record["timestamp"] >= until:
+                    continue
+                yield record
+
+
+def read_audit(directory=AUDIT_DIR, since=None, until=None, source=None, feature_names=None):
+    """
+    Audit records as a DataFrame: the record fields plus one column per input
+    feature. With feature_names the inputs are reindexed to that order (e.g.
+    the pipeline's feature_names_in_), ready to be labelled and appended to
+    the training data.
+    """
+    import pandas as pd
+
+    records = [r for r in iter_records(directory, since, until)
+               if source is None or r["source"] == source]
+    meta = pd.DataFrame([{k: v for k, v in r.items() if k != "inputs"} for r in records],
+                        columns=[c for c in COLUMNS if c != "inputs"])
+    inputs = pd.DataFrame([r["inputs"] for r in records])
+    if feature_names is not None:
+        inputs = inputs.reindex(columns=list(feature_names))
+    meta["timestamp"] = pd.to_datetime(meta["timestamp"], unit="s")
+    return pd.concat([meta, inputs], axis=1)
+
+
+def main(argv=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Replay the prediction audit log")
+    parser.add_argument("--directory", default=AUDIT_DIR, help="Audit directory (default: %(default)s)")
+    parser.add_argument("--since", help="Only records at or after this date/time")
+    parser.add_argument("--source", help="Only records from this source (live, lydia)")
+    parser.add_argument("--output", help="Write the records to this CSV instead of printing a summary")
+    args = parser.parse_args(argv)
+
+    since = pd.Timestamp(args.since).timestamp() if args.since else None
+    df = read_audit(args.directory, since=since, source=args.source)
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"✅ {len(df):,} records written to {args.output}")
+        return
+    print(f"* {len(df):,} records in {len(segment_paths(args.directory))} segments")
+    if len(df):
+        print(df.groupby(["source", "model_version"])["latency_ms"].describe().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Headless batch scorer for SalePrice predictions
+Streams a CSV in chunks (house_prices_records.csv / inherited_houses_cleaned.csv
+schema), scores the chunks in a process pool where every worker loads the
+pipeline once, and appends predictions to a CSV or Parquet file in input order.
+
+Usage (from the repository root):
+    python app_pages/batch_score.py input.csv output.parquet --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from model_registry import DEFAULT_VERSION, load_pipeline
+from drift_monitor import get_monitor
+
+CLEANED_DATA = "outputs/datasets/cleaned/house_prices_cleaned.csv"
+PREDICTION_COLUMN = "Predicted_Price"
+
+
+# ----------------------------
+# MISSING VALUES
+# ----------------------------
+def compute_fill_values(path=CLEANED_DATA):
+    """
+    Median for numerical and mode for categorical columns,
+    the same rule used in the data cleaning notebook
+    """
+    df = pd.read_csv(path)
+    fill_values = {}
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            fill_values[col] = df[col].median()
+        else:
+            fill_values[col] = df[col].mode().iloc[0]
+    return fill_values
+
+
+# ----------------------------
+# WORKER
+# ----------------------------
+COMPS_COLUMN = "Comps_Median_Price"
+
+_feature_names = None
+_predict = None
+_fill_values = None
+_comps = None
+
+
+def _init_worker(version, fill_values, compiled=False, comps=0):
+    """Load the pipeline (and compile it, with compiled=True) once per worker process"""
+    global _feature_names, _predict, _fill_values, _comps
+    pipeline = load_pipeline(version)
+    _feature_names, _predict = list(pipeline.feature_names_in_), pipeline.predict
+    if compiled:
+        from fast_inference import CompiledPredictor, UncompilableStep
+        try:
+            # Array preprocessing; chunks this size go to the model's native predict
+            _predict = CompiledPredictor(pipeline).predict_frame
+        except UncompilableStep:
+            pass
+    _fill_values = fill_values
+    if comps:
+        from comparable_sales import get_comps_index
+        _comps = (get_comps_index(version), comps)
+
+
+def score_chunk(chunk):
+    """Predict one chunk, keeping the input columns"""
+    X = chunk.reindex(columns=_feature_names)
+    X = X.fillna(_fill_values)
+    chunk = chunk.copy()
+    chunk[PREDICTION_COLUMN] = _predict(X)
+    if _comps is not None:
+        index, k = _comps
+        chunk[COMPS_COLUMN] = index.median_prices(X, k)
+    return chunk
+
+
+# ----------------------------
+# OUTPUT
+# ----------------------------
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+
+def parquet_available() -> bool:
+    """Parquet output needs pyarrow; checked up front so a long job never dies after its first chunk"""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ChunkWriter:
+    """Append scored chunks to CSV or Parquet (picked from the file extension)"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.parquet = path.endswith(PARQUET_EXTENSIONS)
+        self._writer = None
+        self._first = True
+
+    def write(self, df) -> None:
+        if self.parquet:
+            self._write_parquet(df)
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a",
+                      header=self._first, index=False)
+        self._first = False
+
+    def _write_parquet(self, df) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Chunks can disagree on int/float (missing values), so store numbers as float64
+        numeric = df.select_dtypes(include="number").columns
+        table = pa.Table.from_pandas(df.astype({c: "float64" for c in numeric}),
+                                     preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+# ----------------------------
+# DRIVER
+# ----------------------------
+def score_file(input_path, output_path, version=DEFAULT_VERSION, chunk_size=100_000,
+               workers=None, compiled=False, comps=0, log=sys.stderr):
+    """Score input_path into output_path and return (rows, seconds)"""
+    workers = workers if workers is not None else os.cpu_count() or 1
+    fill_values = compute_fill_values()
+    reader = pd.read_csv(input_path, chunksize=chunk_size)
+    writer = ChunkWriter(output_path)
+    # Inputs are sketched here, in the reading process, for the drift report.
+    # Drift is best effort: a failure is logged and scoring carries on without it
+    monitor = None
+    try:
+        monitor = get_monitor(version, "batch")
+    except Exception as e:
+        print(f"⚠️ Input drift not recorded: {e}", file=log)
+
+    def observe(chunk):
+        nonlocal monitor
+        if monitor is None:
+            return
+        try:
+            monitor.update_frame(chunk)
+        except Exception as e:
+            print(f"⚠️ Input drift not recorded: {e}", file=log)
+            monitor = None
+
+    rows = 0
+    start = time.perf_counter()
+
+    def report(scored):
+        nonlocal rows
+        writer.write(scored)
+        rows += len(scored)
+        elapsed = time.perf_counter() - start
+        print(f"* {rows:,} rows scored ({rows / elapsed:,.0f} rows/sec)", file=log)
+
+    try:
+        if workers <= 1:
+            _init_worker(version, fill_values, compiled, comps)
+            for chunk in reader:
+                observe(chunk)
+                report(score_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(version, fill_values, compiled, comps)) as pool:
+                # At most two chunks per worker are in memory at any time
+                pending = deque()
+                for chunk in reader:
+                    observe(chunk)
+                    pending.append(pool.submit(score_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        report(pending.popleft().result())
+                while pending:
+                    report(pending.popleft().result())
+    finally:
+        writer.close()
+        if monitor is not None:
+            try:
+                monitor.flush()
+            except Exception as e:
+                print(f"⚠️ Input drift not recorded: {e}", file=log)
+
+    elapsed = time.perf_counter() - start
+    return rows, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score house records with the SalePrice pipeline")
+    parser.add_argument("input", help="CSV with house attributes")
+    parser.add_argument("output", help="Output .csv or .parquet file")
+    parser.add_argument("--version", default=DEFAULT_VERSION, help="Pipeline version (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows per chunk (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--compiled", action="store_true",
+                        help="Encode and scale with the compiled array preprocessing (see fast_inference.py)")
+    parser.add_argument("--comps", type=int, default=0, metavar="K",
+                        help="Add the median price of the K most comparable historical sales")
+    args = parser.parse_args(argv)
+    if args.output.endswith(PARQUET_EXTENSIONS) and not parquet_available():
+        parser.error("Parquet output needs pyarrow (pip install pyarrow), or write a .csv file")
+
+    rows, elapsed = score_file(args.input, args.output, version=args.version,
+                               chunk_size=args.chunk_size, workers=args.workers,
+                               compiled=args.compiled, comps=args.comps)
+    rate = rows / elapsed if elapsed else 0.0
+    print(f"✅ Scored {rows:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/sec) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
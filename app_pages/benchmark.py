@@ -0,0 +1,262 @@
+"""
+Offline performance benchmarks for the app and its pipeline
+Runs against the artifacts under outputs/ and measures CSV loading, pipeline
+loading, make_live_prediction latency, batch predict throughput on synthetic
+rows drawn from X_test.csv, and the headless render time of every page.
+Results are compared with a stored baseline; the run fails (exit code 1) when
+a metric is slower than its baseline by more than the threshold.
+
+Usage (from the repository root):
+    python app_pages/benchmark.py --save-baseline
+    python app_pages/benchmark.py --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from model_registry import DEFAULT_VERSION, PIPELINE_DIR, registry
+from atomic_io import write_json_atomic
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = "outputs/benchmarks/baseline.json"
+CSV_FILES = [
+    "outputs/datasets/collection/house_prices_records.csv",
+    "outputs/datasets/collection/inherited_houses.csv",
+    "outputs/datasets/cleaned/house_prices_cleaned.csv",
+    "outputs/datasets/cleaned/inherited_houses_cleaned.csv",
+]
+BATCH_SIZES = [1, 100, 10_000, 1_000_000]
+SEED = 0
+DEFAULT_THRESHOLD = 0.25
+# Page renders go through Streamlit's script runner and vary more between runs
+GROUP_THRESHOLDS = {"render": 0.5}
+# Differences below this are timer noise, never a regression
+NOISE_FLOOR_MS = 0.5
+
+
+# ----------------------------
+# MEASUREMENT
+# ----------------------------
+def measure(func, repeats=5):
+    """
+    Median seconds per call: the loop count is chosen like `python -m timeit`
+    (at least 0.2 s per repeat), then the loop is repeated and the median taken
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return statistics.median(t / number for t in timer.repeat(repeats, number))
+
+
+def synthetic_rows(rows, version=DEFAULT_VERSION, seed=SEED):
+    """
+    Rows drawn column by column from the empirical distributions in the
+    version's X_test.csv (missing values included), reproducible per seed
+    """
+    X_test = pd.read_csv(os.path.join(PIPELINE_DIR, version, "X_test.csv"))
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        col: X_test[col].to_numpy()[rng.integers(0, len(X_test), rows)]
+        for col in X_test.columns
+    })
+
+
+# ----------------------------
+# BENCHMARKS
+# ----------------------------
+def bench_csv_load(repeats):
+    return {f"csv load {os.path.basename(path)}": measure(lambda: pd.read_csv(path), repeats)
+            for path in CSV_FILES}
+
+
+def bench_pipeline_load(repeats, version=DEFAULT_VERSION):
+    import joblib
+
+    path = registry.artifact_path(version)
+    return {f"pipeline load {version}": measure(lambda: joblib.load(path), repeats)}
+
+
+def bench_live_prediction(repeats, version=DEFAULT_VERSION):
+    """One live prediction as the page makes it: full pipeline and compiled path"""
+    from model_registry import load_pipeline
+    from model_bundle import load_bundle
+    from page_live_price_prediction import make_live_prediction, make_live_prediction_full
+
+    pipeline = load_pipeline(version)
+    bundle = load_bundle(version)
+    X_live = bundle.default_frame.copy()
+    values = {col: X_live[col].values[0] for col in X_live.columns}
+    make_live_prediction(X_live, pipeline, bundle)  # compile once, outside the timing
+    return {
+        "make_live_prediction": measure(lambda: make_live_prediction(X_live, pipeline, bundle), repeats),
+        "make_live_prediction_full": measure(lambda: make_live_prediction_full(values, pipeline, bundle), repeats),
+    }
+
+
+def bench_batch_predict(repeats, sizes=BATCH_SIZES, version=DEFAULT_VERSION):
+    """Seconds per batch for the pickled pipeline and the compiled predictor"""
+    from model_registry import load_pipeline
+    from model_bundle import get_bundle_predictor
+
+    pipeline = load_pipeline(version)
+    predictor = get_bundle_predictor(version)
+    X = synthetic_rows(max(sizes), version)[list(pipeline.feature_names_in_)]
+    results = {}
+    for rows in sizes:
+        batch = X.iloc[:rows]
+        # Large batches take seconds per call, a few repeats are enough there
+        n = repeats if rows < 100_000 else min(repeats, 3)
+        results[f"batch predict {rows:,} rows"] = measure(lambda: pipeline.predict(batch), n)
+        results[f"batch predict compiled {rows:,} rows"] = measure(lambda: predictor.predict_frame(batch), n)
+    return results
+
+
+def bench_page_render(repeats, app_path=os.path.join(APP_DIR, "app.py")):
+    """
+    Headless render of every page through streamlit.testing's AppTest; the
+    first (cold) run per page is excluded so the number is the warm rerun cost
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app_path, default_timeout=120).run()
+    titles = list(at.sidebar.radio[0].options)
+    results = {}
+    for i, title in enumerate(titles):
+        at.sidebar.radio[0].set_value(at.sidebar.radio[0].options[i])
+
+        def render():
+            at.run()
+            if at.exception:
+                raise RuntimeError(f"Page {title!r} raised: {at.exception[0].message}")
+
+        render()
+        seconds = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            render()
+            seconds.append(time.perf_counter() - start)
+        results[f"render {title}"] = statistics.median(seconds)
+    return results
+
+
+BENCHMARKS = {
+    "csv": bench_csv_load,
+    "pipeline": bench_pipeline_load,
+    "live": bench_live_prediction,
+    "batch": bench_batch_predict,
+    "render": bench_page_render,
+}
+
+
+def run_benchmarks(groups=tuple(BENCHMARKS), repeats=5, sizes=BATCH_SIZES):
+    """{group: {metric: seconds}} for the selected groups"""
+    results = {}
+    for group in groups:
+        kwargs = {"sizes": sizes} if group == "batch" else {}
+        results[group] = BENCHMARKS[group](repeats, **kwargs)
+    return results
+
+
+# ----------------------------
+# BASELINE
+# ----------------------------
+def environment():
+    """What the numbers depend on, stored with the baseline"""
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "pipeline_sha256": registry.fingerprint(DEFAULT_VERSION),
+    }
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = {"created": time.strftime("%Y-%m-%d %H:%M:%S"), "environment": environment(), "results": results}
+    write_json_atomic(path, payload, indent=2)
+    return path
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    One row per metric with its baseline and relative change. A metric
+    regresses when it is slower than threshold (per group) and the noise floor
+    """
+    rows = []
+    for group, metrics in results.items():
+        limit = GROUP_THRESHOLDS.get(group, threshold)
+        for name, seconds in metrics.items():
+            base = baseline["results"].get(group, {}).get(name) if baseline else None
+            change = seconds / base - 1 if base else None
+            regressed = (change is not None and change > limit
+                         and (seconds - base) * 1000 > NOISE_FLOOR_MS)
+            rows.append({"group": group, "metric": name, "ms": seconds * 1000,
+                         "baseline_ms": base * 1000 if base else None,
+                         "change": change, "limit": limit, "regressed": regressed})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark loading, inference and page rendering")
+    parser.add_argument("--groups", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="Benchmark groups to run (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=BATCH_SIZES, help="Batch predict row counts")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repeats per metric (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown over the baseline, 0.25 = 25%% (default: %(default)s)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.groups, args.repeats, args.sizes)
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    if baseline and baseline["environment"] != environment():
+        print("⚠️ Baseline was recorded in a different environment; comparisons may not be meaningful")
+
+    rows = compare(results, baseline, args.threshold)
+    for row in rows:
+        if row["baseline_ms"] is None:
+            status = ""
+        else:
+            status = f"{row['baseline_ms']:>11,.2f} ms  {row['change']:+7.1%}"
+            status += "  ❌ regression" if row["regressed"] else ""
+        print(f"* {row['metric']:<52} {row['ms']:>11,.2f} ms  {status}")
+
+    if args.save_baseline:
+        print(f"✅ Baseline saved to {save_baseline(results, args.baseline)}")
+        return 0
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(f"❌ {len(regressions)} metric(s) regressed beyond the threshold")
+        return 1
+    print("✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Incremental correlation statistics for the Price Correlation Study
+Keeps sufficient statistics for every numerical column of the cleaned dataset
+(count, sums, cross-products) plus a joint histogram of per-column quantile
+bins as a rank sketch for Spearman. New sales records are folded in without
+rescanning old rows, and correlations are read in O(features²).
+"""
+
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from atomic_io import atomic_path
+
+CLEANED_DATA = "outputs/datasets/cleaned/house_prices_cleaned.csv"
+STATS_PATH = "outputs/datasets/stats/correlation_stats.npz"
+RANK_BINS = 32
+UPDATE_CHUNK_ROWS = 10_000
+
+
+class CorrelationStats:
+
+    def __init__(self, columns, edges, shift=None) -> None:
+        p = len(columns)
+        self.columns = list(columns)
+        self.edges = [np.asarray(e, dtype=np.float64) for e in edges]
+        # Sums are kept around a reference point to avoid cancellation
+        self.shift = np.zeros(p) if shift is None else np.asarray(shift, dtype=np.float64)
+        self.n = 0
+        self.sums = np.zeros(p)
+        self.cross = np.zeros((p, p))
+        self.joint = np.zeros((p, p, RANK_BINS, RANK_BINS), dtype=np.int64)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build from a DataFrame, using its numerical columns"""
+        numeric = df.select_dtypes(include="number")
+        edges = [cls._bin_edges(numeric[col].to_numpy(dtype=np.float64)) for col in numeric.columns]
+        stats = cls(numeric.columns, edges, shift=numeric.mean().to_numpy())
+        stats.update(numeric)
+        return stats
+
+    @staticmethod
+    def _bin_edges(x):
+        """Cut points for the rank sketch: one bin per value for discrete columns"""
+        x = x[~np.isnan(x)]
+        unique = np.unique(x)
+        if len(unique) <= RANK_BINS:
+            return (unique[:-1] + unique[1:]) / 2
+        return np.unique(np.quantile(x, np.linspace(0, 1, RANK_BINS + 1)[1:-1]))
+
+    def update(self, df) -> None:
+        """Fold new rows in (rows with missing values are skipped)"""
+        X = df.reindex(columns=self.columns).to_numpy(dtype=np.float64)
+        X = X[~np.isnan(X).any(axis=1)]
+        if not len(X):
+            return
+
+        for start in range(0, len(X), UPDATE_CHUNK_ROWS):
+            self._update_block(X[start:start + UPDATE_CHUNK_ROWS])
+
+    def _update_block(self, X) -> None:
+        centered = X - self.shift
+        self.n += len(X)
+        self.sums += centered.sum(axis=0)
+        self.cross += centered.T @ centered
+
+        p = len(self.columns)
+        bins = np.column_stack([np.searchsorted(e, X[:, i], side="right")
+                                for i, e in enumerate(self.edges)])
+        # Flat index into joint[i, j, bin_i, bin_j] for every row and pair
+        pair = np.arange(p)
+        flat = (((pair[:, None] * p + pair[None, :])[None, :, :] * RANK_BINS
+                 + bins[:, :, None]) * RANK_BINS + bins[:, None, :])
+        self.joint += np.bincount(flat.ravel(), minlength=self.joint.size).reshape(self.joint.shape)
+
+    # ----------------------------
+    # QUERIES
+    # ----------------------------
+    def pearson(self):
+        """Pearson correlation matrix from the sufficient statistics"""
+        mean = self.sums / self.n
+        cov = self.cross / self.n - np.outer(mean, mean)
+        std = np.sqrt(np.clip(np.diag(cov), 0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.columns, columns=self.columns)
+
+    def spearman(self):
+        """
+        Spearman correlation from the rank sketch: Pearson correlation of the
+        average rank of each bin, weighted by the joint bin counts
+        """
+        p = len(self.columns)
+        corr = np.eye(p)
+        # Average rank of every bin from the marginal counts of each column
+        marginal = self.joint[np.arange(p), np.arange(p)].sum(axis=2)
+        ranks = np.cumsum(marginal, axis=1) - (marginal - 1) / 2.0
+        mean_rank = (self.n + 1) / 2.0
+        centered = ranks - mean_rank
+        var = (marginal * centered ** 2).sum(axis=1)
+
+        for i in range(p):
+            for j in range(i + 1, p):
+                cov = centered[i] @ self.joint[i, j] @ centered[j]
+                denom = np.sqrt(var[i] * var[j])
+                corr[i, j] = corr[j, i] = cov / denom if denom else np.nan
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def pearson_pvalues(self):
+        """Two-sided p-values of the Pearson correlations (t-test, n - 2 dof)"""
+        from scipy import stats
+
+        r = self.pearson().to_numpy()
+        dof = self.n - 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = r * np.sqrt(dof / (1 - r ** 2))
+        p_values = 2 * stats.t.sf(np.abs(t), dof)
+        return pd.DataFrame(p_values, index=self.columns, columns=self.columns)
+
+    def corr(self, col_a, col_b, method="pearson"):
+        """Correlation between two columns"""
+        matrix = self.pearson() if method == "pearson" else self.spearman()
+        return float(matrix.loc[col_a, col_b])
+
+    # ----------------------------
+    # PERSISTENCE
+    # ----------------------------
+    def save(self, path=STATS_PATH, source=None) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        width = max((len(e) for e in self.edges), default=0)
+        edges = np.full((len(self.edges), width), np.inf)
+        edge_counts = np.array([len(e) for e in self.edges])
+        for i, e in enumerate(self.edges):
+            edges[i, :len(e)] = e
+        source = source or {}
+        with atomic_path(path) as tmp_path:
+            np.savez_compressed(tmp_path, columns=np.array(self.columns), edges=edges,
+                                edge_counts=edge_counts, shift=self.shift, n=self.n, sums=self.sums,
+                                cross=self.cross, joint=self.joint,
+                                source_bytes=source.get("bytes", 0),
+                                source_prefix_sha256=source.get("prefix_sha256", ""))
+
+    @classmethod
+    def load(cls, path=STATS_PATH):
+        """Return (stats, source) from a saved store"""
+        with np.load(path) as data:
+            edges = [row[:count] for row, count in zip(data["edges"], data["edge_counts"])]
+            stats = cls(data["columns"].tolist(), edges, shift=data["shift"])
+            stats.n = int(data["n"])
+            stats.sums = data["sums"]
+            stats.cross = data["cross"]
+            stats.joint = data["joint"]
+            source = {"bytes": int(data["source_bytes"]),
+                      "prefix_sha256": str(data["source_prefix_sha256"])}
+        return stats, source
+
+
+# ----------------------------
+# CSV-BACKED STORE
+# ----------------------------
+def _prefix_sha256(path, length):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(1 << 20, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def sync_correlation_stats(csv_path=CLEANED_DATA, store_path=STATS_PATH):
+    """
+    Bring the store up to date with the CSV. Appended rows are parsed and
+    folded in on their own; any other change to the file triggers a rebuild.
+    """
+    size = os.path.getsize(csv_path)
+    if os.path.isfile(store_path):
+        stats, source = CorrelationStats.load(store_path)
+        seen = source["bytes"]
+        if seen and seen <= size and _prefix_sha256(csv_path, seen) == source["prefix_sha256"]:
+            if seen == size:
+                return stats
+            with open(csv_path, "rb") as f:
+                f.seek(seen)
+                tail = f.read()
+            new_rows = pd.read_csv(io.BytesIO(tail), header=None, names=pd.read_csv(csv_path, nrows=0).columns)
+            stats.update(new_rows)
+            stats.save(store_path, {"bytes": size, "prefix_sha256": _prefix_sha256(csv_path, size)})
+            return stats
+
+    stats = CorrelationStats.from_frame(pd.read_csv(csv_path))
+    stats.save(store_path, {"bytes": size, "prefix_sha256": _prefix_sha256(csv_path, size)})
+    return stats
+
+
+_cached = {}
+
+
+def get_correlation_stats(csv_path=CLEANED_DATA, store_path=STATS_PATH):
+    """Process-wide store, re-synced only when the CSV's mtime or size changes"""
+    stat = os.stat(csv_path)
+    key = (csv_path, stat.st_mtime_ns, stat.st_size)
+    if _cached.get("key") != key:
+        _cached["stats"] = sync_correlation_stats(csv_path, store_path)
+        _cached["key"] = key
+    return _cached["stats"]
@@ -0,0 +1,259 @@
+"""
+Columnar, typed, memory-mapped access to the project datasets
+Each CSV under outputs/datasets (collection, cleaned, engineered) is converted
+once into one .npy file per column, with an explicit schema derived from
+inputs/datasets/raw/house-metadata.txt: categoricals for the quality/finish
+ratings and the smallest integer type that fits each integral column. Pages
+get DataFrames whose columns are read-only views of the memory-mapped files.
+
+Usage (from the repository root):
+    python app_pages/dataset_store.py        # convert all datasets and report
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_registry import file_fingerprint
+from instrumentation import timed
+from atomic_io import write_json_atomic
+
+DATASETS_DIR = "outputs/datasets"
+COLUMNAR_DIR = "outputs/datasets/columnar"
+METADATA_PATH = "inputs/datasets/raw/house-metadata.txt"
+DATASET_GROUPS = ("collection", "cleaned", "engineered")
+
+INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+# ----------------------------
+# SCHEMA
+# ----------------------------
+def parse_metadata(path=METADATA_PATH):
+    """
+    Read house-metadata.txt into {column: {"categories": [...]} or {"range": [lo, hi]}}
+    """
+    metadata = {}
+    column = None
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if not line[0].isspace():
+                column = line.split(":", 1)[0].strip()
+                metadata[column] = {}
+                continue
+            text = line.strip().rstrip(";")
+            match = re.fullmatch(r"(-?\d+)\s*-\s*(-?\d+)\|?", text)
+            if match:
+                metadata[column]["range"] = [int(match.group(1)), int(match.group(2))]
+            else:
+                code = text.split(":", 1)[0].strip()
+                metadata[column].setdefault("categories", []).append(code)
+    return metadata
+
+
+def column_spec(name, series, metadata):
+    """Storage type for one column"""
+    meta = metadata.get(name, {})
+
+    if not pd.api.types.is_numeric_dtype(series):
+        categories = [c for c in meta.get("categories", [])]
+        extra = sorted(set(series.dropna().astype(str)) - set(categories))
+        return {"kind": "category", "categories": categories + extra}
+
+    values = series.to_numpy(dtype=np.float64)
+    if np.isnan(values).any() or not np.array_equal(values, np.round(values)):
+        return {"kind": "float", "dtype": "float64"}
+
+    lo, hi = (values.min(), values.max()) if len(values) else (0, 0)
+    if "range" in meta:
+        lo, hi = min(lo, meta["range"][0]), max(hi, meta["range"][1])
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return {"kind": "int", "dtype": np.dtype(dtype).name}
+    return {"kind": "float", "dtype": "float64"}
+
+
+# ----------------------------
+# CONVERSION
+# ----------------------------
+def csv_path(name):
+    return os.path.join(DATASETS_DIR, f"{name}.csv")
+
+
+def store_dir(name, fingerprint):
+    return os.path.join(COLUMNAR_DIR, name, fingerprint[:16])
+
+
+def convert_dataset(name, metadata=None):
+    """Convert one CSV into a columnar store and return its directory"""
+    metadata = metadata if metadata is not None else parse_metadata()
+    source = csv_path(name)
+    fingerprint = file_fingerprint(source)
+    final_dir = store_dir(name, fingerprint)
+    if os.path.isfile(os.path.join(final_dir, "schema.json")):
+        return final_dir
+
+    df = pd.read_csv(source)
+    os.makedirs(os.path.dirname(final_dir), exist_ok=True)
+    # Unique per writer: sessions of one process may convert the same dataset at once
+    tmp_dir = tempfile.mkdtemp(prefix=f"{os.path.basename(final_dir)}.tmp", dir=os.path.dirname(final_dir))
+    try:
+        schema = {"source": source, "fingerprint": fingerprint, "rows": len(df), "columns": []}
+        for i, col in enumerate(df.columns):
+            spec = column_spec(col, df[col], metadata)
+            if spec["kind"] == "category":
+                values = pd.Categorical(df[col].astype("string"), categories=spec["categories"]).codes
+                values = values.astype(np.int8 if len(spec["categories"]) < 127 else np.int32)
+            else:
+                values = df[col].to_numpy(dtype=spec["dtype"])
+            file_name = f"{i:03d}.npy"
+            np.save(os.path.join(tmp_dir, file_name), np.ascontiguousarray(values))
+            schema["columns"].append({"name": col, "file": file_name, **spec})
+        write_json_atomic(os.path.join(tmp_dir, "schema.json"), schema, indent=2)
+
+        try:
+            os.replace(tmp_dir, final_dir)
+        except OSError:
+            # Another writer got there first (ENOTEMPTY/EEXIST); its store is as good as ours
+            if not os.path.isfile(os.path.join(final_dir, "schema.json")):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    # Drop stores built from older versions of the CSV
+    parent = os.path.dirname(final_dir)
+    for entry in os.listdir(parent):
+        path = os.path.join(parent, entry)
+        if path != final_dir and os.path.isdir(path) and ".tmp" not in entry:
+            shutil.rmtree(path, ignore_errors=True)
+
+    return final_dir
+
+
+def available_datasets():
+    """Dataset names (group/file) for every CSV under the dataset groups"""
+    names = []
+    for group in DATASET_GROUPS:
+        folder = os.path.join(DATASETS_DIR, group)
+        if os.path.isdir(folder):
+            names += [f"{group}/{f[:-4]}" for f in sorted(os.listdir(folder)) if f.endswith(".csv")]
+    return names
+
+
+# ----------------------------
+# ACCESS
+# ----------------------------
+def read_store(directory):
+    """DataFrame over memory-mapped columns of a converted dataset"""
+    with open(os.path.join(directory, "schema.json")) as f:
+        schema = json.load(f)
+
+    columns = {}
+    for spec in schema["columns"]:
+        values = np.load(os.path.join(directory, spec["file"]), mmap_mode="r")
+        if spec["kind"] == "category":
+            dtype = pd.CategoricalDtype(spec["categories"])
+            columns[spec["name"]] = pd.Categorical.from_codes(values, dtype=dtype)
+        else:
+            columns[spec["name"]] = values
+    # copy=False keeps each column backed by its mapped file
+    return pd.DataFrame(columns, copy=False)
+
+
+_loaded = {}
+
+
+def load_dataset(name):
+    """
+    Process-wide typed view of a dataset, e.g. load_dataset("cleaned/house_prices_cleaned").
+    The store is (re)built when the CSV changes.
+    """
+    fingerprint = file_fingerprint(csv_path(name))
+    cached = _loaded.get(name)
+    if cached is None or cached[0] != fingerprint:
+        with timed("load", f"dataset {name}"):
+            cached = (fingerprint, read_store(convert_dataset(name)))
+        _loaded[name] = cached
+    return cached[1]
+
+
+# ----------------------------
+# REPORT
+# ----------------------------
+def _is_mapped(array):
+    """True if an array is (a view of) a memory-mapped file"""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+def _resident_bytes(df):
+    """Bytes held in process memory (mapped columns count as zero until paged in)"""
+    total = 0
+    for col in df.columns:
+        values = df[col].array
+        if isinstance(values, pd.Categorical):
+            total += values.categories.memory_usage(deep=True)
+            total += 0 if _is_mapped(values.codes) else values.codes.nbytes
+        elif not _is_mapped(df[col].to_numpy()):
+            total += df[col].memory_usage(index=False, deep=True)
+    return total
+
+
+def compare_with_csv(name, repeats=5):
+    """Load time and in-memory size of the CSV path versus the columnar store"""
+    convert_dataset(name)
+    directory = store_dir(name, file_fingerprint(csv_path(name)))
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        csv_df = pd.read_csv(csv_path(name))
+    csv_seconds = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        columnar_df = read_store(directory)
+    columnar_seconds = (time.perf_counter() - start) / repeats
+
+    return {
+        "dataset": name,
+        "rows": len(csv_df),
+        "csv_load_ms": csv_seconds * 1000,
+        "columnar_load_ms": columnar_seconds * 1000,
+        "csv_memory_bytes": int(csv_df.memory_usage(index=False, deep=True).sum()),
+        "columnar_memory_bytes": int(columnar_df.memory_usage(index=False, deep=True).sum()),
+        "columnar_resident_bytes": int(_resident_bytes(columnar_df)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert datasets to the columnar store")
+    parser.add_argument("names", nargs="*", help="Datasets to convert (default: all)")
+    args = parser.parse_args(argv)
+
+    metadata = parse_metadata()
+    for name in args.names or available_datasets():
+        convert_dataset(name, metadata)
+        r = compare_with_csv(name)
+        print(
+            f"* {name}: {r['rows']} rows | load {r['csv_load_ms']:.1f} ms (CSV) -> "
+            f"{r['columnar_load_ms']:.1f} ms (columnar) | memory {r['csv_memory_bytes'] / 1024:.0f} KiB -> "
+            f"{r['columnar_memory_bytes'] / 1024:.0f} KiB typed, "
+            f"{r['columnar_resident_bytes'] / 1024:.0f} KiB resident"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Input drift monitor for live and batch prediction traffic
+Every model version gets a reference sketch built from its X_train.csv: per
+numeric feature the training deciles plus below-minimum, above-maximum and
+missing bins, per categorical feature the vocabulary plus "other" and missing.
+Inputs seen by the live page, the prediction service and the batch scorer are
+counted into the same fixed bins, so memory is constant however much traffic
+passes through and an update costs one bisect per feature. Counts are merged
+into vN/drift/<source>.json and compared with the reference as PSI and a
+binned KS distance on the Model Performance page.
+
+Usage (from the repository root):
+    python app_pages/drift_monitor.py --version v1
+    python app_pages/drift_monitor.py --version v1 --reset
+"""
+
+import argparse
+import atexit
+import bisect
+import json
+import math
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, state files are only guarded within this process
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+from model_registry import DEFAULT_VERSION, PIPELINE_DIR, file_fingerprint
+from model_bundle import load_bundle
+from atomic_io import write_json_atomic
+
+SOURCES = ("live", "batch")
+NUMERIC_BINS = 10
+# Usual PSI reading: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 significant shift
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+KS_ALERT = 0.2
+MIN_OBSERVATIONS = 30
+FLUSH_SECONDS = 5.0
+# Floor for empty bins so PSI stays finite
+EPSILON = 1e-4
+
+
+def drift_dir(version=DEFAULT_VERSION):
+    return os.path.join(PIPELINE_DIR, version, "drift")
+
+
+# ----------------------------
+# REFERENCE SKETCH
+# ----------------------------
+class FeatureSketch:
+    """Fixed bins for one feature and the value -> bin mapping"""
+
+    def __init__(self, spec) -> None:
+        self.spec = spec
+        self.name = spec["name"]
+        self.numeric = spec["kind"] == "numeric"
+        if self.numeric:
+            self.cuts = spec["cuts"]
+            self.low, self.high = spec["min"], spec["max"]
+            # below min | len(cuts) + 1 in-range bins | above max | missing
+            self.size = len(self.cuts) + 4
+        else:
+            self.index = {category: i for i, category in enumerate(spec["categories"])}
+            # categories | other | missing
+            self.size = len(self.index) + 2
+
+    def bin(self, value):
+        """Bin of one value, O(log bins) with at most a dozen bins"""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return self.size - 1
+        if not self.numeric:
+            return self.index.get(str(value), self.size - 2)
+        value = float(value)
+        if value < self.low:
+            return 0
+        if value > self.high:
+            return self.size - 2
+        return 1 + bisect.bisect_right(self.cuts, value)
+
+    def counts(self, values):
+        """Bin counts for a whole column (vectorized version of bin)"""
+        series = pd.Series(values)
+        missing = series.isna().to_numpy()
+        if self.numeric:
+            x = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64")
+            bins = 1 + np.searchsorted(self.cuts, x, side="right")
+            bins[x < self.low] = 0
+            bins[x > self.high] = self.size - 2
+        else:
+            bins = series.astype(str).map(self.index).fillna(self.size - 2).to_numpy(dtype="int64", copy=True)
+        bins[missing] = self.size - 1
+        return np.bincount(bins, minlength=self.size)
+
+    def labels(self):
+        if self.numeric:
+            edges = [self.low, *self.cuts, self.high]
+            inner = [f"{a:g}-{b:g}" for a, b in zip(edges[:-1], edges[1:])]
+            return [f"<{self.low:g}", *inner, f">{self.high:g}", "missing"]
+        return [*self.spec["categories"], "other", "missing"]
+
+
+def build_reference(version=DEFAULT_VERSION):
+    """Sketch specs and training bin proportions for every pipeline input"""
+    bundle = load_bundle(version)
+    X_train = pd.read_csv(os.path.join(PIPELINE_DIR, version, "X_train.csv"))
+    features = []
+    for name in bundle.feature_names:
+        column = X_train[name]
+        if bundle.dtypes[name] == "category":
+            spec = {"name": name, "kind": "categorical", "categories": bundle.vocabularies[name]}
+        else:
+            values = column.dropna().to_numpy(dtype="float64")
+            quantiles = np.unique(np.quantile(values, np.linspace(0, 1, NUMERIC_BINS + 1)))
+            spec = {"name": name, "kind": "numeric", "cuts": [float(q) for q in quantiles[1:-1]],
+                    "min": float(values.min()), "max": float(values.max())}
+        counts = FeatureSketch(spec).counts(column)
+        spec["proportions"] = (counts / counts.sum()).tolist()
+        features.append(spec)
+    return {"pipeline_sha256": bundle.pipeline_sha256,
+            "train_fingerprint": file_fingerprint(os.path.join(PIPELINE_DIR, version, "X_train.csv")),
+            "rows": len(X_train), "features": features}
+
+
+_references = {}
+
+
+def load_reference(version=DEFAULT_VERSION):
+    """Reference for the current pipeline of a version, rebuilt when stale"""
+    sha256 = load_bundle(version).pipeline_sha256
+    cached = _references.get(version)
+    if cached is not None and cached["pipeline_sha256"] == sha256:
+        return cached
+
+    path = os.path.join(drift_dir(version), "reference.json")
+    reference = None
+    if os.path.isfile(path):
+        with open(path) as f:
+            reference = json.load(f)
+        train_path = os.path.join(PIPELINE_DIR, version, "X_train.csv")
+        if (reference.get("pipeline_sha256") != sha256
+                or reference.get("train_fingerprint") != file_fingerprint(train_path)):
+            reference = None
+    if reference is None:
+        reference = build_reference(version)
+        os.makedirs(drift_dir(version), exist_ok=True)
+        write_json_atomic(path, reference)
+    _references[version] = reference
+    return reference
+
+
+# ----------------------------
+# MONITOR
+# ----------------------------
+# Serializes state-file merges between monitors of this process (the only guard without fcntl)
+_state_lock = threading.Lock()
+
+
+class DriftMonitor:
+    """
+    In-process counts for one traffic source, merged into the shared state
+    file (under a file lock, so several app workers and the batch scorer can
+    write) at most every FLUSH_SECONDS and on exit. Without fcntl (Windows)
+    the merge is only locked within the process, so run one writer per source
+    """
+
+    def __init__(self, version=DEFAULT_VERSION, source="live") -> None:
+        self.version = version
+        self.source = source
+        self.reference = load_reference(version)
+        self.sketches = {spec["name"]: FeatureSketch(spec) for spec in self.reference["features"]}
+        self._pending = {name: np.zeros(s.size, dtype="int64") for name, s in self.sketches.items()}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    @property
+    def state_path(self):
+        return os.path.join(drift_dir(self.version), f"{self.source}.json")
+
+    def update(self, values: dict) -> None:
+        """Count one house; features it does not carry are left out"""
+        with self._lock:
+            for name, value in values.items():
+                sketch = self.sketches.get(name)
+                if sketch is not None:
+                    self._pending[name][sketch.bin(value)] += 1
+        self._maybe_flush()
+
+    def update_frame(self, df) -> None:
+        """Count every row of a batch"""
+        counts = {name: sketch.counts(df[name]) for name, sketch in self.sketches.items() if name in df}
+        with self._lock:
+            for name, c in counts.items():
+                self._pending[name] += c
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Add the pending counts to the state file"""
+        with self._lock:
+            pending = {name: c.copy() for name, c in self._pending.items() if c.any()}
+            for c in self._pending.values():
+                c[:] = 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+
+        os.makedirs(drift_dir(self.version), exist_ok=True)
+        with _state_lock, open(f"{self.state_path}.lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            state = read_state(self.version, self.source)
+            for name, c in pending.items():
+                total = np.asarray(state["counts"].get(name, np.zeros(len(c))), dtype="int64") + c
+                state["counts"][name] = total.tolist()
+            state["updated"] = time.time()
+            write_json_atomic(self.state_path, state)
+
+
+def read_state(version=DEFAULT_VERSION, source="live"):
+    """Accumulated counts of a source; empty when missing or for an older reference"""
+    reference = load_reference(version)
+    path = os.path.join(drift_dir(version), f"{source}.json")
+    if os.path.isfile(path):
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("pipeline_sha256") == reference["pipeline_sha256"]:
+            return state
+    return {"pipeline_sha256": reference["pipeline_sha256"], "since": time.time(), "counts": {}}
+
+
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+
+def get_monitor(version=DEFAULT_VERSION, source="live"):
+    """Process-wide monitor per version and source"""
+    with _monitors_lock:
+        monitor = _monitors.get((version, source))
+        if monitor is None or monitor.reference is not load_reference(version):
+            if monitor is not None:
+                monitor.flush()
+            monitor = DriftMonitor(version, source)
+            _monitors[(version, source)] = monitor
+        return monitor
+
+
+@atexit.register
+def flush_all() -> None:
+    for monitor in list(_monitors.values()):
+        monitor.flush()
+
+
+def reset(version=DEFAULT_VERSION, sources=SOURCES) -> None:
+    for source in sources:
+        path = os.path.join(drift_dir(version), f"{source}.json")
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+# ----------------------------
+# SCORES
+# ----------------------------
+def psi(expected, actual):
+    """Population stability index between two proportion vectors"""
+    p = np.maximum(np.asarray(expected, dtype="float64"), EPSILON)
+    q = np.maximum(np.asarray(actual, dtype="float64"), EPSILON)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def binned_ks(expected, actual):
+    """Largest gap between the two binned CDFs (missing bin excluded)"""
+    p = np.asarray(expected[:-1], dtype="float64")
+    q = np.asarray(actual[:-1], dtype="float64")
+    p, q = p / max(p.sum(), EPSILON), q / max(q.sum(), EPSILON)
+    return float(np.max(np.abs(np.cumsum(p) - np.cumsum(q))))
+
+
+def drift_report(version=DEFAULT_VERSION, sources=SOURCES):
+    """
+    One row per source and feature with enough observations: PSI, binned KS
+    (numeric features), share outside the training range and a status of
+    "ok", "warning" or "alert"
+    """
+    flush_all()
+    reference = load_reference(version)
+    rows = []
+    for source in sources:
+        counts = read_state(version, source)["counts"]
+        for spec in reference["features"]:
+            observed = np.asarray(counts.get(spec["name"], []), dtype="float64")
+            if observed.sum() < MIN_OBSERVATIONS:
+                continue
+            actual = observed / observed.sum()
+            score = psi(spec["proportions"], actual)
+            numeric = spec["kind"] == "numeric"
+            ks = binned_ks(spec["proportions"], actual) if numeric else None
+            outside = actual[0] + actual[-2] if numeric else actual[-2]
+            if score > PSI_ALERT or (ks is not None and ks > KS_ALERT):
+                status = "alert"
+            elif score > PSI_WARNING:
+                status = "warning"
+            else:
+                status = "ok"
+            rows.append({"source": source, "feature": spec["name"], "observations": int(observed.sum()),
+                         "psi": score, "ks": ks, "outside_training": float(outside), "status": status})
+    return pd.DataFrame(rows, columns=["source", "feature", "observations", "psi", "ks",
+                                       "outside_training", "status"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Input drift against the training data")
+    parser.add_argument("--version", default=DEFAULT_VERSION, help="Pipeline version (default: %(default)s)")
+    parser.add_argument("--reset", action="store_true", help="Clear the accumulated live and batch counts")
+    args = parser.parse_args(argv)
+
+    if args.reset:
+        reset(args.version)
+        print(f"✅ Drift counts cleared for {args.version}")
+        return
+
+    report = drift_report(args.version)
+    if report.empty:
+        print(f"No source has {MIN_OBSERVATIONS}+ observations for {args.version} yet")
+        return
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
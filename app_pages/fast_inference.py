@@ -0,0 +1,388 @@
+"""
+Precompiled single-row inference for the Live Price Prediction Tool
+The fitted preprocessing steps are resolved once into array operations
+(ordinal lookups, column index selection, scaler affine) and tree ensembles
+(sklearn forests, gradient boosting, xgboost) into flat node arrays, so a
+prediction only writes widget values into a typed default row and walks the
+trees with NumPy. The compiled form can be exported to a standalone .npz.
+"""
+
+import numpy as np
+
+from atomic_io import atomic_path
+
+# Above this many rows a batch is handed to the model's own predict
+NATIVE_BATCH_ROWS = 1024
+# The tree walk holds (rows x trees) node arrays; rows are walked in blocks of
+# about this many elements, so memory stays flat whatever the batch size
+WALK_BLOCK_ELEMENTS = 1 << 16
+
+
+class UncompilableStep(Exception):
+    """A pipeline step without an array equivalent; callers fall back to pipeline.predict"""
+
+
+class FlatForest:
+    """
+    Trees of a fitted ensemble flattened into contiguous node arrays.
+    All trees are walked together, one vectorized step per depth level.
+    Averaging forests (combine="mean") and boosted ensembles
+    (combine="sum": base + scale * sum of leaves) share the same walk.
+    """
+
+    ARRAYS = ("roots", "left", "right", "feature", "threshold", "value")
+
+    def __init__(self, roots, left, right, feature, threshold, value,
+                 combine="mean", base=0.0, scale=1.0, strict=False) -> None:
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.combine = combine
+        self.base = float(base)
+        self.scale = float(scale)
+        # sklearn sends x <= threshold left, xgboost x < threshold
+        self.strict = bool(strict)
+        self.depth = self._depth()
+        # Both children of node i at 2i (right) and 2i + 1 (left): one gather per level
+        self.children = np.stack([self.right, self.left], axis=1).ravel()
+
+    def _depth(self):
+        """Levels needed until every root has reached a leaf"""
+        nodes, depth = self.roots, 0
+        while len(nodes):
+            children = np.concatenate([self.left[nodes], self.right[nodes]])
+            nodes = np.unique(children[children != np.concatenate([nodes, nodes])])
+            depth += 1 if len(nodes) else 0
+        return depth
+
+    @classmethod
+    def from_trees(cls, trees, **kwargs):
+        """Flatten sklearn Tree objects (estimator.tree_)"""
+        sizes = [tree.node_count for tree in trees]
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+
+        left, right, feature, threshold, value = [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count, dtype=np.intp) + offset
+            is_leaf = tree.children_left == -1
+            # Leaves point to themselves so extra steps are no-ops
+            left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+            right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            value.append(tree.value.reshape(tree.node_count, -1)[:, 0])
+
+        return cls(offsets, np.concatenate(left), np.concatenate(right), np.concatenate(feature),
+                   np.concatenate(threshold), np.concatenate(value), **kwargs)
+
+    @classmethod
+    def from_xgboost(cls, model):
+        """Flatten a fitted XGBRegressor (regression objective, no missing values)"""
+        import json
+
+        learner = json.loads(model.get_booster().save_raw(raw_format="json"))["learner"]
+        base = str(learner["learner_model_param"]["base_score"]).strip("[]")
+
+        roots, left, right, feature, threshold, value = [], [], [], [], [], []
+        offset = 0
+        for tree in learner["gradient_booster"]["model"]["trees"]:
+            children_left = np.asarray(tree["left_children"], dtype=np.intp)
+            nodes = np.arange(len(children_left), dtype=np.intp) + offset
+            is_leaf = children_left == -1
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            roots.append(offset)
+            left.append(np.where(is_leaf, nodes, children_left + offset))
+            right.append(np.where(is_leaf, nodes, np.asarray(tree["right_children"]) + offset))
+            feature.append(np.where(is_leaf, 0, tree["split_indices"]))
+            # Leaves keep their weight in split_conditions
+            threshold.append(np.where(is_leaf, 0.0, conditions))
+            value.append(np.where(is_leaf, conditions, 0.0))
+            offset += len(children_left)
+
+        return cls(roots, np.concatenate(left), np.concatenate(right), np.concatenate(feature),
+                   np.concatenate(threshold), np.concatenate(value),
+                   combine="sum", base=float(base), strict=True)
+
+    @classmethod
+    def from_model(cls, model):
+        """Build from a fitted tree ensemble or single tree, None if unsupported"""
+        name = type(model).__name__
+        if name in ("RandomForestRegressor", "ExtraTreesRegressor"):
+            return cls.from_trees([est.tree_ for est in model.estimators_])
+        if name == "DecisionTreeRegressor":
+            return cls.from_trees([model.tree_])
+        if name == "GradientBoostingRegressor":
+            if model.init_ == "zero":
+                base = 0.0
+            elif hasattr(model.init_, "constant_"):
+                base = float(np.ravel(model.init_.constant_)[0])
+            else:
+                return None
+            return cls.from_trees([est.tree_ for est in model.estimators_[:, 0]],
+                                  combine="sum", base=base, scale=model.learning_rate)
+        if name == "XGBRegressor":
+            return cls.from_xgboost(model)
+        return None
+
+    def _block_rows(self):
+        return max(1, WALK_BLOCK_ELEMENTS // len(self.roots))
+
+    def _walk(self, X):
+        """(rows, trees) leaf values for one block of float64 rows"""
+        flat = np.ascontiguousarray(X).ravel()
+        row_start = (np.arange(X.shape[0]) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.depth):
+            x = flat[row_start + self.feature[nodes]]
+            go_left = x < self.threshold[nodes] if self.strict else x <= self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_left]
+        return self.value[nodes]
+
+    def _combine(self, leaves):
+        # cumsum adds trees in order, matching the libraries' accumulation
+        if self.combine == "mean":
+            return np.cumsum(leaves, axis=1)[:, -1] / len(self.roots)
+        start = np.full((leaves.shape[0], 1), self.base)
+        return np.cumsum(np.hstack([start, self.scale * leaves]), axis=1)[:, -1]
+
+    def leaf_values(self, X):
+        """(rows, trees) matrix with the leaf value every tree gives every row"""
+        # Both libraries compare float32 inputs against the stored thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        step = self._block_rows()
+        return np.concatenate([self._walk(X[start:start + step]) for start in range(0, len(X), step)]
+                              or [np.empty((0, len(self.roots)))])
+
+    def predict(self, X):
+        """Ensemble prediction for every row of X, walked in row blocks"""
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        step = self._block_rows()
+        prediction = np.empty(len(X))
+        for start in range(0, len(X), step):
+            prediction[start:start + step] = self._combine(self._walk(X[start:start + step]))
+        return prediction
+
+    # ----------------------------
+    # EXPORT
+    # ----------------------------
+    def to_arrays(self, prefix="forest_"):
+        arrays = {prefix + name: getattr(self, name) for name in self.ARRAYS}
+        # Node indices fit in int32; thresholds and leaves stay float64 for exact parity
+        for name in ("roots", "left", "right", "feature"):
+            arrays[prefix + name] = arrays[prefix + name].astype(np.int32)
+        arrays[prefix + "meta"] = np.array([self.combine, repr(self.base), repr(self.scale),
+                                            str(int(self.strict))])
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix="forest_"):
+        combine, base, scale, strict = arrays[prefix + "meta"].tolist()
+        return cls(*(arrays[prefix + name] for name in cls.ARRAYS),
+                   combine=combine, base=float(base), scale=float(scale), strict=strict == "1")
+
+
+class CompiledPredictor:
+
+    def __init__(self, pipeline, defaults: dict = None) -> None:
+        self.pipeline = pipeline
+        self.feature_names = list(pipeline.feature_names_in_)
+        self.offsets = {name: i for i, name in enumerate(self.feature_names)}
+        self.encodings = {}
+        self.steps = []
+
+        names = list(self.feature_names)
+        for step_name, step in pipeline.steps[:-1]:
+            names = self._compile_step(step_name, step, names)
+
+        self.model = pipeline.steps[-1][1]
+        self.forest = FlatForest.from_model(self.model)
+        self.evaluate = self.forest.predict if self.forest else self.model.predict
+        self.template = np.array(
+            [self.encode(name, defaults[name]) if defaults else np.nan for name in self.feature_names],
+            dtype=np.float64,
+        )
+
+    def _compile_step(self, step_name, step, names):
+        """Turn one fitted transformer into an array operation"""
+        if hasattr(step, "encoder_dict_"):
+            # feature-engine OrdinalEncoder: pre-resolve category -> code
+            for var, mapping in step.encoder_dict_.items():
+                self.encodings[var] = dict(mapping)
+            return names
+
+        if hasattr(step, "features_to_drop_"):
+            # feature-engine selectors (SmartCorrelatedSelection, DropFeatures)
+            dropped = set(step.features_to_drop_)
+            keep = [i for i, name in enumerate(names) if name not in dropped]
+            self.steps.append(("take", np.array(keep, dtype=np.intp)))
+            return [names[i] for i in keep]
+
+        if hasattr(step, "mean_") and hasattr(step, "scale_"):
+            # StandardScaler
+            mean = step.mean_ if step.with_mean else np.zeros(len(names))
+            scale = step.scale_ if step.with_std else np.ones(len(names))
+            self.steps.append(("affine", (np.asarray(mean, dtype=np.float64),
+                                          np.asarray(scale, dtype=np.float64))))
+            return names
+
+        if hasattr(step, "get_support"):
+            # SelectFromModel and other sklearn selectors
+            keep = np.flatnonzero(step.get_support())
+            self.steps.append(("take", keep.astype(np.intp)))
+            return [names[i] for i in keep]
+
+        raise UncompilableStep(
+            f"Pipeline step '{step_name}' ({type(step).__name__}) has no fast path"
+        )
+
+    @property
+    def used_features(self):
+        """Raw features that still reach the model after the selection steps"""
+        index = np.arange(len(self.feature_names))
+        for kind, arg in self.steps:
+            if kind == "take":
+                index = index[arg]
+        return [self.feature_names[i] for i in index]
+
+    def encode(self, name, value):
+        """Map a raw feature value to the numeric value the pipeline sees"""
+        mapping = self.encodings.get(name)
+        if mapping is None:
+            return value
+        try:
+            return mapping[value]
+        except KeyError:
+            raise ValueError(f"Unknown category {value!r} for {name}") from None
+
+    def transform(self, X):
+        """Apply the precompiled preprocessing to a 2D float array"""
+        for kind, arg in self.steps:
+            if kind == "take":
+                X = X[:, arg]
+            else:
+                mean, scale = arg
+                X = (X - mean) / scale
+        return X
+
+    def predict_one(self, values: dict) -> float:
+        """Predict one house from {feature: value}, other features use defaults"""
+        X = self.template.copy()
+        for name, value in values.items():
+            offset = self.offsets.get(name)
+            if offset is not None:
+                X[offset] = self.encode(name, value)
+        return float(self.evaluate(self.transform(X[None, :]))[0])
+
+    def predict_many(self, rows: list):
+        """Predict a list of partial inputs in one vectorized pass"""
+        X = np.repeat(self.template[None, :], len(rows), axis=0)
+        for i, values in enumerate(rows):
+            for name, value in values.items():
+                offset = self.offsets.get(name)
+                if offset is not None:
+                    X[i, offset] = self.encode(name, value)
+        return self.evaluate(self.transform(X))
+
+    def evaluate_batch(self, X):
+        """
+        Model output for an already transformed array of any size. The NumPy
+        walk has the lowest per-call overhead; past NATIVE_BATCH_ROWS rows the
+        library's own compiled predict is faster, when the model is attached.
+        """
+        if self.model is not None and len(X) > NATIVE_BATCH_ROWS:
+            return self.model.predict(X)
+        return self.evaluate(X)
+
+    def predict_frame(self, df):
+        """Predict every row of a DataFrame holding the raw pipeline features"""
+        return self.evaluate_batch(self.transform(self.frame_to_array(df)))
+
+    def frame_to_array(self, df):
+        """Encode the raw pipeline features of a DataFrame into a float array"""
+        X = np.empty((len(df), len(self.feature_names)), dtype=np.float64)
+        for i, name in enumerate(self.feature_names):
+            mapping = self.encodings.get(name)
+            if mapping is None:
+                X[:, i] = df[name].to_numpy(dtype=np.float64)
+                continue
+            codes = df[name].map(mapping)
+            unknown = codes.isna() & df[name].notna()
+            if unknown.any():
+                raise ValueError(f"Unknown category {df[name][unknown].iloc[0]!r} for {name}")
+            X[:, i] = codes.to_numpy(dtype=np.float64)
+        return X
+
+    # ----------------------------
+    # EXPORT
+    # ----------------------------
+    def save(self, path, source="") -> None:
+        """
+        Write lookup tables, preprocessing arrays and the flat trees to one
+        .npz file that loads without sklearn, feature-engine or xgboost.
+        source identifies the pipeline it was compiled from (e.g. its sha256).
+        """
+        if self.forest is None:
+            raise ValueError(f"{type(self.model).__name__} has no flat tree evaluator to export")
+
+        arrays = {
+            "source": np.array(source),
+            "feature_names": np.array(self.feature_names),
+            "template": self.template,
+            "encoded": np.array(list(self.encodings)),
+            "step_kinds": np.array([kind for kind, _ in self.steps]),
+            **self.forest.to_arrays(),
+        }
+        for i, mapping in enumerate(self.encodings.values()):
+            arrays[f"encoding{i}_keys"] = np.array([str(k) for k in mapping])
+            arrays[f"encoding{i}_codes"] = np.array(list(mapping.values()), dtype=np.float64)
+        for i, (kind, arg) in enumerate(self.steps):
+            if kind == "take":
+                arrays[f"step{i}_take"] = arg.astype(np.int32)
+            else:
+                arrays[f"step{i}_mean"], arrays[f"step{i}_scale"] = arg
+
+        with atomic_path(path) as tmp_path:
+            np.savez(tmp_path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Rebuild a predictor from an exported .npz (no pipeline attached)"""
+        self = cls.__new__(cls)
+        with np.load(path) as data:
+            self.source = str(data["source"])
+            self.feature_names = data["feature_names"].tolist()
+            self.template = data["template"]
+            self.encodings = {
+                var: dict(zip(data[f"encoding{i}_keys"].tolist(), data[f"encoding{i}_codes"].tolist()))
+                for i, var in enumerate(data["encoded"].tolist())
+            }
+            self.steps = []
+            for i, kind in enumerate(data["step_kinds"].tolist()):
+                if kind == "take":
+                    self.steps.append((kind, data[f"step{i}_take"].astype(np.intp)))
+                else:
+                    self.steps.append((kind, (data[f"step{i}_mean"], data[f"step{i}_scale"])))
+            self.forest = FlatForest.from_arrays(data)
+        self.offsets = {name: i for i, name in enumerate(self.feature_names)}
+        self.pipeline = None
+        self.model = None
+        self.evaluate = self.forest.predict
+        return self
+
+
+# Compiled predictors, keyed by the identity of the pipeline they wrap
+_compiled = {}
+
+
+def get_compiled_predictor(pipeline, defaults: dict) -> CompiledPredictor:
+    """Compile a pipeline once and reuse it while the same object is live"""
+    entry = _compiled.get(id(pipeline))
+    if entry is None or entry.pipeline is not pipeline:
+        entry = CompiledPredictor(pipeline, defaults)
+        # Only the current pipeline stays compiled; a reload replaces it
+        _compiled.clear()
+        _compiled[id(pipeline)] = entry
+    return entry
@@ -0,0 +1,451 @@
+"""
+Incremental refresh after a new drop of sales records
+Replaces the 01 -> 03 -> 04 -> 05 notebook rerun for a daily data drop:
+    * rows of house_prices_records.csv are hashed and compared with the last
+      refresh, so only new rows (and rows whose fill value changed) are
+      cleaned again; unchanged rows are copied from house_prices_cleaned.csv
+    * existing rows keep their train/test set, new rows are assigned by hash
+      (one in five to the test set, like test_size=0.2), so the test set stays
+      held out across refreshes; membership is stored in the manifest per raw
+      record hash, so a shifted median never moves a row between sets; the
+      engineered sets are rebuilt from the cleaned ones, and only files whose
+      content changed are rewritten
+    * the current model is refitted with its fixed hyperparameters, or grows
+      extra trees / boosting rounds on top of the fitted ensemble, instead of
+      re-running the search
+    * the full search (train_model.py) only runs when the refreshed model's
+      test R² falls more than a threshold below the base version's, both
+      scored on the same test rows
+
+Usage (from the repository root):
+    python app_pages/incremental_refresh.py --base-version v1
+    python app_pages/incremental_refresh.py --mode warm-start --extra-estimators 50
+"""
+
+import argparse
+import copy
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_registry import DEFAULT_VERSION, PIPELINE_DIR, file_fingerprint, load_pipeline
+from atomic_io import atomic_path, write_json_atomic, write_text_atomic
+
+RECORDS = "outputs/datasets/collection/house_prices_records.csv"
+CLEANED = "outputs/datasets/cleaned/house_prices_cleaned.csv"
+TRAIN_CLEANED = "outputs/datasets/cleaned/TrainSetCleaned.csv"
+TEST_CLEANED = "outputs/datasets/cleaned/TestSetCleaned.csv"
+TRAIN_ENGINEERED = "outputs/datasets/engineered/TrainSetEngineered.csv"
+TEST_ENGINEERED = "outputs/datasets/engineered/TestSetEngineered.csv"
+MANIFEST = "outputs/datasets/refresh/manifest.json"
+# Raw record hashes with their cleaned-set and per-version model-set membership
+ROW_STATE = "outputs/datasets/refresh/rows.npz"
+
+TARGET = "SalePrice"
+# 04 - FeatureEngineering: ordinal encoding, IQR capping, selected columns
+ENCODED_FEATURES = ['BsmtExposure', 'BsmtFinType1', 'GarageFinish', 'KitchenQual']
+WINSORIZED_FEATURES = ['GrLivArea', 'LotArea', 'LotFrontage', 'MasVnrArea', 'TotalBsmtSF']
+ENGINEERED_COLUMNS = ['BedroomAbvGr', 'BsmtExposure', 'BsmtFinSF1', 'BsmtFinType1', 'BsmtUnfSF',
+                      'GarageFinish', 'GrLivArea', 'KitchenQual', 'LotArea', 'LotFrontage',
+                      'MasVnrArea', 'OpenPorchSF', 'OverallCond', 'OverallQual', 'TotalBsmtSF',
+                      'YearBuilt', 'SalePrice']
+TEST_BUCKETS = 5
+DEFAULT_THRESHOLD = 0.02
+DEFAULT_EXTRA_ESTIMATORS = 100
+
+
+# ----------------------------
+# ROW HASHING
+# ----------------------------
+def row_hashes(df):
+    """
+    uint64 per row. Numbers are hashed as float64 and everything else as text,
+    so a column turning from int to float (a missing value arrives) does not
+    change the hash of the other rows
+    """
+    normalized = pd.DataFrame({
+        col: df[col].astype("float64") if pd.api.types.is_numeric_dtype(df[col]) else df[col].astype(str)
+        for col in df.columns
+    })
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+def assign_test(hashes):
+    """Deterministic test-set assignment for rows without one"""
+    return hashes % TEST_BUCKETS == 0
+
+
+def _write_csv_if_changed(df, path):
+    """Write df as CSV unless the file already holds exactly that; True if written"""
+    text = df.to_csv(index=False)
+    if os.path.isfile(path):
+        with open(path) as f:
+            if f.read() == text:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_text_atomic(path, text)
+    return True
+
+
+# ----------------------------
+# CLEANING (03 - DataCleaning)
+# ----------------------------
+def fill_values(df):
+    """Mode of categorical and median of numerical columns over the whole dataset"""
+    values = {}
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            values[col] = float(df[col].median())
+        else:
+            values[col] = df[col].mode().iloc[0]
+    return values
+
+
+def clean_rows(df, values):
+    """Fill missing values like the notebook (numerical columns keep their dtype)"""
+    df = df.copy()
+    for col, value in values.items():
+        if df[col].isna().any():
+            df[col] = df[col].fillna(value)
+    return df
+
+
+def load_manifest():
+    """Last refresh: fill values plus, per raw record hash, its cleaned-set and model-set membership"""
+    if not (os.path.isfile(MANIFEST) and os.path.isfile(ROW_STATE)):
+        return None
+    with open(MANIFEST) as f:
+        manifest = json.load(f)
+    with np.load(ROW_STATE) as rows:
+        manifest["row_hashes"] = rows["hashes"]
+        manifest["train_order"] = rows["train_order"]
+        manifest["test_order"] = rows["test_order"]
+        manifest["model_splits"] = {key[len("model_"):]: rows[key] for key in rows.files if key.startswith("model_")}
+    return manifest
+
+
+def save_manifest(state):
+    """
+    state: records, their raw hashes and fill values, the raw hashes of the
+    cleaned train/test sets in file order and {version: membership per row}
+    """
+    os.makedirs(os.path.dirname(MANIFEST), exist_ok=True)
+    splits = {f"model_{version}": flags for version, flags in state["model_splits"].items()}
+    with atomic_path(ROW_STATE) as tmp_path:
+        np.savez(tmp_path, hashes=state["hashes"], train_order=state["train_order"],
+                 test_order=state["test_order"], **splits)
+    write_json_atomic(MANIFEST, {"records_fingerprint": file_fingerprint(RECORDS), "rows": len(state["records"]),
+                                 "fill_values": state["values"], "updated": time.strftime("%Y-%m-%d %H:%M:%S")},
+                      indent=2, default=str)
+
+
+def membership(hashes, lookup):
+    """int8 per row from {raw hash: in test}: 1 test, 0 train, -1 never assigned"""
+    return np.array([int(lookup.get(h, -1)) for h in hashes.tolist()], dtype="int8")
+
+
+def remap_splits(hashes, manifest):
+    """Stored model-set memberships re-aligned with the current records"""
+    if manifest is None:
+        return {}
+    old_hashes = manifest["row_hashes"].tolist()
+    return {version: membership(hashes, {h: f for h, f in zip(old_hashes, flags.tolist()) if f >= 0})
+            for version, flags in manifest["model_splits"].items()}
+
+
+def _raw_hash_lookup(hashes, positions, previous_rows):
+    """{hash of a previous cleaned row: raw hash of the record it was cleaned from}"""
+    cleaned_hashes = row_hashes(previous_rows)
+    return {cleaned_hashes[p]: h for h, p in zip(hashes.tolist(), positions.tolist()) if p >= 0}
+
+
+def refresh_cleaned(records, values, manifest):
+    """
+    Cleaned dataset for the current records, reusing the previous cleaned row
+    of every record that is unchanged and not affected by a new fill value.
+    Returns (cleaned, raw row hashes, previous row position per record (-1 if
+    new), the previous cleaned frame, stats)
+    """
+    hashes = row_hashes(records)
+    previous = pd.read_csv(CLEANED) if os.path.isfile(CLEANED) else None
+
+    if manifest is not None and previous is not None and len(previous) == len(manifest["row_hashes"]):
+        known = dict(zip(manifest["row_hashes"].tolist(), range(len(previous))))
+        old_values = manifest["fill_values"]
+    elif previous is not None:
+        # First refresh: a record is known if its cleaned form is already in the cleaned file.
+        # New records usually arrive at the end, so the old fill values are those of the
+        # first len(previous) records; the current values also match rows without gaps
+        old_values = fill_values(records.iloc[:len(previous)]) if len(records) >= len(previous) else values
+        in_previous = dict(zip(row_hashes(previous).tolist(), range(len(previous))))
+        known = {}
+        for candidate in (old_values, values):
+            for h, c in zip(hashes.tolist(), row_hashes(clean_rows(records, candidate)).tolist()):
+                if c in in_previous:
+                    known.setdefault(h, in_previous[c])
+    else:
+        known, old_values = {}, values
+
+    changed_fills = [col for col, value in values.items() if old_values.get(col) != value]
+    affected = records[changed_fills].isna().any(axis=1).to_numpy() if changed_fills else np.zeros(len(records), bool)
+    positions = np.array([known.get(h, -1) for h in hashes.tolist()], dtype="int64")
+    reuse = (positions >= 0) & ~affected
+
+    # Unaffected rows come from the previous file, only the others are cleaned
+    parts = [clean_rows(records[~reuse], values)]
+    if reuse.any():
+        parts.append(previous.iloc[positions[reuse]].set_axis(records.index[reuse]))
+    cleaned = pd.concat(parts).sort_index()[records.columns]
+    removed = int((~np.isin(manifest["row_hashes"], hashes)).sum()) if manifest is not None else 0
+    stats = {
+        "records": len(records),
+        "new_or_changed": int((positions < 0).sum()),
+        "removed": removed,
+        "refilled": int(((positions >= 0) & affected).sum()),
+        "changed_fill_values": changed_fills,
+    }
+    return cleaned, hashes, positions, previous, stats
+
+
+def previous_cleaned_split(hashes, positions, previous, manifest):
+    """Raw hashes of the current train and test files, in file order"""
+    if manifest is not None:
+        return manifest["train_order"], manifest["test_order"]
+    if previous is None or not (os.path.isfile(TRAIN_CLEANED) and os.path.isfile(TEST_CLEANED)):
+        return np.empty(0, "uint64"), np.empty(0, "uint64")
+    lookup = _raw_hash_lookup(hashes, positions, previous)
+    return tuple(np.array([lookup[c] for c in row_hashes(pd.read_csv(path)).tolist() if c in lookup], dtype="uint64")
+                 for path in (TRAIN_CLEANED, TEST_CLEANED))
+
+
+def order_rows(index, hashes, previous_order):
+    """Rows that are already in the file first, in file order, then the new rows"""
+    rank = {h: i for i, h in enumerate(previous_order.tolist())}
+    keys = [rank.get(h, len(rank) + i) for i, h in enumerate(hashes[index].tolist())]
+    return index[np.argsort(keys, kind="stable")]
+
+
+def split_cleaned(hashes, train_order, test_order):
+    """
+    Row indices of the train and test sets in file order: records keep the set
+    their raw hash was in, whatever their filled values, new records are
+    assigned by hash
+    """
+    lookup = {**{h: False for h in train_order.tolist()}, **{h: True for h in test_order.tolist()}}
+    flags = membership(hashes, lookup)
+    in_test = np.where(flags >= 0, flags == 1, assign_test(hashes))
+    return (order_rows(np.flatnonzero(~in_test), hashes, train_order),
+            order_rows(np.flatnonzero(in_test), hashes, test_order))
+
+
+def engineer(train_set, test_set):
+    """04 - FeatureEngineering, fitted on the train set"""
+    from feature_engine.encoding import OrdinalEncoder
+    from feature_engine.outliers import Winsorizer
+
+    encoder = OrdinalEncoder(encoding_method='arbitrary', variables=ENCODED_FEATURES).fit(train_set)
+    winsorizer = Winsorizer(capping_method='iqr', tail='both', fold=1.5,
+                            variables=WINSORIZED_FEATURES).fit(encoder.transform(train_set))
+    return [winsorizer.transform(encoder.transform(df))[ENGINEERED_COLUMNS] for df in (train_set, test_set)]
+
+
+def refresh_datasets():
+    """
+    Update the cleaned and engineered outputs; returns (stats with the files
+    written, refresh state for model_split and save_manifest)
+    """
+    records = pd.read_csv(RECORDS)
+    values = fill_values(records)
+    manifest = load_manifest()
+    cleaned, hashes, positions, previous, stats = refresh_cleaned(records, values, manifest)
+
+    written = []
+    if _write_csv_if_changed(cleaned, CLEANED):
+        written.append(CLEANED)
+    train_index, test_index = split_cleaned(hashes, *previous_cleaned_split(hashes, positions, previous, manifest))
+    train_set = cleaned.iloc[train_index].reset_index(drop=True)
+    test_set = cleaned.iloc[test_index].reset_index(drop=True)
+    for df, path in ((train_set, TRAIN_CLEANED), (test_set, TEST_CLEANED)):
+        if _write_csv_if_changed(df, path):
+            written.append(path)
+    if TRAIN_CLEANED in written or TEST_CLEANED in written:
+        for df, path in zip(engineer(train_set, test_set), (TRAIN_ENGINEERED, TEST_ENGINEERED)):
+            if _write_csv_if_changed(df, path):
+                written.append(path)
+
+    stats["files_written"] = written
+    state = {"records": records, "hashes": hashes, "values": values, "cleaned": cleaned,
+             "positions": positions, "previous": previous,
+             "train_order": hashes[train_index], "test_order": hashes[test_index],
+             "model_splits": remap_splits(hashes, manifest)}
+    return stats, state
+
+
+# ----------------------------
+# MODEL
+# ----------------------------
+def model_split(base_version, state):
+    """
+    (X_train, X_test, y_train, y_test, in_test) from the refreshed cleaned
+    data: records the base version trained or tested on stay where they were
+    (looked up by raw record hash, so a new fill value never moves a row), new
+    records are assigned by hash
+    """
+    from train_model import DROPPED_FEATURES
+
+    df = state["cleaned"].drop(labels=DROPPED_FEATURES, axis=1).reset_index(drop=True)
+    hashes = state["hashes"]
+    flags = state["model_splits"].get(base_version)
+    if flags is None:
+        # Base version not refreshed before: match its split files against the
+        # previous cleaned rows it was trained from
+        lookup = {}
+        if state["previous"] is not None:
+            previous = state["previous"].drop(labels=DROPPED_FEATURES, axis=1)[df.columns]
+            raw = _raw_hash_lookup(hashes, state["positions"], previous)
+            base_dir = os.path.join(PIPELINE_DIR, base_version)
+            for split, flag in (("train", False), ("test", True)):
+                X = pd.read_csv(os.path.join(base_dir, f"X_{split}.csv"))
+                y = pd.read_csv(os.path.join(base_dir, f"y_{split}.csv"))[TARGET]
+                for c in row_hashes(X.assign(**{TARGET: y})[df.columns]).tolist():
+                    if c in raw:
+                        lookup[raw[c]] = flag
+        flags = membership(hashes, lookup)
+    in_test = np.where(flags >= 0, flags == 1, assign_test(hashes))
+
+    X, y = df.drop([TARGET], axis=1), df[TARGET]
+    return X[~in_test], X[in_test], y[~in_test], y[in_test], in_test
+
+
+def refit(pipeline, X_train, y_train):
+    """Same pipeline and hyperparameters, fitted from scratch on the new data"""
+    from sklearn.base import clone
+
+    return clone(pipeline).fit(X_train, y_train)
+
+
+def warm_start(pipeline, X_train, y_train, extra_estimators=DEFAULT_EXTRA_ESTIMATORS):
+    """
+    Keep the fitted preprocessing and ensemble, and add extra trees (forests)
+    or boosting rounds (gradient boosting, XGBoost) fitted on the new data
+    """
+    from sklearn.pipeline import Pipeline
+
+    pipeline = copy.deepcopy(pipeline)
+    model = pipeline.steps[-1][1]
+    Xt = Pipeline(pipeline.steps[:-1]).transform(X_train)
+    if type(model).__name__ == "XGBRegressor":
+        booster = model.get_booster()
+        model.set_params(n_estimators=extra_estimators)
+        model.fit(Xt, y_train, xgb_model=booster)
+        model.set_params(n_estimators=model.get_booster().num_boosted_rounds())
+    elif "warm_start" in model.get_params() and "n_estimators" in model.get_params():
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + extra_estimators)
+        model.fit(Xt, y_train)
+        model.set_params(warm_start=False)
+    else:
+        raise ValueError(f"{type(model).__name__} can't be warm-started")
+    return pipeline
+
+
+def reference_r2(base, X_test, y_test):
+    """Test R² of the base pipeline on the same test rows as the candidate"""
+    from train_model import regression_metrics
+
+    return regression_metrics(y_test, base.predict(X_test))["r2"]
+
+
+def refresh(base_version=DEFAULT_VERSION, version=None, mode="refit",
+            extra_estimators=DEFAULT_EXTRA_ESTIMATORS, threshold=DEFAULT_THRESHOLD, force=False):
+    """Refresh the datasets, then the model if any record changed; returns a report"""
+    import train_model
+
+    start = time.perf_counter()
+    stats, state = refresh_datasets()
+    report = {"base_version": base_version, "data": stats,
+              "data_seconds": time.perf_counter() - start}
+    if not force and not (stats["new_or_changed"] or stats["removed"] or stats["refilled"]):
+        save_manifest(state)
+        report["action"] = "none"
+        return report
+
+    X_train, X_test, y_train, y_test, in_test = model_split(base_version, state)
+    base = load_pipeline(base_version)
+    fit_start = time.perf_counter()
+    if mode == "warm-start":
+        try:
+            candidate = warm_start(base, X_train, y_train, extra_estimators)
+        except ValueError as e:
+            print(f"* {e}, refitting instead")
+            mode, candidate = "refit", refit(base, X_train, y_train)
+    else:
+        candidate = refit(base, X_train, y_train)
+    fit_seconds = time.perf_counter() - fit_start
+
+    test = train_model.regression_metrics(y_test, candidate.predict(X_test))
+    reference = reference_r2(base, X_test, y_test)
+    version = version or train_model.next_version()
+    report.update({"version": version, "reference_test_r2": reference, "candidate_test": test,
+                   "fit_seconds": fit_seconds})
+
+    if test["r2"] < reference - threshold:
+        print(f"* Test R² {test['r2']:.3f} is more than {threshold} below {reference:.3f}: running the full search")
+        report["action"] = "full search"
+        report["training"] = train_model.train(version, data=(X_train, X_test, y_train, y_test))
+    else:
+        report["action"] = mode
+        training_report = {
+            "version": version,
+            "model": type(candidate.steps[-1][1]).__name__,
+            "refresh": mode,
+            "base_version": base_version,
+            "rows_added": stats["new_or_changed"],
+            "train": train_model.regression_metrics(y_train, candidate.predict(X_train)),
+            "test": test,
+            "total_seconds": fit_seconds,
+        }
+        train_model.save_artifact(version, candidate, X_train, X_test, y_train, y_test, training_report)
+
+    # Both versions keep this split for later refreshes
+    state["model_splits"][base_version] = state["model_splits"][version] = in_test.astype("int8")
+    save_manifest(state)
+    report["total_seconds"] = time.perf_counter() - start
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental data and model refresh")
+    parser.add_argument("--base-version", default=DEFAULT_VERSION, help="Model to refresh (default: %(default)s)")
+    parser.add_argument("--version", default=None, help="Output version (default: next free)")
+    parser.add_argument("--mode", choices=["refit", "warm-start"], default="refit",
+                        help="Refit with fixed hyperparameters, or add trees/rounds to the fitted model")
+    parser.add_argument("--extra-estimators", type=int, default=DEFAULT_EXTRA_ESTIMATORS,
+                        help="Trees or boosting rounds added in warm-start mode (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Test R² drop that triggers the full search (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="Refresh the model even if no record changed")
+    args = parser.parse_args(argv)
+
+    report = refresh(args.base_version, args.version, args.mode, args.extra_estimators,
+                     args.threshold, args.force)
+    data = report["data"]
+    print(
+        f"* {data['records']:,} records: {data['new_or_changed']} new or changed, {data['removed']} removed, "
+        f"{data['refilled']} refilled ({report['data_seconds']:.1f}s)\n"
+        f"* files written: {', '.join(data['files_written']) or 'none'}"
+    )
+    if report["action"] == "none":
+        print("✅ No record changed; model left as is")
+        return
+    test = report["training"]["test"] if report["action"] == "full search" else report["candidate_test"]
+    print(
+        f"✅ {report['action']} -> {report['version']}: test R² {test['r2']:.3f} "
+        f"(base {report['reference_test_r2']:.3f}) in {report['total_seconds']:.0f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
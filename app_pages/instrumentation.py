@@ -0,0 +1,194 @@
+"""
+Opt-in timing instrumentation for the app
+Enabled with SALEPRICE_INSTRUMENT=1. Page functions, pipeline loads, every
+fitted pipeline step (and the compiled predictor), dataset loads and chart
+rendering are timed with perf_counter and an RSS delta. The last N timings per
+stage and a fixed-bucket histogram are kept in memory, shown in a developer
+sidebar panel, and exported as JSON (download button, or appended as JSON
+lines to SALEPRICE_INSTRUMENT_LOG).
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("SALEPRICE_INSTRUMENT") == "1"
+LOG_PATH = os.environ.get("SALEPRICE_INSTRUMENT_LOG")
+LAST_N = 50
+LOG_INTERVAL_SECONDS = 10.0
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes():
+    """Current resident set size (Linux /proc; 0 elsewhere)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+class Timings:
+    """Thread-safe last-N samples and histograms per (kind, name) stage"""
+
+    def __init__(self, last_n=LAST_N) -> None:
+        self.last_n = last_n
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._last_log = 0.0
+
+    def record(self, kind, name, seconds, rss_delta=0) -> None:
+        ms = seconds * 1000
+        with self._lock:
+            stage = self._stages.get((kind, name))
+            if stage is None:
+                stage = {"samples": deque(maxlen=self.last_n), "counts": [0] * (len(BUCKETS_MS) + 1),
+                         "count": 0, "total_ms": 0.0}
+                self._stages[(kind, name)] = stage
+            stage["samples"].append((time.time(), ms, rss_delta))
+            stage["counts"][bisect.bisect_left(BUCKETS_MS, ms)] += 1
+            stage["count"] += 1
+            stage["total_ms"] += ms
+
+    def snapshot(self):
+        """One dict per stage: last-N summary plus the full histogram"""
+        with self._lock:
+            stages = [(key, list(s["samples"]), list(s["counts"]), s["count"], s["total_ms"])
+                      for key, s in self._stages.items()]
+        rows = []
+        for (kind, name), samples, counts, count, total_ms in stages:
+            ms = sorted(sample[1] for sample in samples)
+            rows.append({
+                "kind": kind,
+                "name": name,
+                "count": count,
+                "mean_ms": total_ms / count,
+                "last_ms": samples[-1][1],
+                "p50_ms": ms[(len(ms) - 1) // 2],
+                "p95_ms": ms[min(len(ms) - 1, int(0.95 * len(ms)))],
+                "last_rss_delta_kib": samples[-1][2] / 1024,
+                "histogram": {"bounds_ms": list(BUCKETS_MS), "counts": counts},
+            })
+        return sorted(rows, key=lambda row: (row["kind"], row["name"]))
+
+    def export_json(self):
+        return json.dumps({"timestamp": time.time(), "pid": os.getpid(), "stages": self.snapshot()})
+
+    def maybe_log(self, path=LOG_PATH) -> None:
+        """Append a snapshot to the JSON-lines log, at most every LOG_INTERVAL_SECONDS"""
+        now = time.monotonic()
+        if not path or now - self._last_log < LOG_INTERVAL_SECONDS:
+            return
+        self._last_log = now
+        with open(path, "a") as f:
+            f.write(self.export_json() + "\n")
+
+
+timings = Timings()
+
+
+@contextmanager
+def timed(kind, name):
+    """Time a block when instrumentation is on; a no-op otherwise"""
+    if not ENABLED:
+        yield
+        return
+    rss = rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(kind, name, time.perf_counter() - start, rss_bytes() - rss)
+
+
+def _wrap(kind, name, func):
+    def wrapper(*args, **kwargs):
+        with timed(kind, name):
+            return func(*args, **kwargs)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+# ----------------------------
+# HOOKS
+# ----------------------------
+def instrument_pipeline(pipeline, label) -> None:
+    """Time every fitted step's transform and the final predict (instance-level)"""
+    if getattr(pipeline, "_instrumented", False):
+        return
+    for step_name, step in pipeline.steps[:-1]:
+        step.transform = _wrap("pipeline step", f"{label} {step_name}", step.transform)
+    step_name, model = pipeline.steps[-1]
+    model.predict = _wrap("pipeline step", f"{label} {step_name}", model.predict)
+    pipeline._instrumented = True
+
+
+def instrument_predictor(predictor, label) -> None:
+    """Time the compiled predictor's preprocessing and tree evaluation"""
+    if getattr(predictor, "_instrumented", False):
+        return
+    predictor.transform = _wrap("compiled", f"{label} transform", predictor.transform)
+    predictor.evaluate = _wrap("compiled", f"{label} evaluate", predictor.evaluate)
+    predictor._instrumented = True
+
+
+_installed = []
+
+
+def install() -> None:
+    """Hook the registry, compiled predictors and chart calls (once per process)"""
+    if _installed or not ENABLED:
+        return
+    _installed.append(True)
+
+    import streamlit as st
+    from model_registry import registry
+    import fast_inference
+
+    def on_load(version, sha256):
+        info = registry.stats()["versions"].get(version, {})
+        timings.record("load", f"joblib.load {version}", info.get("load_seconds", 0.0))
+        instrument_pipeline(registry.get(version), version)
+
+    registry.on_reload(on_load)
+    for version in registry.stats()["versions"]:
+        instrument_pipeline(registry.get(version), version)
+
+    compile_predictor = fast_inference.get_compiled_predictor
+
+    def get_compiled_predictor(pipeline, defaults=None):
+        predictor = compile_predictor(pipeline, defaults)
+        instrument_predictor(predictor, "live")
+        return predictor
+
+    fast_inference.get_compiled_predictor = get_compiled_predictor
+
+    for chart in ("pyplot", "plotly_chart", "image"):
+        setattr(st, chart, _wrap("render", f"st.{chart}", getattr(st, chart)))
+
+
+# ----------------------------
+# PANEL
+# ----------------------------
+def draw_dev_panel() -> None:
+    """Developer sidebar panel with the latest timings"""
+    import streamlit as st
+    import pandas as pd
+
+    timings.maybe_log()
+    rows = timings.snapshot()
+    with st.sidebar.expander("⏱ Developer timings", expanded=False):
+        if not rows:
+            st.write("No timings recorded yet.")
+            return
+        table = pd.DataFrame(rows).drop(columns=["histogram"])
+        st.dataframe(table.round(2), use_container_width=True, hide_index=True)
+        st.download_button("Export timings (JSON)", timings.export_json(),
+                           file_name="timings.json", mime="application/json")
@@ -0,0 +1,119 @@
+"""
+Self-describing bundle for a trained SalePrice pipeline
+model_bundle.json sits next to best_regressor_pipeline.pkl and records the
+feature order, dtypes, category vocabularies and the training medians/modes
+used to fill features a caller leaves out. The bundle carries the sha256 of
+the pickle it describes plus a hash of its own content; a bundle that does
+not match the current pickle is rebuilt from that version's X_train.csv, so
+inference never runs with stale defaults.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from model_registry import DEFAULT_VERSION, PIPELINE_DIR, load_pipeline, registry
+from atomic_io import write_json_atomic
+
+BUNDLE_FILE = "model_bundle.json"
+
+
+def bundle_path(version=DEFAULT_VERSION):
+    return os.path.join(PIPELINE_DIR, version, BUNDLE_FILE)
+
+
+def _content_hash(payload):
+    body = {key: value for key, value in payload.items() if key != "content_sha256"}
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+
+
+def build_bundle(pipeline, X_train, pipeline_sha256):
+    """Describe the pipeline's inputs from the data it was trained on"""
+    encoder_vocabularies = {}
+    for _, step in pipeline.steps:
+        for var, mapping in getattr(step, "encoder_dict_", {}).items():
+            encoder_vocabularies[var] = list(mapping)
+
+    features = []
+    for name in pipeline.feature_names_in_:
+        column = X_train[name]
+        if pd.api.types.is_numeric_dtype(column):
+            features.append({"name": name, "dtype": "float64", "default": float(column.median())})
+        else:
+            categories = encoder_vocabularies.get(name) or sorted(column.dropna().astype(str).unique())
+            features.append({"name": name, "dtype": "category", "categories": categories,
+                             "default": str(column.mode().iloc[0])})
+
+    payload = {"pipeline_sha256": pipeline_sha256, "rows": len(X_train), "features": features}
+    payload["content_sha256"] = _content_hash(payload)
+    return payload
+
+
+def write_bundle(folder, payload):
+    path = os.path.join(folder, BUNDLE_FILE)
+    write_json_atomic(path, payload, indent=2)
+    return path
+
+
+class ModelBundle:
+
+    def __init__(self, payload) -> None:
+        self.payload = payload
+        self.pipeline_sha256 = payload["pipeline_sha256"]
+        self.feature_names = [f["name"] for f in payload["features"]]
+        self.dtypes = {f["name"]: f["dtype"] for f in payload["features"]}
+        self.vocabularies = {f["name"]: f["categories"] for f in payload["features"] if "categories" in f}
+        self.defaults = {f["name"]: f["default"] for f in payload["features"]}
+        # Typed one-row frame in pipeline order, copied (never rebuilt) per request
+        self.default_frame = pd.DataFrame({
+            name: pd.Series([self.defaults[name]], dtype="object" if dtype == "category" else dtype)
+            for name, dtype in self.dtypes.items()
+        })
+
+    def frame(self, values: dict):
+        """One-row input in pipeline order with values over the defaults"""
+        X = self.default_frame.copy()
+        for name, value in values.items():
+            if name in self.dtypes:
+                X.at[0, name] = value
+        return X
+
+    def predictor(self, pipeline):
+        """Compiled predictor for `pipeline` with this bundle's defaults"""
+        from fast_inference import get_compiled_predictor
+
+        return get_compiled_predictor(pipeline, self.defaults)
+
+
+_bundles = {}
+
+
+def load_bundle(version=DEFAULT_VERSION):
+    """Bundle for the currently loaded pipeline of a version, rebuilt if stale"""
+    sha256 = registry.fingerprint(version)
+    cached = _bundles.get(version)
+    if cached is not None and cached.pipeline_sha256 == sha256:
+        return cached
+
+    payload = None
+    path = bundle_path(version)
+    if os.path.isfile(path):
+        with open(path) as f:
+            payload = json.load(f)
+        if payload.get("pipeline_sha256") != sha256 or payload.get("content_sha256") != _content_hash(payload):
+            payload = None
+    if payload is None:
+        X_train = pd.read_csv(os.path.join(PIPELINE_DIR, version, "X_train.csv"))
+        payload = build_bundle(load_pipeline(version), X_train, sha256)
+        write_bundle(os.path.join(PIPELINE_DIR, version), payload)
+
+    bundle = ModelBundle(payload)
+    _bundles[version] = bundle
+    return bundle
+
+
+def get_bundle_predictor(version=DEFAULT_VERSION):
+    """Compiled predictor whose default row comes from the version's bundle"""
+    return load_bundle(version).predictor(load_pipeline(version))
@@ -0,0 +1,263 @@
+"""
+Evaluation stage for a trained SalePrice pipeline
+Predicts over the cleaned dataset once per model version and persists the
+metrics, per-row predictions, residual histogram and rendered figures. Held-out
+metrics on the version's X_test.csv/y_test.csv come with bootstrap confidence
+intervals (one resampling-index matrix, no Python loop over replicates), and
+k-fold cross-validated metrics on X_train.csv. The artifact is keyed by a
+fingerprint of the model file, the dataset and the split files, and is rebuilt
+automatically when any of them changes.
+
+Usage (from the repository root):
+    python app_pages/model_evaluation.py --version v1
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, builds are only serialized within this process
+    fcntl = None
+
+import numpy as np
+
+from model_registry import DEFAULT_VERSION, PIPELINE_DIR, file_fingerprint, load_pipeline, registry
+from dataset_store import csv_path, load_dataset
+from prediction_intervals import CONFIDENCE
+from instrumentation import timed
+from atomic_io import atomic_path, write_json_atomic
+
+EVALUATION_DATASET = "cleaned/house_prices_cleaned"
+TARGET = "SalePrice"
+RESIDUAL_BINS = 40
+SPLIT_FILES = ("X_train.csv", "y_train.csv", "X_test.csv", "y_test.csv")
+BOOTSTRAP_REPLICATES = 2000
+CV_FOLDS = 5
+# Resampled values held at once while bootstrapping (bounds memory for big test sets)
+BOOTSTRAP_BLOCK_ELEMENTS = 4_000_000
+# Bumped when the artifact gains fields, so older artifacts are rebuilt
+EVALUATION_FORMAT = 2
+
+
+def evaluation_dir(version=DEFAULT_VERSION):
+    return os.path.join(PIPELINE_DIR, version, "evaluation")
+
+
+def evaluation_fingerprint(version=DEFAULT_VERSION, dataset=EVALUATION_DATASET):
+    """Hash of the model artifact, the evaluation dataset and the version's split"""
+    digest = hashlib.sha256(f"format {EVALUATION_FORMAT}".encode())
+    digest.update(file_fingerprint(registry.artifact_path(version)).encode())
+    digest.update(file_fingerprint(csv_path(dataset)).encode())
+    for name in SPLIT_FILES:
+        path = os.path.join(PIPELINE_DIR, version, name)
+        if os.path.isfile(path):
+            digest.update(file_fingerprint(path).encode())
+    return digest.hexdigest()
+
+
+# ----------------------------
+# HELD-OUT METRICS
+# ----------------------------
+def bootstrap_metrics(y, y_pred, replicates=BOOTSTRAP_REPLICATES, confidence=CONFIDENCE, seed=0):
+    """
+    Point estimate and percentile interval of R², RMSE and MAE. Replicates
+    are rows of (block, n) resampling-index matrices, drawn block by block so
+    at most BOOTSTRAP_BLOCK_ELEMENTS indices exist at once, and the metrics of
+    a block come from a few array reductions
+    """
+    y = np.asarray(y, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    n = len(y)
+    rng = np.random.default_rng(seed)
+
+    r2, rmse, mae = [], [], []
+    block = max(1, BOOTSTRAP_BLOCK_ELEMENTS // n)
+    for start in range(0, replicates, block):
+        idx = rng.integers(0, n, size=(min(block, replicates - start), n))
+        y_b = y[idx]
+        errors = y_b - y_pred[idx]
+        sse = np.einsum("ij,ij->i", errors, errors)
+        centered = y_b - y_b.mean(axis=1, keepdims=True)
+        r2.append(1 - sse / np.einsum("ij,ij->i", centered, centered))
+        rmse.append(np.sqrt(sse / n))
+        mae.append(np.abs(errors).mean(axis=1))
+
+    errors = y - y_pred
+    point = {
+        "r2": 1 - float(errors @ errors) / float(((y - y.mean()) ** 2).sum()),
+        "rmse": float(np.sqrt(errors @ errors / n)),
+        "mae": float(np.abs(errors).mean()),
+    }
+    tail = (1 - confidence) / 2 * 100
+    metrics = {}
+    for name, samples in (("r2", r2), ("rmse", rmse), ("mae", mae)):
+        low, high = np.percentile(np.concatenate(samples), [tail, 100 - tail])
+        metrics[name] = {"value": point[name], "low": float(low), "high": float(high)}
+    return {"rows": n, "replicates": replicates, "confidence": confidence, "metrics": metrics}
+
+
+def cross_validated_metrics(pipeline, X, y, folds=CV_FOLDS, seed=0):
+    """Mean and spread of R², RMSE and MAE over k folds, refitting the pipeline's hyperparameters"""
+    from sklearn.base import clone
+    from sklearn.model_selection import KFold, cross_validate
+
+    scores = cross_validate(clone(pipeline), X, y, cv=KFold(folds, shuffle=True, random_state=seed),
+                            scoring={"r2": "r2", "rmse": "neg_root_mean_squared_error",
+                                     "mae": "neg_mean_absolute_error"})
+    metrics = {}
+    for name in ("r2", "rmse", "mae"):
+        values = np.abs(scores[f"test_{name}"]) if name != "r2" else scores[f"test_{name}"]
+        metrics[name] = {"mean": float(values.mean()), "std": float(values.std()),
+                         "folds": values.tolist()}
+    return {"folds": folds, "rows": int(len(y)), "metrics": metrics}
+
+
+def held_out_evaluation(model, version=DEFAULT_VERSION):
+    """Bootstrap test metrics and CV metrics from the version's split; None without one"""
+    import pandas as pd
+
+    base = os.path.join(PIPELINE_DIR, version)
+    if not all(os.path.isfile(os.path.join(base, name)) for name in SPLIT_FILES):
+        return None
+    X_train = pd.read_csv(os.path.join(base, "X_train.csv"))[model.feature_names_in_]
+    y_train = pd.read_csv(os.path.join(base, "y_train.csv"))[TARGET]
+    X_test = pd.read_csv(os.path.join(base, "X_test.csv"))[model.feature_names_in_]
+    y_test = pd.read_csv(os.path.join(base, "y_test.csv"))[TARGET]
+    return {
+        "test": bootstrap_metrics(y_test.to_numpy(), model.predict(X_test)),
+        "cv": cross_validated_metrics(model, X_train, y_train),
+    }
+
+
+# ----------------------------
+# ARTIFACT
+# ----------------------------
+def build_evaluation(version=DEFAULT_VERSION, dataset=EVALUATION_DATASET):
+    """Predict over the dataset and write the evaluation artifact"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
+
+    fingerprint = evaluation_fingerprint(version, dataset)
+    out_dir = evaluation_dir(version)
+    os.makedirs(out_dir, exist_ok=True)
+
+    model = load_pipeline(version)
+    data = load_dataset(dataset)
+    X = data[model.feature_names_in_]
+    y = data[TARGET].to_numpy(dtype=np.float64)
+    y_pred = model.predict(X)
+    residuals = y - y_pred
+
+    metrics = {
+        "r2": float(r2_score(y, y_pred)),
+        "rmse": float(np.sqrt(mean_squared_error(y, y_pred))),
+        "mae": float(mean_absolute_error(y, y_pred)),
+        "rows": int(len(y)),
+    }
+    counts, edges = np.histogram(residuals, bins=RESIDUAL_BINS)
+
+    with atomic_path(os.path.join(out_dir, "predictions.npz")) as tmp_path:
+        np.savez_compressed(tmp_path, y=y.astype(np.float32), y_pred=y_pred.astype(np.float32))
+
+    # --- Predicted vs Actual Scatterplot ---
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.scatterplot(x=y, y=y_pred, alpha=0.6, ax=ax)
+    ax.plot([y.min(), y.max()], [y.min(), y.max()], 'r--')
+    ax.set_xlabel("Actual Sale Price")
+    ax.set_ylabel("Predicted Sale Price")
+    ax.set_title("Predicted vs Actual Prices")
+    with atomic_path(os.path.join(out_dir, "predicted_vs_actual.png")) as tmp_path:
+        fig.savefig(tmp_path, bbox_inches="tight")
+    plt.close(fig)
+
+    # --- Residuals ---
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.histplot(residuals, bins=RESIDUAL_BINS, kde=True, color="blue", ax=ax)
+    ax.set_xlabel("Residual (Actual - Predicted)")
+    ax.set_title("Residuals Distribution")
+    with atomic_path(os.path.join(out_dir, "residuals.png")) as tmp_path:
+        fig.savefig(tmp_path, bbox_inches="tight")
+    plt.close(fig)
+
+    evaluation = {
+        "fingerprint": fingerprint,
+        "version": version,
+        "dataset": dataset,
+        "metrics": metrics,
+        "held_out": held_out_evaluation(model, version),
+        "residual_histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+        "figures": {
+            "predicted_vs_actual": os.path.join(out_dir, "predicted_vs_actual.png"),
+            "residuals": os.path.join(out_dir, "residuals.png"),
+        },
+        "predictions": os.path.join(out_dir, "predictions.npz"),
+    }
+    # Written last, so a half-built stage is never picked up as current
+    write_json_atomic(os.path.join(out_dir, "evaluation.json"), evaluation, indent=2)
+    return evaluation
+
+
+def read_evaluation(version=DEFAULT_VERSION, dataset=EVALUATION_DATASET):
+    """The stored evaluation artifact if it is current, else None"""
+    path = os.path.join(evaluation_dir(version), "evaluation.json")
+    if os.path.isfile(path):
+        with open(path) as f:
+            evaluation = json.load(f)
+        if evaluation.get("fingerprint") == evaluation_fingerprint(version, dataset):
+            return evaluation
+    return None
+
+
+# Serializes rebuilds between sessions of this process (the only guard without fcntl)
+_build_lock = threading.Lock()
+
+
+def load_evaluation(version=DEFAULT_VERSION, dataset=EVALUATION_DATASET, force=False):
+    """
+    Read the evaluation artifact, rebuilding it if the model or data changed
+    (or when forced). A rebuild, including the k-fold refit, holds a thread
+    lock and a file lock on the evaluation directory; sessions and workers
+    that waited on it read the artifact it produced instead of building again.
+    """
+    evaluation = None if force else read_evaluation(version, dataset)
+    if evaluation is not None:
+        return evaluation
+    os.makedirs(evaluation_dir(version), exist_ok=True)
+    with _build_lock, open(os.path.join(evaluation_dir(version), ".lock"), "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        evaluation = None if force else read_evaluation(version, dataset)
+        if evaluation is not None:
+            return evaluation
+        with timed("load", f"build evaluation {version}"):
+            return build_evaluation(version, dataset)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the model evaluation artifact")
+    parser.add_argument("--version", default=DEFAULT_VERSION, help="Pipeline version (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the artifact is current")
+    args = parser.parse_args(argv)
+
+    evaluation = load_evaluation(args.version, force=args.force)
+    metrics = evaluation["metrics"]
+    print(f"✅ {args.version}: R² {metrics['r2']:.3f}, RMSE {metrics['rmse']:,.0f}, MAE {metrics['mae']:,.0f} "
+          f"(all rows)")
+    held_out = evaluation["held_out"]
+    if held_out:
+        test, cv = held_out["test"]["metrics"], held_out["cv"]["metrics"]
+        print("* test set: " + ", ".join(f"{name} {m['value']:,.3f} [{m['low']:,.3f}, {m['high']:,.3f}]"
+                                          for name, m in test.items()))
+        print(f"* {held_out['cv']['folds']}-fold CV: " + ", ".join(f"{name} {m['mean']:,.3f} ± {m['std']:,.3f}"
+                                                              for name, m in cv.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Export stage for a trained SalePrice pipeline
+Compiles best_regressor_pipeline.pkl into compiled_predictor.npz next to it:
+ordinal lookup tables, column selections, scaler arrays, the bundle's default
+row and the tree ensemble flattened into contiguous node arrays. The export
+loads with NumPy alone and scores whole batches in one vectorized pass.
+
+Usage (from the repository root):
+    python app_pages/model_export.py --version v1
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from model_registry import DEFAULT_VERSION, PIPELINE_DIR, file_fingerprint, load_pipeline, registry
+from fast_inference import CompiledPredictor
+from model_bundle import load_bundle
+
+COMPILED_FILE = "compiled_predictor.npz"
+PARITY_DATA = "outputs/datasets/cleaned/house_prices_cleaned.csv"
+
+
+def compiled_path(version=DEFAULT_VERSION):
+    return os.path.join(PIPELINE_DIR, version, COMPILED_FILE)
+
+
+def export_compiled(version=DEFAULT_VERSION):
+    """Compile the versioned pipeline and write its .npz export"""
+    pipeline = load_pipeline(version)
+    path = compiled_path(version)
+    defaults = load_bundle(version).defaults
+    CompiledPredictor(pipeline, defaults).save(path, source=registry.fingerprint(version))
+    return path
+
+
+_loaded = {}
+
+
+def load_compiled(version=DEFAULT_VERSION):
+    """
+    Exported predictor for a version, re-exported when the pickle changed.
+    Held per process like the pipelines in the registry.
+    """
+    path = compiled_path(version)
+    source = file_fingerprint(registry.artifact_path(version))
+    cached = _loaded.get(version)
+    if cached is not None and cached.source == source:
+        return cached
+
+    predictor = CompiledPredictor.load(path) if os.path.isfile(path) else None
+    if predictor is None or predictor.source != source:
+        predictor = CompiledPredictor.load(export_compiled(version))
+    _loaded[version] = predictor
+    return predictor
+
+
+def parity_report(version=DEFAULT_VERSION, data_path=PARITY_DATA, repeats=5):
+    """Compare the export with the pickled pipeline: predictions, load time, size"""
+    import joblib
+    import pandas as pd
+
+    path = export_compiled(version)
+    pipeline_path = registry.artifact_path(version)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        pipeline = joblib.load(pipeline_path)
+    pickle_seconds = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predictor = CompiledPredictor.load(path)
+    compiled_seconds = (time.perf_counter() - start) / repeats
+
+    X = pd.read_csv(data_path)[list(pipeline.feature_names_in_)]
+    start = time.perf_counter()
+    expected = pipeline.predict(X)
+    pipeline_predict_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = predictor.predict_frame(X)
+    compiled_predict_seconds = time.perf_counter() - start
+
+    return {
+        "version": version,
+        "model": type(pipeline.steps[-1][1]).__name__,
+        "rows": len(X),
+        "max_abs_diff": float(np.max(np.abs(actual - expected))),
+        "max_rel_diff": float(np.max(np.abs(actual - expected) / np.maximum(np.abs(expected), 1.0))),
+        "pickle_bytes": os.path.getsize(pipeline_path),
+        "compiled_bytes": os.path.getsize(path),
+        "pickle_load_ms": pickle_seconds * 1000,
+        "compiled_load_ms": compiled_seconds * 1000,
+        "pipeline_predict_ms": pipeline_predict_seconds * 1000,
+        "compiled_predict_ms": compiled_predict_seconds * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the pipeline as flat NumPy arrays")
+    parser.add_argument("--version", default=DEFAULT_VERSION, help="Pipeline version (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    r = parity_report(args.version)
+    print(
+        f"✅ {r['version']} ({r['model']}) exported to {compiled_path(args.version)}\n"
+        f"* parity over {r['rows']} rows: max abs diff {r['max_abs_diff']:.3g}, "
+        f"max rel diff {r['max_rel_diff']:.3g}\n"
+        f"* size {r['pickle_bytes'] / 1024:,.0f} KiB -> {r['compiled_bytes'] / 1024:,.0f} KiB\n"
+        f"* load {r['pickle_load_ms']:.1f} ms -> {r['compiled_load_ms']:.1f} ms\n"
+        f"* batch predict {r['pipeline_predict_ms']:.1f} ms -> {r['compiled_predict_ms']:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
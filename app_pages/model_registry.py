@@ -0,0 +1,162 @@
+"""
+Process-wide registry for the trained SalePrice pipelines
+Each versioned pipeline is deserialized once per process and the same object
+is handed to every Streamlit session. An artifact is reloaded only when its
+file changes on disk (mtime first, then content hash).
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+import joblib
+
+PIPELINE_DIR = "outputs/ml_pipeline/predict_SalePrice"
+PIPELINE_FILE = "best_regressor_pipeline.pkl"
+DEFAULT_VERSION = "v1"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Return the hex sha256 digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_file_hashes = {}
+
+
+def file_fingerprint(path):
+    """sha256 of a file, recomputed only when its mtime or size changes"""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_hashes.get(path)
+    if cached is None or cached[0] != key:
+        cached = (key, file_sha256(path))
+        _file_hashes[path] = cached
+    return cached[1]
+
+
+class ModelRegistry:
+
+    def __init__(self, base_dir: str = PIPELINE_DIR, file_name: str = PIPELINE_FILE) -> None:
+        self.base_dir = base_dir
+        self.file_name = file_name
+        self._entries = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "reloads": 0,
+            "loads": 0,
+            "load_seconds_total": 0.0,
+            "last_load_seconds": 0.0,
+        }
+
+    def artifact_path(self, version: str = DEFAULT_VERSION) -> str:
+        """Path of the pickled pipeline for a given version"""
+        return os.path.join(self.base_dir, version, self.file_name)
+
+    def available_versions(self) -> list:
+        """Versions (v1, v2, ...) that have a pipeline artifact on disk"""
+        if not os.path.isdir(self.base_dir):
+            return []
+        versions = [
+            name for name in os.listdir(self.base_dir)
+            if os.path.isfile(self.artifact_path(name))
+        ]
+        return sorted(versions, key=lambda v: (len(v), v))
+
+    def get(self, version: str = DEFAULT_VERSION):
+        """Return the loaded pipeline, reloading only if the artifact changed"""
+        path = self.artifact_path(version)
+        stat = os.stat(path)
+
+        entry = self._entries.get(version)
+        if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns \
+                and entry["size"] == stat.st_size:
+            self._counters["hits"] += 1
+            return entry["pipeline"]
+
+        with self._lock:
+            # Another session may have reloaded while we waited for the lock
+            entry = self._entries.get(version)
+            if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns \
+                    and entry["size"] == stat.st_size:
+                self._counters["hits"] += 1
+                return entry["pipeline"]
+
+            sha256 = file_sha256(path)
+            if entry is not None and entry["sha256"] == sha256:
+                # File was touched but content is identical: keep the object
+                entry = dict(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                self._entries[version] = entry
+                self._counters["hits"] += 1
+                return entry["pipeline"]
+
+            self._counters["misses"] += 1
+            start = time.perf_counter()
+            pipeline = joblib.load(path)
+            elapsed = time.perf_counter() - start
+
+            # Swap in the fully loaded pipeline in one assignment
+            self._entries[version] = {
+                "pipeline": pipeline,
+                "path": path,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": sha256,
+                "loaded_at": time.time(),
+                "load_seconds": elapsed,
+            }
+            self._counters["loads"] += 1
+            self._counters["load_seconds_total"] += elapsed
+            self._counters["last_load_seconds"] = elapsed
+            if entry is not None:
+                self._counters["reloads"] += 1
+
+            listeners = list(self._listeners)
+
+        for callback in listeners:
+            callback(version, sha256)
+
+        return pipeline
+
+    def fingerprint(self, version: str = DEFAULT_VERSION) -> str:
+        """Content hash of the currently loaded artifact for a version"""
+        self.get(version)
+        return self._entries[version]["sha256"]
+
+    def on_reload(self, callback) -> None:
+        """Register callback(version, sha256) fired whenever a pipeline is (re)loaded"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def stats(self) -> dict:
+        """Hit/miss counters, load times and the currently loaded versions"""
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            **self._counters,
+            "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+            "versions": {
+                version: {
+                    "sha256": entry["sha256"],
+                    "loaded_at": entry["loaded_at"],
+                    "load_seconds": entry["load_seconds"],
+                }
+                for version, entry in self._entries.items()
+            },
+        }
+
+
+# Shared by every page and session in this process
+registry = ModelRegistry()
+
+
+def load_pipeline(version: str = DEFAULT_VERSION):
+    """Get the SalePrice pipeline for a version from the process-wide registry"""
+    return registry.get(version)
@@ -1,5 +1,10 @@
+import importlib
+import time
+
 import streamlit as st
 
+import instrumentation
+
 # Configure the main app settings (only once, at the start)
 st.set_page_config(
     page_title="Ames Housing Price Prediction",
@@ -15,9 +20,24 @@ class MultiPage:
         self.app_name = app_name
 
     def add_page(self, title: str, func) -> None:
-        """Add a new page to the app"""
+        """
+        Add a new page to the app. func is either the page function or a
+        "module:function" string that is imported on first navigation
+        """
         self.pages.append({"title": title, "function": func})
 
+    def resolve(self, page):
+        """Return the page function, importing lazily registered pages"""
+        func = page["function"]
+        if isinstance(func, str):
+            module_name, func_name = func.split(":")
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            page_import_times.setdefault(page["title"], time.perf_counter() - start)
+            func = getattr(module, func_name)
+            page["function"] = func
+        return func
+
     def run(self):
         """Run the selected page"""
         st.title(self.app_name)
@@ -26,4 +46,13 @@ class MultiPage:
             self.pages,
             format_func=lambda page: page['title']
         )
-        page['function']()
\ No newline at end of file
+        if instrumentation.ENABLED:
+            instrumentation.install()
+        with instrumentation.timed("page", page["title"]):
+            self.resolve(page)()
+        if instrumentation.ENABLED:
+            instrumentation.draw_dev_panel()
+
+
+# Seconds spent importing each lazily loaded page (first navigation only)
+page_import_times = {}
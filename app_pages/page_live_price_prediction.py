@@ -1,6 +1,18 @@
+import time
+
 import streamlit as st
 import pandas as pd
-import joblib
+from model_registry import DEFAULT_VERSION, load_pipeline
+from model_bundle import load_bundle
+from fast_inference import UncompilableStep
+from prediction_cache import prediction_cache
+from comparable_sales import get_comps_index
+from what_if import WHAT_IF_RANGES, grid_values, price_surface, price_surface_full
+from drift_monitor import get_monitor
+from audit_log import audit_log
+
+# Model version the page loads, predicts with, caches, audits and monitors under
+MODEL_VERSION = DEFAULT_VERSION
 
 # ----------------------------
 # PAGE FUNCTION
@@ -14,11 +26,10 @@ def page_live_price_prediction_body():
         f"* The prediction is based on the trained ML model using historical sales data."
     )
 
-    # Load trained pipeline
+    # Load trained pipeline and its bundle (feature schema + defaults)
     try:
-        price_prediction_pipeline = joblib.load(
-            "outputs/ml_pipeline/predict_SalePrice/v1/best_regressor_pipeline.pkl"
-        )
+        price_prediction_pipeline = load_pipeline(MODEL_VERSION)
+        bundle = load_bundle(MODEL_VERSION)
     except Exception as e:
         st.error(f"Could not load prediction pipeline: {e}")
         return
@@ -32,11 +43,26 @@ def page_live_price_prediction_body():
     if st.button("🏠 Predict House Price", type="primary"):
         st.write("### Prediction Results")
 
+        values = {col: X_live[col].values[0] for col in X_live.columns}
         try:
-            prediction = make_live_prediction(X_live, price_prediction_pipeline)
+            start = time.perf_counter()
+            prediction = prediction_cache.get_or_compute(
+                MODEL_VERSION,
+                values,
+                lambda: make_live_prediction(X_live, price_prediction_pipeline, bundle),
+            )
+            latency_ms = (time.perf_counter() - start) * 1000
             display_prediction_results(X_live, prediction)
         except Exception as e:
             st.error(f"Error making prediction: {e}")
+        else:
+            audit_prediction(values, prediction, latency_ms)
+            display_comparable_sales(X_live)
+            record_live_inputs(values)
+
+    st.write("---")
+    if st.checkbox("🔍 What-if Explorer"):
+        draw_what_if_explorer(X_live, price_prediction_pipeline, bundle)
 
 
 # ----------------------------
@@ -103,57 +129,114 @@ def draw_input_widgets():
     return X_live
 
 
+def audit_prediction(values, prediction, latency_ms):
+    """Queue the prediction in the audit log (a failure is reported, not raised)"""
+    try:
+        audit_log.log("live", MODEL_VERSION, values, prediction, latency_ms)
+    except (RuntimeError, TypeError, ValueError) as e:
+        # The writer thread could not start, or a value is not a number
+        st.warning(f"Audit log could not record this prediction: {e}")
+
+
+def record_live_inputs(values):
+    """Count the entered values in the drift monitor (never blocks a prediction)"""
+    try:
+        get_monitor(MODEL_VERSION, "live").update(values)
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        # Unreadable reference/state files, a reference that no longer matches the
+        # pipeline's features, or a value that can't be binned
+        st.warning(f"Drift monitor could not record these inputs: {e}")
+
+
 # ----------------------------
 # DEFAULTS + PREDICTION
 # ----------------------------
-def make_live_prediction(X_live, pipeline):
+def make_live_prediction(X_live, pipeline, bundle):
     """
     Make prediction using trained pipeline,
-    filling in missing features with defaults
+    filling in missing features with the bundle's training defaults
     """
+    values = {col: X_live[col].values[0] for col in X_live.columns}
 
-    # Define defaults here (median/mode from training dataset)
-    feature_defaults = {
-        "1stFlrSF": 1162.63,
-        "2ndFlrSF": 327.99,
-        "BedroomAbvGr": 2.88,
-        "BsmtExposure": "No",   # categorical - most common
-        "BsmtFinSF1": 443.64,
-        "BsmtFinType1": "Unf",  # categorical
-        "BsmtUnfSF": 567.24,
-        "EnclosedPorch": 46.66,
-        "GarageArea": 472.98,
-        "GarageFinish": "Unf",  # categorical
-        "GarageYrBlt": 1978.59,
-        "GrLivArea": 1515.46,
-        "KitchenQual": "TA",    # categorical
-        "LotArea": 10516.83,
-        "LotFrontage": 69.86,
-        "MasVnrArea": 103.12,
-        "OpenPorchSF": 46.66,
-        "OverallCond": 5.58,
-        "OverallQual": 6.10,
-        "TotalBsmtSF": 1057.43,
-        "WoodDeckSF": 11.01,
-        "YearBuilt": 1971.27,
-        "YearRemodAdd": 1984.87,
-        "SalePrice": 180921.20  # target, not actually used as input
-}
-
-    # Start with defaults
-    X_full = pd.DataFrame([feature_defaults])
-
-    # Overwrite with user inputs
-    for col in X_live.columns:
-        X_full[col] = X_live[col].values[0]
-
-    # Reorder to pipeline expectation
-    X_full = X_full[pipeline.feature_names_in_]
-
-    prediction = pipeline.predict(X_full)
+    # Precompiled array path; falls back to the full pipeline for
+    # step types it does not know how to compile
+    try:
+        predictor = bundle.predictor(pipeline)
+    except UncompilableStep:
+        return make_live_prediction_full(values, pipeline, bundle)
+
+    return predictor.predict_one(values)
+
+
+def make_live_prediction_full(values, pipeline, bundle):
+    """
+    Reference path: run the full pandas pipeline on the bundle's
+    default row (already in pipeline order) with the user inputs on top
+    """
+    prediction = pipeline.predict(bundle.frame(values))
     return prediction[0]
 
 
+# ----------------------------
+# WHAT-IF EXPLORER
+# ----------------------------
+def draw_what_if_explorer(X_live, pipeline, bundle):
+    """
+    Vary one or two features of the entered house over a grid and plot
+    the predicted prices, scored in a single batch
+    """
+    import plotly.express as px
+
+    st.write("#### What-if Price Explorer")
+    st.info(
+        f"* Choose one or two features to vary; all other inputs stay as entered above.\n"
+        f"* Every point of the grid is priced in one batch, so large grids stay interactive."
+    )
+
+    features = list(WHAT_IF_RANGES)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        x_feature = st.selectbox("Vary (x-axis)", features, index=0)
+    with col2:
+        y_options = ["None"] + [f for f in features if f != x_feature]
+        y_default = y_options.index("OverallQual") if "OverallQual" in y_options else 0
+        y_feature = st.selectbox("and (y-axis)", y_options, index=y_default)
+    with col3:
+        points = st.slider("Grid points per axis", min_value=10, max_value=300, value=100, step=10)
+
+    y_feature = None if y_feature == "None" else y_feature
+    values = {col: X_live[col].values[0] for col in X_live.columns}
+    x_values = grid_values(x_feature, points)
+    y_values = grid_values(y_feature, points) if y_feature else None
+
+    start = time.perf_counter()
+    try:
+        try:
+            predictor = bundle.predictor(pipeline)
+            prices = price_surface(predictor, values, x_feature, x_values, y_feature, y_values)
+        except UncompilableStep:
+            prices = price_surface_full(pipeline, bundle.defaults, values,
+                                        x_feature, x_values, y_feature, y_values)
+    except Exception as e:
+        st.error(f"Error computing what-if prices: {e}")
+        return
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if y_feature is None:
+        fig = px.line(x=x_values, y=prices, labels={"x": x_feature, "y": "Predicted Sale Price"},
+                      title=f"Predicted Price vs {x_feature}")
+        fig.add_vline(x=values[x_feature], line_dash="dash", line_color="red")
+    else:
+        fig = px.imshow(prices, x=x_values, y=y_values, origin="lower", aspect="auto",
+                        color_continuous_scale="Viridis",
+                        labels={"x": x_feature, "y": y_feature, "color": "Predicted Price"},
+                        title=f"Predicted Price by {x_feature} and {y_feature}")
+        fig.add_scatter(x=[values[x_feature]], y=[values[y_feature]], mode="markers",
+                        marker={"color": "red", "size": 10}, name="Your house")
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{prices.size:,} grid points priced in {elapsed_ms:,.0f} ms")
+
+
 def display_prediction_results(X_live, prediction):
     """
     Display detailed prediction results
@@ -165,4 +248,21 @@ def display_prediction_results(X_live, prediction):
         st.dataframe(X_live.T, use_container_width=True)
         st.write("---")
         st.write("**Note:** Other features were filled with typical values "
-                 "from the training dataset to make the prediction.")
\ No newline at end of file
+                 "from the training dataset to make the prediction.")
+
+
+def display_comparable_sales(X_live, k=5):
+    """
+    Show the most similar historical sales to the entered house
+    """
+    try:
+        comps = get_comps_index(MODEL_VERSION).query_values(
+            {col: X_live[col].values[0] for col in X_live.columns}, k=k)
+    except Exception as e:
+        st.error(f"Could not look up comparable sales: {e}")
+        return
+
+    st.write("#### Comparable Historical Sales")
+    key_cols = ["SalePrice", "GrLivArea", "OverallQual", "TotalBsmtSF", "GarageArea", "YearBuilt"]
+    st.dataframe(pd.DataFrame({col: comps[col] for col in key_cols}), use_container_width=True)
+    st.caption(f"The {k} sales closest to this house in the features the model uses.")
@@ -1,10 +1,10 @@
 import streamlit as st
-import pandas as pd
-import joblib
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
-import numpy as np
+from model_registry import DEFAULT_VERSION
+from model_evaluation import load_evaluation
+from drift_monitor import MIN_OBSERVATIONS, drift_report
+
+# Model version whose evaluation and input drift the page reports
+MODEL_VERSION = DEFAULT_VERSION
 
 def page_model_performance_body():
 
@@ -14,64 +14,105 @@ def page_model_performance_body():
         f"Lydia can use this information to trust the predictions on her inherited houses."
     )
 
-    # Load model and test data
+    # Load precomputed evaluation (rebuilt only when the model or data changes)
     try:
-        model = joblib.load("outputs/ml_pipeline/predict_SalePrice/v1/best_regressor_pipeline.pkl")
-        test_data = pd.read_csv("outputs/datasets/cleaned/house_prices_cleaned.csv")
-    except Exception as e:
-        st.error(f"Error loading model or data: {e}")
+        evaluation = load_evaluation(MODEL_VERSION)
+    except KeyError as e:
+        st.error(f"Column alignment issue: {e}")
         return
-
-    # Separate features and target (align columns to training features)
-    target = "SalePrice"
-    try:
-        X = test_data[model.feature_names_in_]  # enforce same feature set as training
     except Exception as e:
-        st.error(f"Column alignment issue: {e}")
+        st.error(f"Error loading model or data: {e}")
         return
-    y = test_data[target]
-
-    # Predict
-    y_pred = model.predict(X)
 
     # --- Metrics ---
-    r2 = r2_score(y, y_pred)
-    rmse = np.sqrt(mean_squared_error(y, y_pred))
-    mae = mean_absolute_error(y, y_pred)
+    metrics = evaluation["metrics"]
+    held_out = evaluation.get("held_out")
 
     st.write("### Performance Metrics")
+    if held_out:
+        display_held_out_metrics(held_out)
+        st.write(f"**All {metrics['rows']:,} houses** (includes the rows the model was trained on, "
+                 f"so these overstate accuracy)")
     st.success(
-        f"**R² Score:** {r2:.3f}\n\n"
-        f"**RMSE:** ${rmse:,.0f}\n\n"
-        f"**MAE:** ${mae:,.0f}"
+        f"**R² Score:** {metrics['r2']:.3f}\n\n"
+        f"**RMSE:** ${metrics['rmse']:,.0f}\n\n"
+        f"**MAE:** ${metrics['mae']:,.0f}"
     )
 
     st.write("---")
 
     # --- Predicted vs Actual Scatterplot ---
     st.write("#### Predicted vs Actual Sale Prices")
-    fig, ax = plt.subplots(figsize=(8,6))
-    sns.scatterplot(x=y, y=y_pred, alpha=0.6)
-    plt.plot([y.min(), y.max()], [y.min(), y.max()], 'r--')
-    plt.xlabel("Actual Sale Price")
-    plt.ylabel("Predicted Sale Price")
-    plt.title("Predicted vs Actual Prices")
-    st.pyplot(fig)
+    st.image(evaluation["figures"]["predicted_vs_actual"])
 
     # --- Residuals ---
     st.write("#### Residuals Distribution")
-    residuals = y - y_pred
-    fig, ax = plt.subplots(figsize=(8,6))
-    sns.histplot(residuals, bins=40, kde=True, color="blue")
-    plt.xlabel("Residual (Actual - Predicted)")
-    plt.title("Residuals Distribution")
-    st.pyplot(fig)
+    st.image(evaluation["figures"]["residuals"])
 
     # Notes
     st.info(
         "**Interpretation:**\n"
         "* An R² close to 1 means the model explains most of the price variation.\n"
+        "* The held-out test metrics are the honest estimate; the ranges show how much they could vary.\n"
         "* Low RMSE and MAE mean predictions are usually close to actual prices.\n"
         "* The scatterplot should align along the red diagonal line.\n"
         "* Residuals should be centered around zero without big skew."
-    )
\ No newline at end of file
+    )
+
+    st.write("---")
+    display_input_drift()
+
+
+def display_held_out_metrics(held_out):
+    """Test-set metrics with bootstrap intervals, and k-fold CV metrics"""
+    test, cv = held_out["test"], held_out["cv"]
+    r2, rmse, mae = (test["metrics"][name] for name in ("r2", "rmse", "mae"))
+    st.write(f"**Held-out test set** ({test['rows']:,} houses the model never saw, "
+             f"{test['confidence']:.0%} bootstrap intervals over {test['replicates']:,} resamples)")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("R² Score", f"{r2['value']:.3f}")
+    col1.caption(f"{r2['low']:.3f} – {r2['high']:.3f}")
+    col2.metric("RMSE", f"${rmse['value']:,.0f}")
+    col2.caption(f"${rmse['low']:,.0f} – ${rmse['high']:,.0f}")
+    col3.metric("MAE", f"${mae['value']:,.0f}")
+    col3.caption(f"${mae['low']:,.0f} – ${mae['high']:,.0f}")
+
+    cv_metrics = cv["metrics"]
+    st.write(
+        f"**{cv['folds']}-fold cross-validation** on the {cv['rows']:,} training houses: "
+        f"R² {cv_metrics['r2']['mean']:.3f} ± {cv_metrics['r2']['std']:.3f}, "
+        f"RMSE ${cv_metrics['rmse']['mean']:,.0f} ± ${cv_metrics['rmse']['std']:,.0f}, "
+        f"MAE ${cv_metrics['mae']['mean']:,.0f} ± ${cv_metrics['mae']['std']:,.0f}"
+    )
+
+
+def display_input_drift():
+    """Drift alerts: live and batch inputs against the training distribution"""
+    st.write("#### Input Drift")
+    try:
+        report = drift_report(MODEL_VERSION)
+    except Exception as e:
+        st.error(f"Could not compute input drift: {e}")
+        return
+
+    if report.empty:
+        st.write(f"Not enough traffic yet (each feature needs {MIN_OBSERVATIONS}+ observations).")
+        return
+
+    for row in report[report["status"] == "alert"].itertuples():
+        st.error(
+            f"**{row.feature}** ({row.source}): inputs have drifted from the training data "
+            f"(PSI {row.psi:.2f}, {row.outside_training:.0%} outside the training range)"
+        )
+    for row in report[report["status"] == "warning"].itertuples():
+        st.warning(f"**{row.feature}** ({row.source}): moderate shift (PSI {row.psi:.2f})")
+    if (report["status"] == "ok").all():
+        st.success("Live and batch inputs match the training distribution.")
+
+    st.dataframe(report.round(3), use_container_width=True, hide_index=True)
+    st.info(
+        "**Interpretation:**\n"
+        "* PSI below 0.1 means the inputs look like the training data; above 0.25 is a significant shift.\n"
+        "* KS is the largest gap between the binned distributions of numeric features.\n"
+        "* Predictions for houses outside the training range are less reliable."
+    )
@@ -1,6 +1,13 @@
+import time
+
 import streamlit as st
-import pandas as pd
-import joblib
+from model_registry import load_pipeline
+from dataset_store import load_dataset
+from prediction_intervals import prediction_intervals
+from model_bundle import get_bundle_predictor
+from renovation_optimizer import optimize_renovations
+from comparable_sales import get_comps_index
+from audit_log import audit_log
 import plotly.express as px
 
 def page_predict_lydia_houses_body():
@@ -15,21 +22,30 @@ def page_predict_lydia_houses_body():
 
     # Load data + model
     try:
-        lydia_houses = pd.read_csv("outputs/datasets/cleaned/inherited_houses_cleaned.csv")
-        price_prediction_pipeline = joblib.load(
-            "outputs/ml_pipeline/predict_SalePrice/v1/best_regressor_pipeline.pkl"
-        )
+        # Shallow copy: the shared dataset stays untouched when we add columns
+        lydia_houses = load_dataset("cleaned/inherited_houses_cleaned").copy(deep=False)
+        price_prediction_pipeline = load_pipeline("v1")
     except Exception as e:
         st.error(f"Error loading data or model: {e}")
         return
 
-    # Predict prices
+    # Predict prices, with conformal intervals calibrated on the test set
     try:
-        predictions = price_prediction_pipeline.predict(lydia_houses)
-        lydia_houses["Predicted_Price"] = predictions
+        X = lydia_houses[price_prediction_pipeline.feature_names_in_]
+        start = time.perf_counter()
+        intervals, portfolio = prediction_intervals(X, "v1")
+        latency_ms = (time.perf_counter() - start) * 1000
+        lydia_houses["Predicted_Price"] = intervals["Predicted_Price"]
+        lydia_houses["Lower_Price"] = intervals["Lower"]
+        lydia_houses["Upper_Price"] = intervals["Upper"]
     except Exception as e:
         st.error(f"Error making predictions: {e}")
         return
+    try:
+        audit_log.log_many("lydia", "v1", X.to_dict("records"), intervals["Predicted_Price"], latency_ms)
+    except (RuntimeError, TypeError, ValueError) as e:
+        st.warning(f"Audit log could not record these predictions: {e}")
+    confidence = f"{portfolio['confidence']:.0%}"
 
     # Show houses table
     st.write("### Lydia's Inherited Houses")
@@ -37,24 +53,39 @@ def page_predict_lydia_houses_body():
 
     # Expanders for individual house details
     if st.checkbox("Show Detailed House Information"):
+        try:
+            comps = get_comps_index("v1").query_frame(lydia_houses, k=3)
+        except Exception as e:
+            st.error(f"Could not look up comparable sales: {e}")
+            comps = None
         for i, row in lydia_houses.iterrows():
             with st.expander(f"House {i+1} Details"):
                 col1, col2 = st.columns(2)
 
                 with col1:
                     st.write("**House Attributes:**")
-                    st.write(row.drop("Predicted_Price").to_frame().T)
+                    st.write(row.drop(["Predicted_Price", "Lower_Price", "Upper_Price"]).to_frame().T)
 
                 with col2:
                     st.write("**Prediction Result:**")
                     st.success(f"Predicted Price: ${row['Predicted_Price']:,.0f}")
+                    st.write(
+                        f"{confidence} interval: ${row['Lower_Price']:,.0f} – ${row['Upper_Price']:,.0f}"
+                    )
+
+                if comps is not None:
+                    st.write("**Comparable Historical Sales:**")
+                    st.dataframe(
+                        comps[comps["Query"] == i][["SalePrice", "GrLivArea", "OverallQual", "YearBuilt"]],
+                        use_container_width=True,
+                    )
 
     # Summary
     st.write("---")
     st.write("### Summary of All House Predictions")
 
     # Show summary table (with selected key features + predicted price)
-    key_cols = ["GrLivArea", "OverallQual", "YearBuilt", "Predicted_Price"]
+    key_cols = ["GrLivArea", "OverallQual", "YearBuilt", "Predicted_Price", "Lower_Price", "Upper_Price"]
     summary_df = lydia_houses[key_cols]
     st.dataframe(summary_df, use_container_width=True)
 
@@ -62,6 +93,10 @@ def page_predict_lydia_houses_body():
     total_value = lydia_houses["Predicted_Price"].sum()
     st.write("#### Total Portfolio Value")
     st.success(f"**Total Predicted Value of All 4 Houses: ${total_value:,.0f}**")
+    st.write(
+        f"{confidence} interval for the total: "
+        f"${portfolio['lower']:,.0f} – ${portfolio['upper']:,.0f}"
+    )
 
     # --- NEW BAR CHART ---
     st.write("#### Visual Comparison of Predicted Prices")
@@ -70,6 +105,8 @@ def page_predict_lydia_houses_body():
         x=lydia_houses.index + 1,
         y="Predicted_Price",
         text="Predicted_Price",
+        error_y=lydia_houses["Upper_Price"] - lydia_houses["Predicted_Price"],
+        error_y_minus=lydia_houses["Predicted_Price"] - lydia_houses["Lower_Price"],
         labels={"x": "House", "Predicted_Price": "Predicted Sale Price"},
         title="Predicted Prices for Lydia's Inherited Houses"
     )
@@ -77,13 +114,37 @@ def page_predict_lydia_houses_body():
     fig.update_layout(xaxis_title="House Number", yaxis_title="Predicted Price ($)")
     st.plotly_chart(fig, use_container_width=True)
 
-    # Recommendations (can later replace with data-driven rules)
-    st.info(
-        f"**Recommendations for Lydia:**\n"
-        f"* Consider prioritising houses with higher predicted values when selling.\n"
-        f"* Explore cost-effective renovations (e.g., kitchen, bathrooms) in lower-valued houses.\n"
-        f"* Compare predicted values with recent Ames market trends before making final decisions."
-    )
+    # Renovations ranked by predicted uplift per dollar
+    st.write("#### Renovation Options")
+    try:
+        predictor = get_bundle_predictor("v1")
+        renovations, search = optimize_renovations(predictor, lydia_houses, top=3)
+    except Exception as e:
+        st.error(f"Error ranking renovations: {e}")
+        renovations = None
+
+    if renovations is not None:
+        if renovations.empty:
+            st.write("None of the modelled renovations raises a predicted price.")
+        else:
+            st.dataframe(
+                renovations.drop(columns=["Current_Price"]).style.format({
+                    "Cost": "${:,.0f}", "Predicted_Price": "${:,.0f}",
+                    "Uplift": "${:,.0f}", "Uplift_per_Dollar": "{:.2f}"}),
+                use_container_width=True,
+            )
+            best = renovations.sort_values("Uplift_per_Dollar", ascending=False).iloc[0]
+            st.info(
+                f"**Recommendations for Lydia:**\n"
+                f"* Best value renovation: House {best['House']}, {best['Renovation']} "
+                f"(${best['Cost']:,.0f} for ${best['Uplift']:,.0f} predicted uplift).\n"
+                f"* Consider prioritising houses with higher predicted values when selling.\n"
+                f"* Compare predicted values with recent Ames market trends before making final decisions."
+            )
+        st.caption(
+            f"{search['enumerated']:,} renovation bundles considered, {search['evaluated']:,} priced after "
+            f"dropping upgrades the model does not use; costs are planning assumptions, not quotes."
+        )
 
     # Notes
     st.write("---")
@@ -91,6 +152,9 @@ def page_predict_lydia_houses_body():
     st.warning(
         "**Important Notes:**\n"
         "* Predictions are based on historical Ames housing data.\n"
+        f"* Each range is a {confidence} conformal prediction interval, calibrated on the "
+        f"{portfolio['calibration_rows']} houses of the held-out test set ({portfolio['method']}).\n"
+        "* The interval for the total assumes the errors of the four houses are independent.\n"
         "* Model performance metrics are available on the Model Performance page.\n"
         "* Market conditions and unique house features may affect actual sale prices.\n"
         "* Professional appraisals are recommended before final selling decisions."
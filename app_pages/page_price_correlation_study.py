@@ -1,15 +1,19 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
+from pps_engine import target_pps
+from correlation_store import get_correlation_stats
+from dataset_store import load_dataset
 
-sns.set_style("whitegrid")
 
-# Load the cleaned dataset
-@st.cache_data
+def plotting_libs():
+    """Import matplotlib/seaborn on first plot, keeping the page import light"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    sns.set_style("whitegrid")
+    return plt, sns
+
+# Load the cleaned dataset (shared memory-mapped columns)
 def load_clean_data():
-    return pd.read_csv("outputs/datasets/cleaned/house_prices_cleaned.csv")
+    return load_dataset("cleaned/house_prices_cleaned")
 
 def page_price_correlation_study_body():
     df = load_clean_data()
@@ -75,6 +79,7 @@ def price_correlation_per_variable(df, vars_to_study, target_var):
 
 def plot_categorical_vs_price(df, col, target_var):
     """Box plot for categorical variable vs SalePrice"""
+    plt, sns = plotting_libs()
     fig, ax = plt.subplots(figsize=(12, 5))
     sns.boxplot(data=df, x=col, y=target_var, ax=ax)
     plt.xticks(rotation=45)
@@ -84,14 +89,15 @@ def plot_categorical_vs_price(df, col, target_var):
 
 def plot_numerical_vs_price(df, col, target_var):
     """Scatter plot for numerical variable vs SalePrice"""
+    plt, sns = plotting_libs()
     fig, ax = plt.subplots(figsize=(10, 6))
     sns.scatterplot(x=df[col], y=df[target_var], alpha=0.6, ax=ax)
     ax.set_xlabel(col)
     ax.set_ylabel(target_var)
     ax.set_title(f"{col} vs {target_var}")
 
-    # Add correlation coefficient
-    corr = df[col].corr(df[target_var])
+    # Add correlation coefficient (from the incremental statistics store)
+    corr = get_correlation_stats().corr(col, target_var)
     ax.text(0.05, 0.95, f'Correlation: {corr:.3f}', 
             transform=ax.transAxes, fontsize=12,
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
@@ -100,8 +106,8 @@ def plot_numerical_vs_price(df, col, target_var):
 
 def plot_correlation_matrix(df):
     """Correlation matrix heatmap"""
-    numerical_cols = df.select_dtypes(include=['int64', 'float64']).columns
-    corr_matrix = df[numerical_cols].corr()
+    plt, sns = plotting_libs()
+    corr_matrix = get_correlation_stats().pearson()
 
     fig, ax = plt.subplots(figsize=(12, 10))
     sns.heatmap(corr_matrix, annot=False, cmap='coolwarm', center=0,
@@ -112,13 +118,11 @@ def plot_correlation_matrix(df):
 
 def plot_pps_analysis(df, target="SalePrice"):
     """Predictive Power Score analysis for SalePrice"""
-    try:
-        import ppscore as pps
-        # Get full PPS matrix
-        pps_matrix = pps.matrix(df)
+    import plotly.express as px
 
-        # Filter only rows where target is the dependent variable (y)
-        pps_target = pps_matrix[pps_matrix['y'] == target][['x', 'ppscore']]
+    try:
+        # Only feature -> target scores, computed in parallel and cached on disk
+        pps_target = target_pps(df, target)[['x', 'ppscore']]
 
         # Sort by strength of PPS
         pps_target = pps_target.sort_values(by="ppscore", ascending=False)
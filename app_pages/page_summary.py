@@ -1,12 +1,10 @@
 import streamlit as st
-import pandas as pd
+from dataset_store import load_dataset
 
 # Data loading function
-@st.cache_data
 def load_house_data():
-    """Load cleaned Ames Housing dataset."""
-    df = pd.read_csv("outputs/datasets/cleaned/house_prices_cleaned.csv")  
-    return df
+    """Load cleaned Ames Housing dataset (shared memory-mapped columns)."""
+    return load_dataset("cleaned/house_prices_cleaned")
 
 def page_summary_body():
     st.write("## 🏡 Project Summary")
@@ -0,0 +1,101 @@
+"""
+Target-only Predictive Power Score engine
+Scores only feature -> target pairs (instead of the full N x N pps.matrix),
+runs the per-feature models in a process pool and caches the result on disk
+keyed by a hash of the dataset, so repeated views are instant.
+"""
+
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from atomic_io import atomic_path
+
+PPS_CACHE_DIR = "outputs/datasets/pps"
+
+
+def dataset_hash(df):
+    """Content hash of a DataFrame (values, index and column names)"""
+    digest = hashlib.sha256()
+    digest.update("|".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+# ----------------------------
+# WORKER
+# ----------------------------
+_df = None
+
+
+def _init_worker(df):
+    global _df
+    _df = df
+
+
+def _score_feature(args):
+    import ppscore as pps
+    x, target, kwargs = args
+    return pps.score(_df, x, target, **kwargs)
+
+
+# ----------------------------
+# ENGINE
+# ----------------------------
+def compute_target_pps(df, target="SalePrice", workers=None, **pps_kwargs):
+    """PPS of every column predicting target, one model per feature"""
+    import ppscore  # noqa: F401  fail early with ImportError in the caller
+
+    features = [col for col in df.columns if col != target]
+    tasks = [(x, target, pps_kwargs) for x in features]
+    workers = workers if workers is not None else min(len(tasks), os.cpu_count() or 1)
+
+    if workers <= 1:
+        _init_worker(df)
+        scores = [_score_feature(task) for task in tasks]
+    else:
+        # Spawned, not forked: the Streamlit server that calls this is multi-threaded,
+        # and a forked child can inherit locks held by its other threads
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df,),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            scores = list(pool.map(_score_feature, tasks))
+
+    return (pd.DataFrame(scores)
+            .sort_values(by="ppscore", ascending=False)
+            .reset_index(drop=True))
+
+
+def target_pps(df, target="SalePrice", cache_dir=PPS_CACHE_DIR, workers=None, **pps_kwargs):
+    """Cached compute_target_pps: reads from disk when the dataset is unchanged"""
+    key = hashlib.sha256(
+        f"{dataset_hash(df)}|{target}|{sorted(pps_kwargs.items())}".encode()
+    ).hexdigest()[:32]
+    path = os.path.join(cache_dir, f"pps_{key}.csv")
+    if os.path.isfile(path):
+        return pd.read_csv(path)
+
+    scores = compute_target_pps(df, target, workers=workers, **pps_kwargs)
+    os.makedirs(cache_dir, exist_ok=True)
+    with atomic_path(path) as tmp_path:
+        scores.to_csv(tmp_path, index=False)
+    return scores
+
+
+def target_pps_matrix(df, target="SalePrice", **kwargs):
+    """
+    Single-row PPS matrix (index = y, columns = x) in the same layout as the
+    notebooks' pivoted pps.matrix, so get_low_pps_features works unchanged
+    """
+    scores = target_pps(df, target, **kwargs)
+    row = scores.set_index("x")["ppscore"]
+    row[target] = 1.0
+    return row.to_frame(name=target).T
+
+
+def get_low_pps_features(df, target="SalePrice", threshold=0.15, **kwargs):
+    """Features whose PPS for predicting target is below threshold"""
+    scores = target_pps(df, target, **kwargs)
+    return scores.loc[scores["ppscore"] < threshold, "x"].tolist()
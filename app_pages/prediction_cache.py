@@ -0,0 +1,89 @@
+"""
+Bounded LRU/TTL cache of live predictions shared across sessions
+Keys are the normalized live inputs plus the model version. Entries for a
+version are dropped as soon as the model registry loads a new pipeline.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from model_registry import registry
+
+# Inputs collected by draw_input_widgets on the live tool
+LIVE_FEATURES = ("GrLivArea", "TotalBsmtSF", "OverallQual", "GarageArea", "YearBuilt", "1stFlrSF")
+
+
+def normalize_inputs(values: dict) -> tuple:
+    """Stable, hashable form of the live inputs (fixed order, plain floats)"""
+    return tuple(float(values[name]) for name in LIVE_FEATURES)
+
+
+class PredictionCache:
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 3600.0) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+
+    def get_or_compute(self, version: str, values: dict, compute):
+        """Return the cached prediction for these inputs or compute and store it"""
+        key = (version, normalize_inputs(values))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                prediction, stored_at = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return prediction
+                del self._entries[key]
+                self._counters["expired"] += 1
+            self._counters["misses"] += 1
+            generation = self._generation
+
+        prediction = compute()
+
+        with self._lock:
+            # Don't store a result computed against a pipeline that was
+            # replaced while we were predicting
+            if generation != self._generation:
+                return prediction
+            self._entries[key] = (prediction, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+        return prediction
+
+    def invalidate(self, version: str = None) -> None:
+        """Drop every entry for a model version, or everything if None"""
+        with self._lock:
+            if version is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == version]:
+                    del self._entries[key]
+            self._generation += 1
+            self._counters["invalidations"] += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters, hit rate and current size"""
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            **self._counters,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+        }
+
+
+# Shared by every session in this process
+prediction_cache = PredictionCache()
+registry.on_reload(lambda version, sha256: prediction_cache.invalidate(version))
@@ -0,0 +1,155 @@
+"""
+Prediction intervals for the SalePrice pipeline
+Split conformal intervals calibrated on the version's held-out X_test/y_test.
+For averaging forests the residuals are normalized by the spread of the
+per-tree predictions, so houses the trees disagree on get wider intervals.
+The per-tree outputs come from one vectorized walk of the flattened ensemble.
+Calibration is stored per model version and reused until the model or the
+test split changes.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from model_registry import DEFAULT_VERSION, PIPELINE_DIR, file_fingerprint, load_pipeline, registry
+from atomic_io import atomic_path
+
+# Coverage of every interval the app reports: Lydia's price ranges and the held-out metric ranges
+CONFIDENCE = 0.95
+TOTAL_DRAWS = 20_000
+# Spread floor, as a fraction of the median calibration spread
+SPREAD_FLOOR = 0.05
+
+
+def calibration_path(version=DEFAULT_VERSION):
+    return os.path.join(PIPELINE_DIR, version, "intervals", "calibration.npz")
+
+
+def _test_split_paths(version):
+    folder = os.path.join(PIPELINE_DIR, version)
+    return os.path.join(folder, "X_test.csv"), os.path.join(folder, "y_test.csv")
+
+
+def calibration_fingerprint(version=DEFAULT_VERSION):
+    """Hash of the model artifact and its test split"""
+    digest = hashlib.sha256()
+    for path in (registry.artifact_path(version), *_test_split_paths(version)):
+        digest.update(file_fingerprint(path).encode())
+    return digest.hexdigest()
+
+
+def predict_with_spread(X, version=DEFAULT_VERSION):
+    """
+    Point predictions and per-row spread of the ensemble members. The spread
+    is None when the model is not an averaging tree ensemble.
+    """
+    from model_export import load_compiled
+
+    try:
+        predictor = load_compiled(version)
+    except ValueError:
+        # No flat evaluator for this model: plain residuals only
+        return load_pipeline(version).predict(X), None
+
+    forest = predictor.forest
+    if forest.combine != "mean":
+        return predictor.predict_frame(X), None
+
+    leaves = forest.leaf_values(predictor.transform(predictor.frame_to_array(X)))
+    prediction = np.cumsum(leaves, axis=1)[:, -1] / leaves.shape[1]
+    return prediction, leaves.std(axis=1)
+
+
+def build_calibration(version=DEFAULT_VERSION):
+    """Signed conformity scores on the test split, written to disk"""
+    x_path, y_path = _test_split_paths(version)
+    X_test = pd.read_csv(x_path)
+    y_test = pd.read_csv(y_path).iloc[:, 0].to_numpy(dtype=np.float64)
+
+    prediction, spread = predict_with_spread(X_test, version)
+    residuals = y_test - prediction
+    if spread is None:
+        floor, scores = 1.0, residuals
+    else:
+        floor = SPREAD_FLOOR * float(np.median(spread))
+        scores = residuals / np.maximum(spread, floor)
+
+    calibration = {
+        "fingerprint": calibration_fingerprint(version),
+        "method": "absolute residual" if spread is None else "ensemble spread",
+        "floor": floor,
+        "scores": np.sort(scores),
+    }
+    path = calibration_path(version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with atomic_path(path) as tmp_path:
+        np.savez(tmp_path, **calibration)
+    return calibration
+
+
+_calibrations = {}
+
+
+def load_calibration(version=DEFAULT_VERSION):
+    """Calibration for a version, rebuilt when the model or test split changed"""
+    fingerprint = calibration_fingerprint(version)
+    cached = _calibrations.get(version)
+    if cached is not None and cached["fingerprint"] == fingerprint:
+        return cached
+
+    path = calibration_path(version)
+    calibration = None
+    if os.path.isfile(path):
+        with np.load(path) as data:
+            if str(data["fingerprint"]) == fingerprint:
+                calibration = {"fingerprint": fingerprint, "method": str(data["method"]),
+                               "floor": float(data["floor"]), "scores": data["scores"]}
+    if calibration is None:
+        calibration = build_calibration(version)
+    _calibrations[version] = calibration
+    return calibration
+
+
+def conformal_quantile(scores, confidence=CONFIDENCE):
+    """Finite-sample corrected quantile of the absolute conformity scores"""
+    n = len(scores)
+    level = min(1.0, np.ceil((n + 1) * confidence) / n)
+    return float(np.quantile(np.abs(scores), level, method="higher"))
+
+
+def prediction_intervals(X, version=DEFAULT_VERSION, confidence=CONFIDENCE, seed=0):
+    """
+    Return (per-house DataFrame with Predicted_Price, Lower and Upper,
+    dict with the portfolio total and its interval)
+    """
+    calibration = load_calibration(version)
+    prediction, spread = predict_with_spread(X, version)
+    scale = np.ones(len(prediction)) if spread is None else np.maximum(spread, calibration["floor"])
+
+    half_width = conformal_quantile(calibration["scores"], confidence) * scale
+    houses = pd.DataFrame({
+        "Predicted_Price": prediction,
+        "Lower": prediction - half_width,
+        "Upper": prediction + half_width,
+    }, index=X.index)
+
+    # Total: resample signed scores for every house at once, assuming
+    # independent errors between houses
+    rng = np.random.default_rng(seed)
+    scores = calibration["scores"]
+    draws = scores[rng.integers(len(scores), size=(TOTAL_DRAWS, len(prediction)))] @ scale
+    tail = (1 - confidence) / 2
+    total = float(prediction.sum())
+    low, high = np.quantile(draws, [tail, 1 - tail])
+    portfolio = {
+        "total": total,
+        "lower": total + float(low),
+        "upper": total + float(high),
+        "confidence": confidence,
+        "method": calibration["method"],
+        "calibration_rows": len(scores),
+    }
+    return houses, portfolio
@@ -0,0 +1,330 @@
+"""
+Local HTTP prediction service for the SalePrice pipeline
+asyncio server (standard library only) wrapping the same pipeline and defaults
+as make_live_prediction. Concurrent single-house requests are gathered over a
+short window into one vectorized predict call.
+
+Usage (from the repository root):
+    python app_pages/prediction_service.py --port 8000 --batch-window-ms 5
+
+Endpoints:
+    POST /predict   {"GrLivArea": 1500, ...}            -> {"prediction": ...}
+                    {"houses": [{...}, {...}]} or [...] -> {"predictions": [...]}
+    GET  /health    registry and batcher statistics
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import pandas as pd
+
+from model_registry import DEFAULT_VERSION, load_pipeline, registry
+from model_bundle import get_bundle_predictor, load_bundle
+from fast_inference import UncompilableStep
+from drift_monitor import get_monitor
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class ServiceError(Exception):
+    """Error reported back to the client with an HTTP status"""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+# ----------------------------
+# PREDICTION
+# ----------------------------
+def get_predictor(version):
+    """Compiled predictor for the current pipeline, None if it can't be compiled"""
+    try:
+        return get_bundle_predictor(version)
+    except UncompilableStep:
+        return None
+
+
+def validate_houses(houses, version):
+    """
+    Reject unknown features and values the pipeline can't encode, checked
+    against the version's bundle (resolved once per request). Runs in the
+    executor: resolving the bundle may stat or reload the model.
+    """
+    bundle = load_bundle(version)
+    for house in houses:
+        if not isinstance(house, dict):
+            raise ServiceError(400, "Each house must be a JSON object of feature values")
+        for name, value in house.items():
+            dtype = bundle.dtypes.get(name)
+            if dtype is None:
+                raise ServiceError(400, f"Unknown feature: {name}")
+            if dtype == "category":
+                valid = isinstance(value, str) and value in bundle.vocabularies[name]
+            else:
+                valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if not valid:
+                raise ServiceError(400, f"Invalid value for {name}: {value!r}")
+    return houses
+
+
+def predict_houses(houses, version):
+    """Score a list of partial house inputs with one predict call"""
+    monitor = get_monitor(version, "live")
+    for house in houses:
+        monitor.update(house)
+
+    predictor = get_predictor(version)
+    if predictor is not None:
+        return [float(p) for p in predictor.predict_many(houses)]
+
+    bundle = load_bundle(version)
+    X = pd.concat([bundle.frame(house) for house in houses], ignore_index=True)
+    return [float(p) for p in load_pipeline(version).predict(X)]
+
+
+# ----------------------------
+# MICRO-BATCHING
+# ----------------------------
+class MicroBatcher:
+    """
+    Queue single-house requests and flush them as one batch when the window
+    closes or max_batch_size is reached. A full queue rejects new requests.
+    """
+
+    def __init__(self, version=DEFAULT_VERSION, window_ms=5.0, max_batch_size=256,
+                 max_queue=4096) -> None:
+        self.version = version
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self._task = None
+        self._counters = {"requests": 0, "batches": 0, "rejected": 0, "largest_batch": 0}
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, house):
+        """Wait for the prediction of one house"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((house, future))
+        except asyncio.QueueFull:
+            self._counters["rejected"] += 1
+            raise ServiceError(503, "Prediction queue is full, retry later")
+        self._counters["requests"] += 1
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self._counters["batches"] += 1
+            self._counters["largest_batch"] = max(self._counters["largest_batch"], len(batch))
+
+            houses = [house for house, _ in batch]
+            try:
+                # Keep the event loop free to accept requests while predicting
+                predictions = await loop.run_in_executor(None, predict_houses, houses, self.version)
+            except Exception as e:
+                if len(batch) > 1:
+                    # Score the houses one by one so a bad one fails only its own request
+                    await self._predict_each(batch)
+                elif not batch[0][1].done():
+                    batch[0][1].set_exception(e)
+                continue
+
+            for (_, future), prediction in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(prediction)
+
+    async def _predict_each(self, batch):
+        loop = asyncio.get_running_loop()
+        for house, future in batch:
+            try:
+                prediction = (await loop.run_in_executor(None, predict_houses, [house], self.version))[0]
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(prediction)
+
+    def stats(self) -> dict:
+        batches = self._counters["batches"]
+        return {
+            **self._counters,
+            "queued": self.queue.qsize(),
+            "mean_batch_size": self._counters["requests"] / batches if batches else 0.0,
+        }
+
+
+# ----------------------------
+# HTTP
+# ----------------------------
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class PredictionService:
+
+    def __init__(self, batcher: MicroBatcher) -> None:
+        self.batcher = batcher
+
+    async def handle(self, method, path, body):
+        """Route one request and return (status, payload)"""
+        if path == "/health":
+            if method != "GET":
+                raise ServiceError(405, "Use GET /health")
+            return 200, {"status": "ok", "registry": registry.stats(), "batcher": self.batcher.stats()}
+
+        if path != "/predict":
+            raise ServiceError(404, f"No route for {path}")
+        if method != "POST":
+            raise ServiceError(405, "Use POST /predict")
+
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise ServiceError(400, "Request body must be JSON")
+
+        version = self.batcher.version
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+
+        if isinstance(payload, dict) and "houses" not in payload:
+            # Validated before it is queued, so a bad house never reaches a shared batch
+            house, = await loop.run_in_executor(None, validate_houses, [payload], version)
+            prediction = await self.batcher.submit(house)
+            return 200, {"prediction": prediction, "model_version": version,
+                         "latency_ms": (time.perf_counter() - start) * 1000}
+
+        houses = payload["houses"] if isinstance(payload, dict) else payload
+        if not isinstance(houses, list) or not houses:
+            raise ServiceError(400, "Expected a house object, a list of houses or {\"houses\": [...]}")
+        houses = await loop.run_in_executor(None, validate_houses, houses, version)
+
+        # Multi-house payloads are already a batch
+        predictions = await loop.run_in_executor(None, predict_houses, houses, version)
+        return 200, {"predictions": predictions, "model_version": version,
+                     "latency_ms": (time.perf_counter() - start) * 1000}
+
+    async def serve_connection(self, reader, writer):
+        """HTTP/1.1 connection loop with keep-alive"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = await self.handle(method, path.split("?", 1)[0], body)
+                except ServiceError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, payload = 500, {"error": f"Error making prediction: {e}"}
+
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8000, version=DEFAULT_VERSION, window_ms=5.0,
+                max_batch_size=256, max_queue=4096):
+    """Load the pipeline and serve until cancelled"""
+    load_pipeline(version)
+    batcher = MicroBatcher(version, window_ms, max_batch_size, max_queue)
+    batcher.start()
+    service = PredictionService(batcher)
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    print(f"✅ Serving SalePrice pipeline {version} on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP prediction service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--version", default=DEFAULT_VERSION, help="Pipeline version (default: %(default)s)")
+    parser.add_argument("--batch-window-ms", type=float, default=5.0,
+                        help="How long to gather single-house requests (default: %(default)s)")
+    parser.add_argument("--max-batch-size", type=int, default=256, help="(default: %(default)s)")
+    parser.add_argument("--max-queue", type=int, default=4096,
+                        help="Queued requests before returning 503 (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.version, args.batch_window_ms,
+                          args.max_batch_size, args.max_queue))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Renovation optimizer for Lydia's inherited houses
+Enumerates combinations of feasible upgrades per house (kitchen, basement
+finish, garage finish, garage size, condition, extension), prices every
+combination of every house in one batched predict and keeps the options that
+are not dominated (nothing cheaper gives a larger uplift). Results are
+ranked by predicted uplift per dollar.
+
+Costs are rough planning assumptions, not quotes.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+KITCHEN_GRADES = ["Po", "Fa", "TA", "Gd", "Ex"]
+BSMT_FIN_GRADES = ["Unf", "LwQ", "Rec", "BLQ", "ALQ", "GLQ"]
+GARAGE_FINISH_GRADES = ["Unf", "RFn", "Fin"]
+
+# Cost assumptions ($)
+KITCHEN_COST_PER_GRADE = 12_000
+GARAGE_FINISH_COST_PER_GRADE = 4_000
+BSMT_FINISH_COST_PER_SQFT = {"Rec": 25, "ALQ": 35, "GLQ": 50}
+BSMT_UPGRADE_COST_PER_SQFT = 15
+BSMT_FINISH_SHARES = (0.5, 1.0)
+GARAGE_EXTENSION_COST_PER_SQFT = 60
+GARAGE_EXTENSIONS_SQFT = (120, 240)
+CONDITION_COST_PER_POINT = 15_000
+EXTENSION_COST_PER_SQFT = 150
+EXTENSIONS_SQFT = (200, 400)
+
+
+# ----------------------------
+# OPTIONS
+# ----------------------------
+def _grade_upgrades(current, grades, cost_per_grade):
+    """Every higher grade, priced per step up"""
+    if current not in grades:
+        return []
+    start = grades.index(current)
+    return [(f"→ {grade}", cost_per_grade * (i - start), grade)
+            for i, grade in enumerate(grades) if i > start]
+
+
+def renovation_options(house):
+    """
+    {dimension: [(label, cost, {feature: new value}), ...]} for one house.
+    Every dimension implicitly also has "no change".
+    """
+    options = {}
+
+    options["Kitchen"] = [(f"Kitchen {label}", cost, {"KitchenQual": grade})
+                          for label, cost, grade in _grade_upgrades(
+                              house["KitchenQual"], KITCHEN_GRADES, KITCHEN_COST_PER_GRADE)]
+
+    # Finish part of the unfinished basement at a given grade; existing
+    # finished area is brought up to that grade too
+    unfinished, finished = float(house["BsmtUnfSF"]), float(house["BsmtFinSF1"])
+    current = house["BsmtFinType1"]
+    basement = []
+    for grade, cost_per_sqft in BSMT_FINISH_COST_PER_SQFT.items():
+        if current in BSMT_FIN_GRADES and BSMT_FIN_GRADES.index(grade) < BSMT_FIN_GRADES.index(current):
+            continue
+        upgrade_cost = BSMT_UPGRADE_COST_PER_SQFT * finished if grade != current else 0
+        for share in BSMT_FINISH_SHARES:
+            area = round(unfinished * share)
+            if area <= 0:
+                continue
+            basement.append((f"Finish {area:,} sq ft basement ({grade})",
+                             upgrade_cost + cost_per_sqft * area,
+                             {"BsmtFinType1": grade, "BsmtFinSF1": finished + area,
+                              "BsmtUnfSF": unfinished - area}))
+    options["Basement"] = basement
+
+    if float(house["GarageArea"]) > 0:
+        options["Garage finish"] = [(f"Garage finish {label}", cost, {"GarageFinish": grade})
+                                    for label, cost, grade in _grade_upgrades(
+                                        house["GarageFinish"], GARAGE_FINISH_GRADES,
+                                        GARAGE_FINISH_COST_PER_GRADE)]
+        options["Garage size"] = [(f"Extend garage +{area} sq ft", GARAGE_EXTENSION_COST_PER_SQFT * area,
+                                   {"GarageArea": float(house["GarageArea"]) + area})
+                                  for area in GARAGE_EXTENSIONS_SQFT]
+
+    condition = int(house["OverallCond"])
+    options["Condition"] = [(f"Condition {condition} → {condition + step}", CONDITION_COST_PER_POINT * step,
+                             {"OverallCond": condition + step})
+                            for step in (1, 2) if condition + step <= 9]
+
+    options["Extension"] = [(f"Add {area} sq ft living area", EXTENSION_COST_PER_SQFT * area,
+                             {"GrLivArea": float(house["GrLivArea"]) + area,
+                              "1stFlrSF": float(house["1stFlrSF"]) + area})
+                            for area in EXTENSIONS_SQFT]
+    return options
+
+
+# ----------------------------
+# SEARCH
+# ----------------------------
+def _encode_options(predictor, options, used):
+    """
+    Per dimension: (labels, costs, columns, value matrix), with "no change"
+    first. Options that leave every model input unchanged cost money for
+    nothing and are dropped before any prediction.
+    """
+    encoded = []
+    for dimension, choices in options.items():
+        columns = sorted({name for _, _, change in choices for name in change})
+        choices = [(label, cost, change) for label, cost, change in choices
+                   if any(name in used for name in change)]
+        if not choices:
+            continue
+        labels, costs, rows = [None], [0.0], [None]
+        for label, cost, change in choices:
+            try:
+                rows.append({name: predictor.encode(name, value) for name, value in change.items()})
+            except ValueError:
+                continue  # category the model never saw
+            labels.append(label)
+            costs.append(float(cost))
+        encoded.append((dimension, labels, np.array(costs), columns, rows))
+    return encoded
+
+
+def _pareto_mask(cost, uplift):
+    """True for candidates no cheaper-or-equal candidate beats on uplift"""
+    order = np.lexsort((-uplift, cost))
+    best_before = np.maximum.accumulate(np.concatenate([[-np.inf], uplift[order][:-1]]))
+    mask = np.zeros(len(cost), dtype=bool)
+    mask[order] = uplift[order] > best_before
+    return mask
+
+
+def optimize_renovations(predictor, houses, top=5):
+    """
+    Rank renovation bundles for every house (DataFrame of raw features).
+    Returns (DataFrame of the best non-dominated bundles, search statistics).
+    """
+    used = set(predictor.used_features)
+    base = predictor.frame_to_array(houses[predictor.feature_names])
+
+    blocks, meta = [], []
+    enumerated = 0
+    for h, (_, house) in enumerate(houses.iterrows()):
+        options = renovation_options(house)
+        enumerated += int(np.prod([len(choices) + 1 for choices in options.values()]))
+        dims = _encode_options(predictor, options, used)
+
+        # Every combination of one choice per dimension, built as arrays
+        sizes = [len(labels) for _, labels, _, _, _ in dims]
+        combos = np.array(list(itertools.product(*[range(s) for s in sizes])), dtype=np.intp)
+        combos = combos.reshape(len(combos), len(dims))
+        X = np.repeat(base[h][None, :], len(combos), axis=0)
+        cost = np.zeros(len(combos))
+        for d, (_, labels, costs, columns, rows) in enumerate(dims):
+            cost += costs[combos[:, d]]
+            for name in columns:
+                column = np.array([base[h][predictor.offsets[name]] if row is None
+                                   else row.get(name, base[h][predictor.offsets[name]])
+                                   for row in rows])
+                X[:, predictor.offsets[name]] = column[combos[:, d]]
+        blocks.append(X)
+        meta.append((h, dims, combos, cost))
+
+    # One batched predict for all candidates of all houses
+    X_all = np.vstack(blocks)
+    prices = predictor.evaluate_batch(predictor.transform(X_all))
+
+    results = []
+    start = 0
+    for h, dims, combos, cost in meta:
+        price = prices[start:start + len(combos)]
+        start += len(combos)
+        uplift = price - price[0]  # row 0 is "no change" everywhere
+        keep = _pareto_mask(cost, uplift) & (cost > 0) & (uplift > 0)
+        for i in np.flatnonzero(keep):
+            labels = [labels[combos[i, d]] for d, (_, labels, _, _, _) in enumerate(dims)]
+            results.append({
+                "House": h + 1,
+                "Renovation": " + ".join(label for label in labels if label),
+                "Cost": cost[i],
+                "Current_Price": price[0],
+                "Predicted_Price": price[i],
+                "Uplift": uplift[i],
+                "Uplift_per_Dollar": uplift[i] / cost[i],
+            })
+
+    columns = ["House", "Renovation", "Cost", "Current_Price", "Predicted_Price",
+               "Uplift", "Uplift_per_Dollar"]
+    ranked = pd.DataFrame(results, columns=columns)
+    ranked = (ranked.sort_values(["House", "Uplift_per_Dollar"], ascending=[True, False])
+              .groupby("House").head(top).reset_index(drop=True))
+    stats = {"enumerated": enumerated, "evaluated": len(X_all), "non_dominated": len(results)}
+    return ranked, stats
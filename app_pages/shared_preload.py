@@ -0,0 +1,183 @@
+"""
+Preloading launcher for running several app workers on one host
+Loads everything the pages share once in a parent process, then forks the
+Streamlit workers (one port each, behind the load balancer):
+    * datasets come from the columnar store as memory-mapped files, so every
+      worker reads the same page-cache pages
+    * pipelines, bundles, compiled predictors, comps indexes and correlation
+      stats are built before the fork and inherited copy-on-write; the module
+      caches they live in are already warm, so workers never reload them
+The garbage collector is frozen before forking so collections in the workers
+do not touch (and copy) the preloaded objects.
+
+Usage (from the repository root):
+    python app_pages/shared_preload.py --workers 4 --base-port 8501
+"""
+
+import argparse
+import gc
+import importlib
+import os
+import signal
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_SCRIPT = os.path.join(APP_DIR, "app.py")
+if APP_DIR not in sys.path:
+    # Same module names as the Streamlit script, so workers hit these caches
+    sys.path.insert(0, APP_DIR)
+
+from model_registry import DEFAULT_VERSION  # noqa: E402
+
+# Page modules (multipage itself must import inside a session: it sets the page config)
+PAGE_MODULES = [
+    "page_summary",
+    "page_price_correlation_study",
+    "page_predict_lydia_houses",
+    "page_live_price_prediction",
+    "page_model_performance",
+    "page_project_hypothesis",
+]
+
+
+# ----------------------------
+# PRELOAD
+# ----------------------------
+def _step(report, name, func):
+    start = time.perf_counter()
+    try:
+        func()
+        report[name] = time.perf_counter() - start
+    except Exception as e:
+        # A missing artifact only means that part loads lazily in each worker
+        report[name] = f"skipped ({e})"
+
+
+def preload(versions=(DEFAULT_VERSION,)):
+    """Load shared state into this process; returns {step: seconds or reason}"""
+    from dataset_store import available_datasets, load_dataset
+    from model_registry import registry
+    from model_bundle import get_bundle_predictor, load_bundle
+    from model_evaluation import load_evaluation
+    from comparable_sales import get_comps_index
+    from prediction_intervals import load_calibration
+    from correlation_store import get_correlation_stats
+
+    report = {}
+    for module in PAGE_MODULES:
+        _step(report, f"import {module}", lambda: importlib.import_module(module))
+    for name in available_datasets():
+        _step(report, f"dataset {name}", lambda: load_dataset(name))
+    _step(report, "correlation stats", get_correlation_stats)
+
+    for version in versions:
+        _step(report, f"{version} pipeline", lambda: registry.get(version))
+        _step(report, f"{version} bundle", lambda: load_bundle(version))
+        _step(report, f"{version} compiled predictor", lambda: get_bundle_predictor(version))
+        _step(report, f"{version} evaluation", lambda: load_evaluation(version))
+        _step(report, f"{version} comps index", lambda: get_comps_index(version))
+        _step(report, f"{version} interval calibration", lambda: load_calibration(version))
+
+    gc.collect()
+    gc.freeze()
+    return report
+
+
+# ----------------------------
+# MEMORY
+# ----------------------------
+def memory_usage(pid):
+    """
+    {"rss", "pss", "private", "shared"} in KiB for a process, from
+    /proc/<pid>/smaps_rollup (Linux); None where unavailable
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        return None
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    return {"rss": fields.get("Rss", 0), "pss": fields.get("Pss", 0),
+            "private": private, "shared": shared}
+
+
+# ----------------------------
+# WORKERS
+# ----------------------------
+def run_worker(port, address):
+    """Run one Streamlit server in this (forked) process"""
+    from streamlit.web import bootstrap
+
+    flag_options = {"server.port": port, "server.address": address, "server.headless": True}
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(APP_SCRIPT, False, [], flag_options)
+
+
+def start_workers(count, base_port, address):
+    """Fork the workers, returning {pid: port}"""
+    workers = {}
+    for i in range(count):
+        port = base_port + i
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(port, address)
+            finally:
+                os._exit(0)
+        workers[pid] = port
+    return workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preload shared state, then fork Streamlit workers")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes (default: %(default)s)")
+    parser.add_argument("--base-port", type=int, default=8501, help="Port of the first worker")
+    parser.add_argument("--address", default="0.0.0.0")
+    parser.add_argument("--versions", nargs="+", default=[DEFAULT_VERSION], help="Model versions to preload")
+    parser.add_argument("--report-after", type=float, default=20.0,
+                        help="Seconds after startup to print per-worker memory (0 to disable)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    for step, result in preload(args.versions).items():
+        shown = f"{result * 1000:,.0f} ms" if isinstance(result, float) else result
+        print(f"* {step}: {shown}")
+    print(f"✅ Preloaded in {time.perf_counter() - start:.1f}s, "
+          f"parent memory {memory_usage(os.getpid())}")
+
+    workers = start_workers(args.workers, args.base_port, args.address)
+    print(f"✅ Started {len(workers)} workers on ports {sorted(workers.values())}")
+
+    def stop(signum, frame):
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    if args.report_after > 0:
+        time.sleep(args.report_after)
+        for pid, port in sorted(workers.items(), key=lambda item: item[1]):
+            print(f"* worker :{port} (pid {pid}) memory KiB: {memory_usage(pid)}")
+
+    while workers:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        workers.pop(pid, None)
+
+
+if __name__ == "__main__":
+    main()
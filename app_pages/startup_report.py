@@ -0,0 +1,93 @@
+"""
+Startup-time report for the Streamlit app
+Imports the app shell and each page module in a fresh interpreter with
+`python -X importtime` and breaks the cost down per top-level module, so the
+effect of lazy page loading and deferred imports can be measured.
+
+Usage (from the repository root):
+    python app_pages/startup_report.py --top 10
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The app shell, then each page on top of it (as on first navigation)
+TARGETS = [
+    ("app shell (multipage)", "multipage"),
+    ("Project Summary", "page_summary"),
+    ("Price Correlation Study", "page_price_correlation_study"),
+    ("Predict Lydia's Houses", "page_predict_lydia_houses"),
+    ("Live Price Prediction Tool", "page_live_price_prediction"),
+    ("Model Performance", "page_model_performance"),
+    ("Project Hypothesis & Validation", "page_project_hypothesis"),
+]
+
+
+def import_times(module, baseline=()):
+    """
+    {top-level package: microseconds} for importing module in a fresh
+    interpreter, after the baseline modules were already imported
+    """
+    setup = "".join(f"import {name}; " for name in baseline)
+    code = f"import sys; sys.path.insert(0, {APP_DIR!r}); {setup}import {module}"
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    # Only the modules imported after the baseline belong to this target
+    lines = result.stderr.splitlines()
+    marker = f"| {baseline[-1]}" if baseline else None
+    if marker:
+        for i, line in enumerate(lines):
+            if line.rstrip().endswith(marker):
+                lines = lines[i + 1:]
+                break
+
+    # Self time grouped by top-level package (pandas, sklearn, matplotlib, ...)
+    times = {}
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        top = name.strip().split(".")[0]
+        times[top] = times.get(top, 0) + int(self_us)
+    return times
+
+
+def build_report(top=10):
+    """Per-target total and heaviest top-level imports, in milliseconds"""
+    report = []
+    for label, module in TARGETS:
+        baseline = () if module == "multipage" else ("streamlit", "multipage")
+        times = import_times(module, baseline)
+        heaviest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:top]
+        report.append({
+            "target": label,
+            "module": module,
+            "total_ms": sum(times.values()) / 1000,
+            "modules_ms": {name: us / 1000 for name, us in heaviest},
+        })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-module import cost of the app and its pages")
+    parser.add_argument("--top", type=int, default=8, help="Modules listed per target (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    for entry in build_report(args.top):
+        print(f"\n* {entry['target']} ({entry['module']}): {entry['total_ms']:,.0f} ms")
+        for name, ms in entry["modules_ms"].items():
+            print(f"    {name:<32} {ms:>9,.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
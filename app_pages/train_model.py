@@ -0,0 +1,315 @@
+"""
+Training stage for the SalePrice regressor
+Scriptable version of "05 - Modeling and Evaluation.ipynb": the same pipeline
+(OrdinalEncoder -> SmartCorrelatedSelection -> StandardScaler ->
+SelectFromModel -> model), searched with successive halving instead of a full
+grid. Fitted preprocessing steps are cached with joblib.Memory so folds and
+candidates that see the same data reuse them. The winner is written as a new
+versioned artifact under outputs/ml_pipeline/predict_SalePrice/vN.
+
+Usage (from the repository root):
+    python app_pages/train_model.py                 # quick search, then tune the best model
+    python app_pages/train_model.py --model ExtraTreesRegressor --version v2
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from model_registry import PIPELINE_DIR, PIPELINE_FILE, file_sha256
+from model_bundle import build_bundle, write_bundle
+from atomic_io import atomic_path
+
+TRAINING_DATA = "outputs/datasets/cleaned/house_prices_cleaned.csv"
+TARGET = "SalePrice"
+DROPPED_FEATURES = ['EnclosedPorch', 'WoodDeckSF']
+CATEGORICAL_FEATURES = ['BsmtExposure', 'BsmtFinType1', 'GarageFinish', 'KitchenQual']
+
+FOREST_GRID = {
+    'model__n_estimators': [100, 300],
+    'model__max_depth': [10, None],
+    'model__min_samples_split': [2, 5],
+    'model__min_samples_leaf': [1, 2],
+    'model__max_features': ['sqrt', 0.5],
+}
+
+PARAMS_SEARCH = {
+    "ExtraTreesRegressor": FOREST_GRID,
+    "RandomForestRegressor": FOREST_GRID,
+    "GradientBoostingRegressor": {
+        'model__n_estimators': [100, 300],
+        'model__learning_rate': [0.05, 0.1],
+        'model__max_depth': [3, 5],
+        'model__subsample': [0.8, 1.0],
+    },
+    "XGBRegressor": {
+        'model__n_estimators': [100, 300],
+        'model__learning_rate': [0.05, 0.1],
+        'model__max_depth': [3, 6],
+        'model__subsample': [0.8, 1.0],
+    },
+}
+
+
+def get_models():
+    """The estimators compared in the notebook's quick search"""
+    from sklearn.tree import DecisionTreeRegressor
+    from sklearn.ensemble import (AdaBoostRegressor, ExtraTreesRegressor,
+                                  GradientBoostingRegressor, RandomForestRegressor)
+    from sklearn.linear_model import LinearRegression
+    from xgboost import XGBRegressor
+
+    return {
+        'LinearRegression': LinearRegression(),
+        "DecisionTreeRegressor": DecisionTreeRegressor(random_state=0),
+        "RandomForestRegressor": RandomForestRegressor(random_state=0),
+        "ExtraTreesRegressor": ExtraTreesRegressor(random_state=0),
+        "AdaBoostRegressor": AdaBoostRegressor(random_state=0),
+        "GradientBoostingRegressor": GradientBoostingRegressor(random_state=0),
+        "XGBRegressor": XGBRegressor(random_state=0),
+    }
+
+
+def PipelineOptimization(model, memory=None):
+    """Notebook pipeline; memory caches every fitted step except the model"""
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.feature_selection import SelectFromModel
+    from feature_engine.encoding import OrdinalEncoder
+    from feature_engine.selection import SmartCorrelatedSelection
+
+    pipeline_base = Pipeline([
+
+        ("OrdinalCategoricalEncoder", OrdinalEncoder(encoding_method='arbitrary',
+                                                     variables=CATEGORICAL_FEATURES)),
+
+        ("SmartCorrelatedSelection", SmartCorrelatedSelection(variables=None,
+         method="spearman", threshold=0.6, selection_method="variance")),
+
+        ("feat_scaling", StandardScaler()),
+
+        ("feat_selection",  SelectFromModel(model)),
+
+        ("model", model),
+
+    ], memory=memory)
+
+    return pipeline_base
+
+
+class HyperparameterOptimizationSearch:
+    """
+    Successive-halving counterpart of the notebook's search class: every
+    candidate starts on a small sample and only the best third advance
+    """
+
+    def __init__(self, models, params, memory=None):
+        self.models = models
+        self.params = params
+        self.keys = models.keys()
+        self.memory = memory
+        self.searches = {}
+        self.fit_seconds = {}
+
+    def fit(self, X, y, cv=5, n_jobs=-1, verbose=1, scoring='r2', factor=3):
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV
+
+        for key in self.keys:
+            print(f"\nRunning search for {key} \n")
+            model = PipelineOptimization(self.models[key], memory=self.memory)
+            params = self.params.get(key, {})
+            start = time.perf_counter()
+            if len(list(_iter_grid(params))) > 1:
+                search = HalvingGridSearchCV(model, params, cv=cv, n_jobs=n_jobs, verbose=verbose,
+                                             scoring=scoring, factor=factor, random_state=0)
+            else:
+                search = GridSearchCV(model, params, cv=cv, n_jobs=n_jobs,
+                                      verbose=verbose, scoring=scoring)
+            search.fit(X, y)
+            self.fit_seconds[key] = time.perf_counter() - start
+            self.searches[key] = search
+
+    def score_summary(self, sort_by='mean_score'):
+        """One row per candidate of the final round, best first"""
+        rows = []
+        for key, search in self.searches.items():
+            results = search.cv_results_
+            last = np.ones(len(results['params']), dtype=bool)
+            if 'iter' in results:
+                last = np.asarray(results['iter']) == max(results['iter'])
+            split_keys = [k for k in results if k.startswith('split') and k.endswith('_test_score')]
+            for i in np.flatnonzero(last):
+                scores = [results[k][i] for k in split_keys]
+                rows.append({
+                    **results['params'][i],
+                    'estimator': key,
+                    'min_score': np.min(scores),
+                    'mean_score': np.mean(scores),
+                    'max_score': np.max(scores),
+                    'std_score': np.std(scores),
+                })
+
+        df = pd.DataFrame(rows).sort_values([sort_by], ascending=False)
+        columns = ['estimator', 'min_score', 'mean_score', 'max_score', 'std_score']
+        columns = columns + [c for c in df.columns if c not in columns]
+        return df[columns].reset_index(drop=True), self.searches
+
+
+def _iter_grid(params):
+    from sklearn.model_selection import ParameterGrid
+    return iter(ParameterGrid(params))
+
+
+# ----------------------------
+# DATA + ARTIFACTS
+# ----------------------------
+def load_training_data(path=TRAINING_DATA):
+    """Train/test split exactly as in the notebook"""
+    from sklearn.model_selection import train_test_split
+
+    df = pd.read_csv(path).drop(labels=DROPPED_FEATURES, axis=1)
+    return train_test_split(df.drop([TARGET], axis=1), df[TARGET], test_size=0.2, random_state=0)
+
+
+def next_version(base_dir=PIPELINE_DIR):
+    """First unused vN directory name"""
+    existing = [int(name[1:]) for name in os.listdir(base_dir)
+                if name.startswith("v") and name[1:].isdigit()] if os.path.isdir(base_dir) else []
+    return f"v{max(existing, default=0) + 1}"
+
+
+def regression_metrics(y, prediction):
+    from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
+    return {
+        "r2": float(r2_score(y, prediction)),
+        "mae": float(mean_absolute_error(y, prediction)),
+        "rmse": float(np.sqrt(mean_squared_error(y, prediction))),
+    }
+
+
+def feature_importance(pipeline, X_train, data_cleaning_feat_eng_steps=2):
+    """Importance of the features that reached the model"""
+    from sklearn.pipeline import Pipeline
+
+    columns = (Pipeline(pipeline.steps[:data_cleaning_feat_eng_steps])
+               .transform(X_train)
+               .columns)
+    support = pipeline['feat_selection'].get_support()
+    return (pd.DataFrame(data={
+        'Feature': columns[support],
+        'Importance': pipeline['model'].feature_importances_})
+        .sort_values(by='Importance', ascending=False))
+
+
+def save_artifact(version, pipeline, X_train, X_test, y_train, y_test, report, base_dir=PIPELINE_DIR):
+    """Write the versioned artifact directory, pickle last"""
+    file_path = os.path.join(base_dir, version)
+    os.makedirs(file_path, exist_ok=True)
+
+    X_train.to_csv(f"{file_path}/X_train.csv", index=False)
+    y_train.to_csv(f"{file_path}/y_train.csv", index=False)
+    X_test.to_csv(f"{file_path}/X_test.csv", index=False)
+    y_test.to_csv(f"{file_path}/y_test.csv", index=False)
+
+    if hasattr(pipeline['model'], 'feature_importances_'):
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        df_feature_importance = feature_importance(pipeline, X_train)
+        df_feature_importance.plot(kind='bar', x='Feature', y='Importance')
+        plt.savefig(f'{file_path}/features_importance.png', bbox_inches='tight')
+        plt.close()
+        report["features"] = df_feature_importance['Feature'].to_list()
+
+    with open(f"{file_path}/training_report.json", "w") as f:
+        json.dump(report, f, indent=2, default=str)
+
+    # The registry watches the pickle, so write it atomically and last;
+    # its bundle (schema + defaults) is bound to the exact bytes
+    with atomic_path(f"{file_path}/{PIPELINE_FILE}") as tmp_path:
+        joblib.dump(value=pipeline, filename=tmp_path)
+        write_bundle(file_path, build_bundle(pipeline, X_train, file_sha256(tmp_path)))
+    return file_path
+
+
+# ----------------------------
+# DRIVER
+# ----------------------------
+def train(version=None, model_name=None, cv=5, n_jobs=-1, cache_dir=None, verbose=1, data=None):
+    """
+    Run the search and write a new model version, returning its report.
+    data is an (X_train, X_test, y_train, y_test) split to use instead of
+    the notebook's split of the cleaned dataset
+    """
+    version = version or next_version()
+    X_train, X_test, y_train, y_test = data if data is not None else load_training_data()
+    models = get_models()
+    start = time.perf_counter()
+
+    memory = cache_dir or tempfile.mkdtemp(prefix="salesprice_pipeline_cache_")
+    try:
+        if model_name is None:
+            quick_search = HyperparameterOptimizationSearch(
+                models=models, params={key: {} for key in models}, memory=memory)
+            quick_search.fit(X_train, y_train, cv=cv, n_jobs=n_jobs, verbose=verbose)
+            quick_summary, _ = quick_search.score_summary(sort_by='mean_score')
+            model_name = quick_summary.iloc[0]['estimator']
+            print(f"\n* Best model from quick search: {model_name}")
+
+        search = HyperparameterOptimizationSearch(
+            models={model_name: models[model_name]},
+            params={model_name: PARAMS_SEARCH.get(model_name, {})},
+            memory=memory)
+        search.fit(X_train, y_train, cv=cv, n_jobs=n_jobs, verbose=verbose)
+        summary, searches = search.score_summary(sort_by='mean_score')
+
+        best_search = searches[model_name]
+        best_regressor_pipeline = best_search.best_estimator_
+        # Don't ship a pipeline that points at the temporary cache
+        best_regressor_pipeline.set_params(memory=None)
+    finally:
+        if cache_dir is None:
+            shutil.rmtree(memory, ignore_errors=True)
+
+    report = {
+        "version": version,
+        "model": model_name,
+        "best_params": best_search.best_params_,
+        "cv_mean_score": float(summary.iloc[0]['mean_score']),
+        "train": regression_metrics(y_train, best_regressor_pipeline.predict(X_train)),
+        "test": regression_metrics(y_test, best_regressor_pipeline.predict(X_test)),
+        "search_seconds": search.fit_seconds[model_name],
+        "total_seconds": time.perf_counter() - start,
+    }
+    save_artifact(version, best_regressor_pipeline, X_train, X_test, y_train, y_test, report)
+    summary.to_csv(os.path.join(PIPELINE_DIR, version, "search_summary.csv"), index=False)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train and version the SalePrice pipeline")
+    parser.add_argument("--version", default=None, help="Output version, e.g. v2 (default: next free)")
+    parser.add_argument("--model", default=None, help="Skip the quick search and tune this estimator")
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--cache-dir", default=None, help="Keep fitted-step cache here between runs")
+    args = parser.parse_args(argv)
+
+    report = train(args.version, args.model, cv=args.cv, n_jobs=args.n_jobs, cache_dir=args.cache_dir)
+    print(
+        f"\n✅ Saved {report['model']} as {report['version']} "
+        f"(test R² {report['test']['r2']:.3f}) in {report['total_seconds']:.0f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
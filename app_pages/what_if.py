@@ -0,0 +1,63 @@
+"""
+What-if price surfaces for the Live Price Prediction Tool
+Varies one or two features of the current house over a grid and scores the
+whole grid in one vectorized pass through the compiled predictor.
+"""
+
+import numpy as np
+
+# Features that can be varied, with the bounds of their input widgets
+WHAT_IF_RANGES = {
+    "GrLivArea": (300, 6000),
+    "TotalBsmtSF": (0, 3000),
+    "OverallQual": (1, 10),
+    "GarageArea": (0, 1500),
+    "YearBuilt": (1800, 2024),
+    "1stFlrSF": (300, 4000),
+}
+INTEGER_FEATURES = ("OverallQual", "YearBuilt")
+
+
+def grid_values(feature, points):
+    """Evenly spaced values over a feature's widget range"""
+    lo, hi = WHAT_IF_RANGES[feature]
+    if feature in INTEGER_FEATURES:
+        step = max(1, int(np.ceil((hi - lo + 1) / points)))
+        return np.arange(lo, hi + 1, step, dtype=np.float64)
+    return np.linspace(lo, hi, points)
+
+
+def price_surface(predictor, values, x_feature, x_values, y_feature=None, y_values=None):
+    """
+    Predicted prices with x_feature (and y_feature) varied around values.
+    Returns shape (len(x_values),) or (len(y_values), len(x_values)).
+    """
+    base = predictor.template.copy()
+    for name, value in values.items():
+        offset = predictor.offsets.get(name)
+        if offset is not None:
+            base[offset] = predictor.encode(name, value)
+
+    x_values = np.asarray(x_values, dtype=np.float64)
+    y_values = np.asarray([0.0] if y_feature is None else y_values, dtype=np.float64)
+    X = np.repeat(base[None, :], len(x_values) * len(y_values), axis=0)
+    X[:, predictor.offsets[x_feature]] = np.tile(x_values, len(y_values))
+    if y_feature is not None:
+        X[:, predictor.offsets[y_feature]] = np.repeat(y_values, len(x_values))
+
+    prices = predictor.evaluate_batch(predictor.transform(X))
+    return prices if y_feature is None else prices.reshape(len(y_values), len(x_values))
+
+
+def price_surface_full(pipeline, defaults, values, x_feature, x_values, y_feature=None, y_values=None):
+    """Reference path for pipelines without a compiled form: one DataFrame, one predict"""
+    import pandas as pd
+
+    y_grid = [None] if y_feature is None else list(y_values)
+    X = pd.DataFrame([{**defaults, **values}] * (len(x_values) * len(y_grid)))
+    X[x_feature] = np.tile(x_values, len(y_grid))
+    if y_feature is not None:
+        X[y_feature] = np.repeat(y_values, len(x_values))
+
+    prices = pipeline.predict(X[pipeline.feature_names_in_])
+    return prices if y_feature is None else prices.reshape(len(y_grid), len(x_values))
@@ -0,0 +1,102 @@
+"""Audit log frames, rotation and replay"""
+
+import gzip
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import audit_log
+from audit_log import HEADER, AuditLog, encode_frame, iter_frames, iter_records, read_audit, segment_paths
+
+
+def record(prediction, **inputs):
+    return {"timestamp": 1_700_000_000.0 + prediction, "source": "live", "model_version": "v1",
+            "prediction": float(prediction), "latency_ms": 1.5, "inputs": inputs}
+
+
+def test_frame_round_trip(tmp_path):
+    records = [record(1, GrLivArea=np.int64(1500), KitchenQual="Gd"), record(2, GrLivArea=2000.5)]
+    path = tmp_path / "segment.log"
+    path.write_bytes(encode_frame(records[:1]) + encode_frame(records[1:]))
+
+    frames = list(iter_frames(str(path)))
+    assert [f["prediction"] for f in frames] == [[1.0], [2.0]]
+    assert frames[0]["inputs"] == [{"GrLivArea": 1500, "KitchenQual": "Gd"}]
+
+
+def test_torn_last_frame_is_skipped(tmp_path):
+    frame = encode_frame([record(1)])
+    path = tmp_path / "segment.log"
+    path.write_bytes(frame + frame[:HEADER.size + 5])
+    assert len(list(iter_frames(str(path)))) == 1
+
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    monkeypatch.setattr(audit_log, "FLUSH_SECONDS", 0.05)
+    log = AuditLog(str(tmp_path))
+    yield log
+    log.close()
+
+
+def test_writer_round_trip_and_rotation_on_close(log, tmp_path):
+    log.log("live", "v1", {"GrLivArea": 1500}, 100.0, 2.0)
+    log.log_many("lydia", "v1", [{"GrLivArea": 1000}, {"GrLivArea": 2000}], np.array([1.0, 2.0]))
+    log.close()
+
+    assert [os.path.basename(p).endswith(".log.gz") for p in segment_paths(str(tmp_path))] == [True]
+    assert log.stats()["records"] == 3 and log.stats()["rotations"] == 1
+
+    df = read_audit(str(tmp_path), feature_names=["GrLivArea", "LotArea"])
+    assert df["prediction"].tolist() == [100.0, 1.0, 2.0]
+    assert df["source"].tolist() == ["live", "lydia", "lydia"]
+    assert df["GrLivArea"].tolist() == [1500, 1000, 2000]
+    assert df["LotArea"].isna().all()
+    assert len(read_audit(str(tmp_path), source="live")) == 1
+
+
+def test_rotates_past_size_limit(log, tmp_path, monkeypatch):
+    monkeypatch.setattr(audit_log, "ROTATE_BYTES", 1)
+    for i in range(3):
+        log.log("live", "v1", {"GrLivArea": i}, float(i))
+        log._thread.join(0.3)
+    log.close()
+    assert log.stats()["rotations"] >= 2
+    assert [r["prediction"] for r in iter_records(str(tmp_path))] == [0.0, 1.0, 2.0]
+
+
+def test_bad_batch_does_not_stop_the_writer(log, tmp_path):
+    class Unserializable:
+        def item(self):
+            raise RuntimeError("not JSON")
+
+    log.log("live", "v1", {"GrLivArea": Unserializable()}, 1.0)
+    log._thread.join(0.3)
+    assert log._thread.is_alive()
+    log.log("live", "v1", {"GrLivArea": 1500}, 2.0)
+    log.close()
+    assert log.stats()["errors"] == 1 and log.stats()["dropped"] == 1
+    assert [r["prediction"] for r in iter_records(str(tmp_path))] == [2.0]
+
+
+def test_plain_segment_left_by_interrupted_rotation_is_not_replayed(log, tmp_path):
+    log.log("live", "v1", {"GrLivArea": 1500}, 1.0)
+    log.close()
+    gz_path, = segment_paths(str(tmp_path))
+    # A crash between writing the .gz and removing the plain file
+    with gzip.open(gz_path, "rb") as src, open(gz_path[:-len(".gz")], "wb") as dst:
+        shutil.copyfileobj(src, dst)
+
+    assert segment_paths(str(tmp_path)) == [gz_path]
+    assert [r["prediction"] for r in iter_records(str(tmp_path))] == [1.0]
+
+
+def test_buffer_overflow_drops_oldest(log, monkeypatch):
+    monkeypatch.setattr(audit_log, "MAX_PENDING", 2)
+    monkeypatch.setattr(audit_log, "FLUSH_RECORDS", 100)
+    monkeypatch.setattr(audit_log, "FLUSH_SECONDS", 60)
+    log.log_many("live", "v1", [{}] * 5, [1.0, 2.0, 3.0, 4.0, 5.0])
+    assert log.stats()["dropped"] == 3
+    assert [r["prediction"] for r in log._buffer] == [4.0, 5.0]
@@ -0,0 +1,97 @@
+"""The chunked cleaning engine against the in-memory cleaning of "03 - DataCleaning.ipynb\""""
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import train_test_split
+
+from cleaning_engine import (CLEANED_FILE, RANDOM_STATE, TEST_FILE, TEST_SIZE, TRAIN_FILE,
+                             ModeSketch, QuantileSketch, clean_file)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORDS = os.path.join(REPO_ROOT, "outputs/datasets/collection/house_prices_records.csv")
+CLEANED_DIR = os.path.join(REPO_ROOT, "outputs/datasets/cleaned")
+
+
+def clean_in_memory(path):
+    """The notebook's cleaning: whole-dataset median/mode fill, then the 80/20 split"""
+    df = pd.read_csv(path)
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].fillna(df[col].median())
+        else:
+            df[col] = df[col].fillna(df[col].mode()[0])
+    train, test = train_test_split(df, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+    return {CLEANED_FILE: df, TRAIN_FILE: train, TEST_FILE: test}
+
+
+def make_records(path, rows=1000, seed=0):
+    """Integer, float and text columns with missing values, a tied mode and duplicates"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "LotFrontage": rng.integers(20, 200, rows).astype("float64"),
+        "MasVnrArea": rng.uniform(0, 500, rows).round(1),
+        "YearBuilt": rng.integers(1880, 2010, rows),
+        "GarageFinish": rng.choice(["Fin", "RFn", "Unf"], rows),
+        # Two categories with the same count: the smallest value wins, as with mode()[0]
+        "BsmtExposure": ["Gd", "Av"] * (rows // 2),
+        "SalePrice": rng.integers(50_000, 500_000, rows),
+    })
+    for col in ("LotFrontage", "MasVnrArea", "GarageFinish"):
+        df.loc[rng.random(rows) < 0.1, col] = np.nan
+    df.loc[:9, "BsmtExposure"] = np.nan
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("chunk_size, workers", [(1000, 1), (97, 1), (128, 2)])
+def test_matches_in_memory_cleaning(tmp_path, chunk_size, workers):
+    records = make_records(str(tmp_path / "records.csv"))
+    out_dir = tmp_path / "cleaned"
+    report = clean_file(records, str(out_dir), chunk_size=chunk_size, workers=workers, log=io.StringIO())
+
+    assert report["rows"] == 1000
+    assert report["approximate"] == []
+    for name, expected in clean_in_memory(records).items():
+        assert (out_dir / name).read_text() == expected.to_csv(index=False), name
+    # The spill directory is removed
+    assert sorted(p.name for p in out_dir.iterdir()) == sorted([CLEANED_FILE, TRAIN_FILE, TEST_FILE])
+
+
+def test_reproduces_published_cleaned_files(tmp_path):
+    clean_file(RECORDS, str(tmp_path), chunk_size=300, workers=2, log=io.StringIO())
+    for name in (CLEANED_FILE, TRAIN_FILE, TEST_FILE):
+        with open(os.path.join(CLEANED_DIR, name)) as f:
+            assert (tmp_path / name).read_text() == f.read(), name
+
+
+def test_quantile_sketch_is_exact_under_capacity():
+    rng = np.random.default_rng(1)
+    values = rng.integers(0, 500, 10_001).astype("float64")
+    sketch = QuantileSketch(capacity=1000)
+    for part in np.array_split(values, 7):
+        unique, counts = np.unique(part, return_counts=True)
+        chunk = QuantileSketch(capacity=1000)
+        chunk.add_counts(unique, counts)
+        sketch.merge(chunk)
+    assert sketch.exact
+    assert sketch.median() == np.median(values)
+
+
+def test_quantile_sketch_approximates_past_capacity():
+    values = np.random.default_rng(2).normal(1000, 100, 50_000)
+    sketch = QuantileSketch(capacity=256)
+    sketch.add_counts(values, np.ones(len(values)))
+    assert not sketch.exact
+    assert len(sketch.values) <= 256
+    assert sketch.median() == pytest.approx(np.median(values), rel=0.01)
+
+
+def test_mode_sketch_breaks_ties_like_pandas():
+    sketch = ModeSketch()
+    sketch.add_counts({"TA": 3, "Gd": 5})
+    sketch.add_counts({"Ex": 5})
+    assert sketch.mode() == pd.Series(["TA"] * 3 + ["Gd"] * 5 + ["Ex"] * 5).mode()[0]
@@ -0,0 +1,105 @@
+"""Incremental correlation statistics against pandas/scipy on the full data"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats as scipy_stats
+
+import correlation_store
+from correlation_store import CorrelationStats, sync_correlation_stats
+
+
+def make_sales(rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    area = rng.uniform(500, 4000, rows).round()
+    quality = rng.integers(1, 11, rows)
+    return pd.DataFrame({
+        "GrLivArea": area,
+        "OverallQual": quality,
+        "OverallCond": rng.integers(1, 10, rows),
+        "KitchenQual": rng.choice(["Ex", "Gd", "TA"], rows),
+        "SalePrice": (60 * area + 15_000 * quality + rng.normal(0, 20_000, rows)).round(),
+    })
+
+
+def test_pearson_matches_pandas():
+    df = make_sales()
+    stats = CorrelationStats.from_frame(df)
+    expected = df.select_dtypes(include="number").corr()
+    np.testing.assert_allclose(stats.pearson().to_numpy(), expected.to_numpy(), atol=1e-12)
+
+
+def test_spearman_is_exact_for_discrete_columns():
+    df = make_sales()[["OverallQual", "OverallCond"]]
+    stats = CorrelationStats.from_frame(df)
+    np.testing.assert_allclose(stats.spearman().to_numpy(), df.corr("spearman").to_numpy(), atol=1e-12)
+
+
+def test_spearman_sketch_is_close_for_continuous_columns():
+    df = make_sales()
+    stats = CorrelationStats.from_frame(df)
+    assert stats.corr("GrLivArea", "SalePrice", "spearman") == pytest.approx(
+        df["GrLivArea"].corr(df["SalePrice"], method="spearman"), abs=0.02)
+
+
+def test_updates_in_pieces_match_one_pass():
+    df = make_sales()
+    whole = CorrelationStats.from_frame(df)
+    pieces = CorrelationStats.from_frame(df.iloc[:100])
+    for start in range(100, len(df), 150):
+        pieces.update(df.iloc[start:start + 150])
+    assert pieces.n == whole.n == len(df)
+    np.testing.assert_allclose(pieces.pearson().to_numpy(), whole.pearson().to_numpy(), atol=1e-12)
+
+
+def test_pvalues_match_scipy():
+    df = make_sales()
+    p_values = CorrelationStats.from_frame(df).pearson_pvalues()["SalePrice"]
+    for col in ("GrLivArea", "OverallCond"):
+        expected = scipy_stats.pearsonr(df[col], df["SalePrice"]).pvalue
+        assert p_values[col] == pytest.approx(expected, rel=1e-6)
+
+
+def test_save_load_round_trip(tmp_path):
+    stats = CorrelationStats.from_frame(make_sales())
+    path = str(tmp_path / "stats.npz")
+    stats.save(path, {"bytes": 10, "prefix_sha256": "abc"})
+    loaded, source = CorrelationStats.load(path)
+    assert source == {"bytes": 10, "prefix_sha256": "abc"}
+    assert loaded.columns == stats.columns and loaded.n == stats.n
+    np.testing.assert_array_equal(loaded.joint, stats.joint)
+    np.testing.assert_allclose(loaded.spearman().to_numpy(), stats.spearman().to_numpy())
+
+
+def test_sync_folds_in_appended_rows(tmp_path, monkeypatch):
+    df = make_sales()
+    csv_path, store_path = str(tmp_path / "sales.csv"), str(tmp_path / "stats.npz")
+    df.iloc[:400].to_csv(csv_path, index=False)
+    sync_correlation_stats(csv_path, store_path)
+    df.iloc[400:].to_csv(csv_path, index=False, header=False, mode="a")
+
+    def rebuild(_):
+        raise AssertionError("appended rows must not trigger a rebuild")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(correlation_store.CorrelationStats, "from_frame", classmethod(rebuild))
+        stats = sync_correlation_stats(csv_path, store_path)
+    assert stats.n == len(df)
+    fresh = CorrelationStats.from_frame(df)
+    np.testing.assert_allclose(stats.pearson().to_numpy(), fresh.pearson().to_numpy(), atol=1e-12)
+    # The stored copy is current too
+    assert CorrelationStats.load(store_path)[0].n == len(df)
+
+
+def test_sync_rebuilds_when_rows_change(tmp_path):
+    df = make_sales()
+    csv_path, store_path = str(tmp_path / "sales.csv"), str(tmp_path / "stats.npz")
+    df.to_csv(csv_path, index=False)
+    sync_correlation_stats(csv_path, store_path)
+
+    changed = df.iloc[::-1].iloc[:300]
+    changed.to_csv(csv_path, index=False)
+    stats = sync_correlation_stats(csv_path, store_path)
+    assert stats.n == 300
+    expected = changed.select_dtypes(include="number").corr()
+    np.testing.assert_allclose(stats.pearson().to_numpy(), expected.to_numpy(), atol=1e-12)
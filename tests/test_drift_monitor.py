@@ -0,0 +1,80 @@
+"""Drift binning, PSI/KS scores and the report's status thresholds"""
+
+import math
+
+import numpy as np
+import pytest
+
+import drift_monitor
+from drift_monitor import MIN_OBSERVATIONS, FeatureSketch, binned_ks, drift_report, psi
+
+NUMERIC = {"name": "GrLivArea", "kind": "numeric", "cuts": [1000.0, 1500.0, 2000.0], "min": 500.0, "max": 3000.0}
+CATEGORICAL = {"name": "KitchenQual", "kind": "categorical", "categories": ["Ex", "Gd", "TA"]}
+
+
+def test_numeric_bins():
+    sketch = FeatureSketch(NUMERIC)
+    # below min | 4 in-range bins | above max | missing
+    assert sketch.size == 7
+    assert [sketch.bin(v) for v in (499, 500, 999, 1000, 1999, 2000, 3000, 3001)] == [0, 1, 1, 2, 3, 4, 4, 5]
+    assert sketch.bin(None) == sketch.bin(math.nan) == 6
+    assert len(sketch.labels()) == sketch.size
+
+
+def test_categorical_bins():
+    sketch = FeatureSketch(CATEGORICAL)
+    assert [sketch.bin(v) for v in ("Ex", "TA", "Po", None)] == [0, 2, 3, 4]
+    assert sketch.labels() == ["Ex", "Gd", "TA", "other", "missing"]
+
+
+@pytest.mark.parametrize("spec, values", [
+    (NUMERIC, [100, 500, 750.5, 1000, 1000.1, 2500, 3000, 9999, None, math.nan, "1200"]),
+    (CATEGORICAL, ["Ex", "Gd", "Gd", "Po", None, "TA", math.nan]),
+])
+def test_column_counts_match_scalar_bins(spec, values):
+    sketch = FeatureSketch(spec)
+    expected = np.bincount([sketch.bin(v) for v in values], minlength=sketch.size)
+    np.testing.assert_array_equal(sketch.counts(values), expected)
+
+
+def test_psi():
+    p = [0.25, 0.25, 0.5, 0.0]
+    assert psi(p, p) == 0.0
+    q = [0.5, 0.25, 0.25, 0.0]
+    expected = (0.5 - 0.25) * math.log(2) + (0.25 - 0.5) * math.log(0.5)
+    assert psi(p, q) == pytest.approx(expected)
+    assert psi(p, q) == pytest.approx(psi(q, p))
+    # An empty expected bin is floored, so the score stays finite
+    assert math.isfinite(psi(p, [0.0, 0.0, 0.0, 1.0]))
+
+
+def test_binned_ks_ignores_the_missing_bin():
+    assert binned_ks([0.5, 0.5, 0.0], [0.5, 0.5, 0.0]) == 0.0
+    assert binned_ks([1.0, 0.0, 0.0], [0.0, 1.0, 0.0]) == 1.0
+    # Same distribution of present values, different share missing
+    assert binned_ks([0.5, 0.5, 0.0], [0.25, 0.25, 0.5]) == pytest.approx(0.0)
+
+
+def test_report_flags_shifted_features(monkeypatch):
+    proportions = [0.0, 0.25, 0.25, 0.25, 0.25, 0.0, 0.0]
+    reference = {"features": [
+        {**NUMERIC, "proportions": proportions},
+        {**CATEGORICAL, "proportions": [0.3, 0.4, 0.3, 0.0, 0.0]},
+        {**NUMERIC, "name": "LotArea", "proportions": proportions},
+    ]}
+    counts = {
+        "GrLivArea": [0, 25, 25, 25, 25, 0, 0],          # like training
+        "KitchenQual": [0, 0, 0, 100, 0],                 # all unseen categories
+        "LotArea": [0, 1, 1, 1, 1, 0, 0],                 # too few to judge
+    }
+    monkeypatch.setattr(drift_monitor, "flush_all", lambda: None)
+    monkeypatch.setattr(drift_monitor, "load_reference", lambda version: reference)
+    monkeypatch.setattr(drift_monitor, "read_state", lambda version, source: {"counts": counts})
+
+    report = drift_report("v1", sources=("live",)).set_index("feature")
+    assert sorted(report.index) == ["GrLivArea", "KitchenQual"]
+    assert report.loc["GrLivArea", "status"] == "ok"
+    assert report.loc["GrLivArea", "psi"] == pytest.approx(0.0)
+    assert report.loc["KitchenQual", "status"] == "alert"
+    assert report.loc["KitchenQual", "outside_training"] == 1.0
+    assert report["observations"].min() >= MIN_OBSERVATIONS
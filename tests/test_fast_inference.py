@@ -0,0 +1,118 @@
+"""Parity of the precompiled predictor with the sklearn pipeline it was compiled from"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from feature_engine.encoding import OrdinalEncoder
+from feature_engine.selection import SmartCorrelatedSelection
+from sklearn.ensemble import ExtraTreesRegressor, GradientBoostingRegressor, RandomForestRegressor
+from sklearn.feature_selection import SelectFromModel
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from fast_inference import CompiledPredictor, UncompilableStep
+
+CATEGORIES = ["Ex", "Gd", "TA", "Fa"]
+
+
+def make_houses(rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    area = rng.uniform(500, 4000, rows)
+    X = pd.DataFrame({
+        "GrLivArea": area,
+        "1stFlrSF": area * rng.uniform(0.5, 0.9, rows),
+        "LotArea": rng.uniform(2000, 20000, rows),
+        "OverallQual": rng.integers(1, 11, rows).astype("float64"),
+        "YearBuilt": rng.integers(1880, 2010, rows).astype("float64"),
+        "KitchenQual": rng.choice(CATEGORIES, rows),
+    })
+    quality = X["KitchenQual"].map({"Ex": 3, "Gd": 2, "TA": 1, "Fa": 0})
+    y = 50 * X["GrLivArea"] + 20_000 * X["OverallQual"] + 10_000 * quality + rng.normal(0, 10_000, rows)
+    return X, y
+
+
+def make_pipeline(model):
+    """Same step types as the SalePrice pipeline from the modelling notebook"""
+    return Pipeline([
+        ("OrdinalCategoricalEncoder", OrdinalEncoder(encoding_method="arbitrary", variables=["KitchenQual"])),
+        ("SmartCorrelatedSelection", SmartCorrelatedSelection(method="spearman", threshold=0.6,
+                                                              selection_method="variance")),
+        ("feat_scaling", StandardScaler()),
+        ("feat_selection", SelectFromModel(model)),
+        ("model", model),
+    ])
+
+
+@pytest.fixture(scope="module")
+def houses():
+    return make_houses()
+
+
+@pytest.fixture(scope="module", params=[ExtraTreesRegressor, RandomForestRegressor, GradientBoostingRegressor])
+def fitted(request, houses):
+    X, y = houses
+    pipeline = make_pipeline(request.param(n_estimators=30, max_depth=8, random_state=0)).fit(X, y)
+    defaults = {col: X[col].mode().iloc[0] if col == "KitchenQual" else X[col].median() for col in X.columns}
+    return pipeline, CompiledPredictor(pipeline, defaults), defaults
+
+
+def test_predict_frame_matches_pipeline(fitted, houses):
+    pipeline, predictor, _ = fitted
+    X, _ = houses
+    np.testing.assert_array_equal(predictor.predict_frame(X), pipeline.predict(X))
+
+
+def test_predict_one_fills_defaults_like_pipeline(fitted, houses):
+    pipeline, predictor, defaults = fitted
+    X, _ = houses
+    for i in range(5):
+        values = {"GrLivArea": X["GrLivArea"].iloc[i], "KitchenQual": X["KitchenQual"].iloc[i]}
+        row = pd.DataFrame([{**defaults, **values}])[list(X.columns)]
+        assert predictor.predict_one(values) == pytest.approx(pipeline.predict(row)[0], rel=1e-12)
+
+
+def test_predict_many_matches_predict_one(fitted):
+    _, predictor, _ = fitted
+    rows = [{"GrLivArea": area, "OverallQual": 7.0} for area in (800.0, 1500.0, 3000.0)]
+    expected = [predictor.predict_one(values) for values in rows]
+    np.testing.assert_allclose(predictor.predict_many(rows), expected, rtol=1e-12)
+
+
+def test_unknown_category_is_rejected(fitted):
+    _, predictor, _ = fitted
+    with pytest.raises(ValueError, match="Unknown category"):
+        predictor.predict_one({"KitchenQual": "Po"})
+
+
+def test_unsupported_step_raises_uncompilable_step(houses):
+    from sklearn.preprocessing import FunctionTransformer
+
+    X, y = houses
+    pipeline = make_pipeline(ExtraTreesRegressor(n_estimators=5, random_state=0))
+    pipeline.steps.insert(1, ("identity", FunctionTransformer()))
+    pipeline.fit(X, y)
+    with pytest.raises(UncompilableStep):
+        CompiledPredictor(pipeline)
+
+
+def test_xgboost_matches_within_float32(houses):
+    from xgboost import XGBRegressor
+
+    X, y = houses
+    pipeline = make_pipeline(XGBRegressor(n_estimators=30, max_depth=6, random_state=0)).fit(X, y)
+    # xgboost sums its leaves in float32, the flat walk in float64
+    np.testing.assert_allclose(CompiledPredictor(pipeline).predict_frame(X), pipeline.predict(X), rtol=1e-6)
+
+
+def test_export_round_trip(fitted, houses, tmp_path):
+    _, predictor, _ = fitted
+    X, _ = houses
+    path = str(tmp_path / "compiled_predictor.npz")
+    predictor.save(path, source="sha")
+
+    loaded = CompiledPredictor.load(path)
+    assert loaded.source == "sha"
+    assert loaded.pipeline is None
+    np.testing.assert_array_equal(loaded.predict_frame(X), predictor.predict_frame(X))
+    assert loaded.predict_one({"GrLivArea": 2000.0}) == predictor.predict_one({"GrLivArea": 2000.0})
+    assert [p.name for p in tmp_path.iterdir()] == ["compiled_predictor.npz"]
@@ -0,0 +1,124 @@
+"""Incremental refresh: held-out rows stay held out, and the gate compares like with like"""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer
+
+import incremental_refresh as refresh_module
+import train_model
+from incremental_refresh import RECORDS, assign_test, load_manifest, model_split, refresh_datasets, save_manifest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NUMERIC = ["GrLivArea", "OverallQual", "TotalBsmtSF", "YearBuilt"]
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """The published sales records in a scratch repository root"""
+    os.makedirs(tmp_path / os.path.dirname(RECORDS))
+    shutil.copy(os.path.join(REPO_ROOT, RECORDS), tmp_path / RECORDS)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def append_records(rows=400):
+    """New sales with large lot frontages, so the LotFrontage fill value (median) moves"""
+    records = pd.read_csv(RECORDS)
+    new = records.dropna(subset=["LotFrontage"]).head(rows).copy()
+    new["LotFrontage"] = 250.0
+    new["SalePrice"] += 1
+    pd.concat([records, new]).to_csv(RECORDS, index=False)
+    return records, new
+
+
+def by_hash(hashes, flags):
+    return dict(zip(hashes.tolist(), np.asarray(flags).tolist()))
+
+
+def test_refilled_rows_keep_their_cleaned_set(workspace):
+    _, first = refresh_datasets()
+    save_manifest(first)
+    append_records()
+    stats, second = refresh_datasets()
+
+    assert "LotFrontage" in stats["changed_fill_values"] and stats["refilled"] > 0
+    old_test, old_train = set(first["test_order"].tolist()), set(first["train_order"].tolist())
+    new_test, new_train = set(second["test_order"].tolist()), set(second["train_order"].tolist())
+    assert old_test <= new_test and old_train <= new_train
+    assert not new_test & new_train
+    # New records are assigned by hash
+    added = new_test | new_train
+    added -= old_test | old_train
+    assert all(bool(assign_test(np.array([h], dtype="uint64"))[0]) == (h in new_test) for h in added)
+
+
+def test_model_split_does_not_leak_after_fill_values_change(workspace):
+    _, first = refresh_datasets()
+    # The base version's own split: every third record held out, not the hash rule
+    base_flags = (np.arange(len(first["hashes"])) % 3 == 0).astype("int8")
+    first["model_splits"]["v1"] = base_flags
+    save_manifest(first)
+    append_records()
+    _, second = refresh_datasets()
+    assert load_manifest()["model_splits"]["v1"].tolist() == base_flags.tolist()
+
+    *_, in_test = model_split("v1", second)
+    base = by_hash(first["hashes"], base_flags == 1)
+    seen = by_hash(second["hashes"], in_test)
+    assert all(seen[h] == flag for h, flag in base.items())
+    new = [h for h in second["hashes"].tolist() if h not in base]
+    assert [seen[h] for h in new] == assign_test(np.array(new, dtype="uint64")).tolist()
+
+
+@pytest.fixture
+def base_pipeline(workspace, monkeypatch):
+    """A small fitted pipeline standing in for the registry's base version"""
+    pipeline = Pipeline([("numeric", FunctionTransformer(lambda X: X[NUMERIC])), ("model", LinearRegression())])
+    records = pd.read_csv(RECORDS).dropna(subset=NUMERIC)
+    pipeline.fit(records, records["SalePrice"])
+    monkeypatch.setattr(refresh_module, "load_pipeline", lambda version: pipeline)
+    monkeypatch.setattr(train_model, "next_version", lambda: "v2")
+    return pipeline
+
+
+def run_gated_refresh(monkeypatch, threshold):
+    """refresh() with the artifact writer and the full search replaced by recorders"""
+    calls = {}
+
+    def reference_r2(base, X_test, y_test):
+        calls["scored"] = X_test.index
+        return train_model.regression_metrics(y_test, base.predict(X_test))["r2"]
+
+    def save_artifact(version, pipeline, X_train, X_test, *args):
+        calls["saved"] = X_test.index
+
+    def train(version, data):
+        calls["search"] = data[1].index
+        return {}
+
+    monkeypatch.setattr(refresh_module, "reference_r2", reference_r2)
+    monkeypatch.setattr(train_model, "save_artifact", save_artifact)
+    monkeypatch.setattr(train_model, "train", train)
+    return refresh_module.refresh("v1", threshold=threshold, force=True), calls
+
+
+def test_gate_scores_base_and_candidate_on_the_same_rows(base_pipeline, monkeypatch):
+    report, calls = run_gated_refresh(monkeypatch, threshold=1.0)
+    assert report["action"] == "refit"
+    # The base is scored on exactly the rows the candidate is saved and scored with
+    assert calls["scored"].equals(calls["saved"])
+    splits = load_manifest()["model_splits"]
+    assert splits["v1"].tolist() == splits["v2"].tolist()
+
+
+def test_gate_runs_the_full_search_below_threshold(base_pipeline, monkeypatch):
+    report, calls = run_gated_refresh(monkeypatch, threshold=-1.0)
+    assert report["action"] == "full search"
+    assert "saved" not in calls
+    assert calls["scored"].equals(calls["search"])
@@ -0,0 +1,82 @@
+"""Bootstrap test-set metrics of the evaluation stage"""
+
+import numpy as np
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+import model_evaluation
+from model_evaluation import bootstrap_metrics
+
+
+@pytest.fixture(scope="module")
+def predictions():
+    rng = np.random.default_rng(0)
+    y = rng.normal(180_000, 60_000, 300)
+    return y, y + rng.normal(0, 25_000, len(y))
+
+
+def loop_bootstrap(y, y_pred, replicates, seed=0):
+    """One replicate at a time, from the same stream of resampling indices"""
+    rng = np.random.default_rng(seed)
+    r2, rmse, mae = [], [], []
+    for _ in range(replicates):
+        idx = rng.integers(0, len(y), size=(1, len(y)))[0]
+        r2.append(r2_score(y[idx], y_pred[idx]))
+        rmse.append(np.sqrt(mean_squared_error(y[idx], y_pred[idx])))
+        mae.append(mean_absolute_error(y[idx], y_pred[idx]))
+    return {"r2": r2, "rmse": rmse, "mae": mae}
+
+
+def test_point_estimates_match_sklearn(predictions):
+    y, y_pred = predictions
+    metrics = bootstrap_metrics(y, y_pred, replicates=50)["metrics"]
+    assert metrics["r2"]["value"] == pytest.approx(r2_score(y, y_pred))
+    assert metrics["rmse"]["value"] == pytest.approx(np.sqrt(mean_squared_error(y, y_pred)))
+    assert metrics["mae"]["value"] == pytest.approx(mean_absolute_error(y, y_pred))
+
+
+def test_intervals_match_replicate_by_replicate_loop(predictions, monkeypatch):
+    y, y_pred = predictions
+    # Several blocks, the last one partial
+    monkeypatch.setattr(model_evaluation, "BOOTSTRAP_BLOCK_ELEMENTS", 7 * len(y))
+    result = bootstrap_metrics(y, y_pred, replicates=200, confidence=0.9)
+    samples = loop_bootstrap(y, y_pred, 200)
+    for name, metric in result["metrics"].items():
+        low, high = np.percentile(samples[name], [5, 95])
+        assert (metric["low"], metric["high"]) == pytest.approx((low, high), rel=1e-9)
+        assert metric["low"] <= metric["value"] <= metric["high"]
+    assert (result["rows"], result["replicates"], result["confidence"]) == (len(y), 200, 0.9)
+
+
+def test_block_size_does_not_change_the_result(predictions, monkeypatch):
+    y, y_pred = predictions
+    one_block = bootstrap_metrics(y, y_pred, replicates=100)
+    monkeypatch.setattr(model_evaluation, "BOOTSTRAP_BLOCK_ELEMENTS", 3 * len(y))
+    assert bootstrap_metrics(y, y_pred, replicates=100) == one_block
+
+
+def test_indices_are_drawn_per_block(predictions, monkeypatch):
+    y, y_pred = predictions
+    limit = 10 * len(y)
+    monkeypatch.setattr(model_evaluation, "BOOTSTRAP_BLOCK_ELEMENTS", limit)
+    draws = []
+    default_rng = np.random.default_rng
+
+    class RecordingGenerator:
+        def __init__(self, seed):
+            self.rng = default_rng(seed)
+
+        def integers(self, low, high, size):
+            draws.append(size)
+            return self.rng.integers(low, high, size=size)
+
+    monkeypatch.setattr(model_evaluation.np.random, "default_rng", RecordingGenerator)
+    bootstrap_metrics(y, y_pred, replicates=95)
+    assert [rows for rows, _ in draws] == [10] * 9 + [5]
+    assert max(rows * n for rows, n in draws) <= limit
+
+
+def test_seed_makes_it_reproducible(predictions):
+    y, y_pred = predictions
+    assert bootstrap_metrics(y, y_pred, replicates=100, seed=1) == bootstrap_metrics(y, y_pred, replicates=100, seed=1)
+    assert bootstrap_metrics(y, y_pred, replicates=100, seed=1) != bootstrap_metrics(y, y_pred, replicates=100, seed=2)
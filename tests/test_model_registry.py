@@ -0,0 +1,75 @@
+"""Process-wide model registry: load once, reload only when the artifact changes"""
+
+import os
+
+import joblib
+import pytest
+
+from model_registry import PIPELINE_FILE, ModelRegistry, file_fingerprint, file_sha256
+
+
+def write_artifact(base_dir, version, payload):
+    folder = base_dir / version
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / PIPELINE_FILE
+    joblib.dump(payload, path)
+    return path
+
+
+def bump_mtime(path, seconds=10):
+    """Move the mtime forward; a rewrite within one timestamp tick would go unnoticed otherwise"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+@pytest.fixture
+def registry(tmp_path):
+    write_artifact(tmp_path, "v1", {"model": 1})
+    return ModelRegistry(base_dir=str(tmp_path))
+
+
+def test_loads_once_and_shares_the_object(registry):
+    first = registry.get("v1")
+    assert registry.get("v1") is first
+    stats = registry.stats()
+    assert (stats["loads"], stats["misses"], stats["hits"], stats["reloads"]) == (1, 1, 1, 0)
+    assert set(stats["versions"]) == {"v1"}
+
+
+def test_touched_artifact_keeps_the_loaded_object(registry, tmp_path):
+    first = registry.get("v1")
+    bump_mtime(tmp_path / "v1" / PIPELINE_FILE)
+    assert registry.get("v1") is first
+    assert registry.stats()["loads"] == 1
+
+
+def test_changed_artifact_is_reloaded_and_listeners_fire(registry, tmp_path):
+    events = []
+    registry.on_reload(lambda version, sha256: events.append((version, sha256)))
+    first = registry.get("v1")
+    old_sha = registry.fingerprint("v1")
+
+    path = write_artifact(tmp_path, "v1", {"model": 2})
+    bump_mtime(path)
+    second = registry.get("v1")
+
+    assert second is not first and second == {"model": 2}
+    assert registry.fingerprint("v1") == file_sha256(str(path)) != old_sha
+    assert registry.stats()["reloads"] == 1
+    assert events == [("v1", old_sha), ("v1", registry.fingerprint("v1"))]
+
+
+def test_available_versions_sort_numerically(tmp_path):
+    for version in ("v10", "v2", "v1"):
+        write_artifact(tmp_path, version, {})
+    (tmp_path / "v3").mkdir()  # no artifact
+    assert ModelRegistry(base_dir=str(tmp_path)).available_versions() == ["v1", "v2", "v10"]
+
+
+def test_file_fingerprint_follows_content(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a\n1\n")
+    first = file_fingerprint(str(path))
+    path.write_text("a\n2\n")
+    bump_mtime(path)
+    assert file_fingerprint(str(path)) == file_sha256(str(path)) != first
@@ -0,0 +1,97 @@
+"""Shared LRU/TTL cache of live predictions"""
+
+import os
+
+import joblib
+
+from model_registry import PIPELINE_FILE, ModelRegistry
+from prediction_cache import LIVE_FEATURES, PredictionCache
+
+HOUSE = {"GrLivArea": 1500, "TotalBsmtSF": 900, "OverallQual": 7, "GarageArea": 400,
+         "YearBuilt": 2000, "1stFlrSF": 1000}
+
+
+def house(**changes):
+    return {**HOUSE, **changes}
+
+
+def test_hit_skips_compute():
+    cache = PredictionCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 100.0
+
+    assert cache.get_or_compute("v1", HOUSE, compute) == 100.0
+    # Same inputs in another order and type are the same key
+    assert cache.get_or_compute("v1", {k: float(HOUSE[k]) for k in reversed(LIVE_FEATURES)}, compute) == 100.0
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_versions_are_separate_keys():
+    cache = PredictionCache()
+    cache.get_or_compute("v1", HOUSE, lambda: 1.0)
+    assert cache.get_or_compute("v2", HOUSE, lambda: 2.0) == 2.0
+
+
+def test_least_recently_used_is_evicted():
+    cache = PredictionCache(maxsize=2)
+    cache.get_or_compute("v1", house(GrLivArea=1), lambda: 1.0)
+    cache.get_or_compute("v1", house(GrLivArea=2), lambda: 2.0)
+    cache.get_or_compute("v1", house(GrLivArea=1), lambda: -1.0)  # refreshes 1
+    cache.get_or_compute("v1", house(GrLivArea=3), lambda: 3.0)   # evicts 2
+
+    assert cache.get_or_compute("v1", house(GrLivArea=1), lambda: -1.0) == 1.0
+    assert cache.get_or_compute("v1", house(GrLivArea=2), lambda: 20.0) == 20.0
+    assert cache.stats()["evictions"] == 2
+
+
+def test_expired_entries_are_recomputed(monkeypatch):
+    import prediction_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(prediction_cache.time, "monotonic", lambda: now[0])
+    cache = PredictionCache(ttl_seconds=60)
+    cache.get_or_compute("v1", HOUSE, lambda: 1.0)
+    now[0] += 61
+    assert cache.get_or_compute("v1", HOUSE, lambda: 2.0) == 2.0
+    assert cache.stats()["expired"] == 1
+
+
+def test_invalidate_drops_one_version():
+    cache = PredictionCache()
+    cache.get_or_compute("v1", HOUSE, lambda: 1.0)
+    cache.get_or_compute("v2", HOUSE, lambda: 2.0)
+    cache.invalidate("v1")
+    assert cache.get_or_compute("v1", HOUSE, lambda: 10.0) == 10.0
+    assert cache.get_or_compute("v2", HOUSE, lambda: 20.0) == 2.0
+
+
+def test_result_computed_across_an_invalidation_is_not_stored():
+    cache = PredictionCache()
+
+    def compute():
+        cache.invalidate("v1")  # the pipeline is replaced mid-prediction
+        return 1.0
+
+    assert cache.get_or_compute("v1", HOUSE, compute) == 1.0
+    assert cache.stats()["size"] == 0
+
+
+def test_registry_reload_invalidates(tmp_path):
+    folder = tmp_path / "v1"
+    folder.mkdir()
+    joblib.dump({"model": 1}, folder / PIPELINE_FILE)
+    registry = ModelRegistry(base_dir=str(tmp_path))
+    cache = PredictionCache()
+    registry.on_reload(lambda version, sha256: cache.invalidate(version))
+    registry.get("v1")
+    cache.get_or_compute("v1", HOUSE, lambda: 1.0)
+
+    joblib.dump({"model": 2}, folder / PIPELINE_FILE)
+    stat = os.stat(folder / PIPELINE_FILE)
+    os.utime(folder / PIPELINE_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**10))
+    registry.get("v1")
+    assert cache.get_or_compute("v1", HOUSE, lambda: 2.0) == 2.0